@@ -5,6 +5,9 @@ import time
 from datetime import datetime
 import threading
 import logging
+from operate.utils.rate_limit import RateLimitExceeded
+from operate.utils.resilience import CircuitOpenError, RETRYABLE_STATUSES, for_service
+from operate.utils.shared_resources import RESOURCES
 
 class WhiteRabbitAI:
     """
@@ -21,8 +24,19 @@ class WhiteRabbitAI:
         }
         self.tasks = []
         self.lock = threading.Lock()
+        self.session = RESOURCES.acquire("http_session")
+        # Timeout, retries and circuit breaker shared by every White Rabbit client
+        self.resilience = for_service("whiterabbit")
         self._setup_logging()
 
+    def close(self):
+        """
+        Return the shared HTTP session.
+        """
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
+
     def _setup_logging(self):
         """Set up logging for API interactions."""
         logging.basicConfig(
@@ -38,30 +52,38 @@ class WhiteRabbitAI:
     def _request(self, endpoint, method="GET", data=None):
         """
         Helper function to make an HTTP request to the White Rabbit API.
+        Timeouts, 429 and 5xx responses are retried with backoff (POSTs only when they were
+        not sent or the API asked for a retry, see may_resend); while the API's circuit
+        is open, None is returned without calling it. Requests are paced by the host's
+        rate limit (Config.API_RATE_LIMIT), so batch operations do not burst.
         """
         url = f"{self.api_endpoint}{endpoint}"
-        start_time = time.time()
-        
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        def attempt():
+            start_time = time.time()
+            response = self.session.request(method, url, json=data, headers=self.headers,
+                                            timeout=self.resilience.timeout)
+            self.log_request(method, url, response.status_code, round(time.time() - start_time, 3))
+            if response.status_code in RETRYABLE_STATUSES:
+                response.raise_for_status()
+            return response
+
         try:
-            if method == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method == "POST":
-                response = requests.post(url, json=data, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
-            response_time = time.time() - start_time
-            self.log_request(method, url, response.status_code, response_time)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logging.error(f"Error {response.status_code}: {response.text}")
-                return None
+            response = self.resilience.call_http(method, attempt)
+        except (CircuitOpenError, RateLimitExceeded) as e:
+            logging.warning(f"Request skipped: {e}")
+            return None
         except requests.exceptions.RequestException as e:
             logging.error(f"Request Exception: {e}")
             return None
 
+        if response.status_code == 200:
+            return response.json()
+        logging.error(f"Error {response.status_code}: {response.text}")
+        return None
+
     def fetch_task_data(self, task_id):
         """
         Fetch data for a specific task from the White Rabbit API.
@@ -0,0 +1,111 @@
+"""
+Benchmark for the chat path (modules.chatbot.ChatBot) against the offline stand-in server.
+
+Starts services.standin_server in-process, then measures:
+- batch throughput and per-request latency of ChatBot.generate_responses
+- time to first token and total latency of ChatBot.stream_response
+- connection reuse of the shared HTTP client
+
+No network access or API keys are needed. The response cache and request budget are
+disabled so every request reaches the server.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_chat [--requests 200] [--concurrency 16] [--latency-ms 200]
+                                    [--tokens-per-second 100] [--error-rate 0.0]
+"""
+import argparse
+import time
+from modules.chatbot import ChatBot
+from modules.conversation_memory import ConversationMemory
+from modules.llm_backends import HTTPChatBackend
+from operate.utils.rate_limit import RequestBudget
+from services.standin_server import StandInProfile, StandInServer
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def format_latencies(label, values):
+    return (f"{label}: p50 {percentile(values, 0.5) * 1000:7.1f} ms, p95 {percentile(values, 0.95) * 1000:7.1f} ms, "
+            f"p99 {percentile(values, 0.99) * 1000:7.1f} ms")
+
+
+def build_chatbot(base_url):
+    # Word counts stand in for the GPT-2 tokenizer, which may not be available offline
+    memory = ConversationMemory(lambda texts: [len(text.split()) for text in texts], max_tokens=2000)
+    return ChatBot(model="standin", backend=HTTPChatBackend(base_url), cache=False, memory=memory,
+                   budget=RequestBudget())
+
+
+def run_batch(chatbot, request_count, concurrency, max_tokens):
+    latencies = []
+    original_complete = chatbot._complete
+
+    def timed_complete(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return original_complete(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start_time)
+
+    chatbot._complete = timed_complete
+    prompts = [f"summarize document {index}" for index in range(request_count)]
+    start_time = time.perf_counter()
+    results = chatbot.generate_responses(prompts, max_tokens=max_tokens, max_concurrency=concurrency)
+    elapsed = time.perf_counter() - start_time
+    chatbot._complete = original_complete
+
+    failed = sum(1 for result in results if not result.ok)
+    print(f"Batch: {request_count} requests at concurrency {concurrency} in {elapsed:.2f}s "
+          f"({request_count / elapsed:.1f} req/s, {failed} failed)")
+    print(format_latencies("  request latency", latencies))
+
+
+def run_stream(chatbot, request_count, max_tokens):
+    first_tokens, totals = [], []
+    for index in range(request_count):
+        chatbot.memory.clear()
+        for _ in chatbot.stream_response(f"tell me something {index}", max_tokens=max_tokens):
+            pass
+        if chatbot.last_stream_timing:
+            first_tokens.append(chatbot.last_stream_timing["first_token_seconds"])
+            totals.append(chatbot.last_stream_timing["total_seconds"])
+    print(f"Stream: {request_count} sequential requests")
+    print(format_latencies("  time to first token", first_tokens))
+    print(format_latencies("  total latency", totals))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the chat path against the offline stand-in server.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--stream-requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--latency-dist", choices=StandInProfile.LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--tokens-per-second", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    profile = StandInProfile(latency_ms=args.latency_ms, latency_dist=args.latency_dist,
+                             tokens_per_second=args.tokens_per_second, error_rate=args.error_rate, seed=args.seed)
+    server = StandInServer(profile, port=0)
+    server.start()
+    try:
+        chatbot = build_chatbot(server.base_url)
+        print(f"Stand-in: {args.latency_dist} latency ~{args.latency_ms:.0f} ms, "
+              f"{args.tokens_per_second:.0f} tokens/s, error rate {args.error_rate:.1%}")
+        run_batch(chatbot, args.requests, args.concurrency, args.max_tokens)
+        run_stream(chatbot, args.stream_requests, args.max_tokens)
+        print(chatbot.backend.session.format_stats())
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark for modules.intent_router.IntentRouter.
+
+Routes 100k synthetic commands through the compiled intent router and through an
+equivalent substring if/elif chain, and reports throughput for both. The router's
+throughput barely changes with the intent count; the chain's falls linearly and only
+drops below the router's at around 50 intents, so expect the chain to win at the default
+--intents 40 and below.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_intent_router [--commands 100000] [--intents 40]
+"""
+import argparse
+import random
+import time
+from modules.intent_router import IntentRouter
+
+BASE_INTENTS = {
+    "weather": ["weather", "forecast", "temperature"],
+    "news": ["news", "headlines"],
+    "device_control": ["control"],
+    "post_to_twitter": ["post to twitter", "tweet"],
+    "fetch_twitter_posts": ["fetch twitter posts"],
+    "post_to_facebook": ["post to facebook"],
+    "social": ["social"],
+    "chat": ["chat"],
+    "time": ["time"],
+}
+
+FILLER = ["please", "could", "you", "the", "for", "me", "in", "london", "today", "now",
+          "what", "is", "about", "quickly", "show", "tell", "latest", "my"]
+
+
+def build_intents(count):
+    intents = dict(BASE_INTENTS)
+    for index in range(len(intents), count):
+        intents[f"synthetic_{index}"] = [f"action{index}", f"run task {index}"]
+    return intents
+
+
+def build_commands(intents, count, seed=42):
+    rng = random.Random(seed)
+    keywords = [keyword for phrases in intents.values() for keyword in phrases]
+    commands = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(3, 10))
+        # Roughly one in ten commands matches nothing
+        if rng.random() > 0.1:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        commands.append(" ".join(words))
+    return commands
+
+
+def route_with_chain(intents, command):
+    command = command.lower()
+    for name, keywords in intents.items():
+        for keyword in keywords:
+            if keyword in command:
+                return name
+    return None
+
+
+def run(command_count, intent_count):
+    intents = build_intents(intent_count)
+    commands = build_commands(intents, command_count)
+
+    router = IntentRouter()
+    for name, keywords in intents.items():
+        router.register(name, keywords, handler=lambda: None)
+    router.compile()
+
+    start_time = time.perf_counter()
+    routed = sum(1 for command in commands if router.match(command) is not None)
+    router_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    chained = sum(1 for command in commands if route_with_chain(intents, command) is not None)
+    chain_seconds = time.perf_counter() - start_time
+
+    print(f"Commands: {command_count}, intents: {len(intents)}")
+    print(f"IntentRouter : {router_seconds:.3f}s ({command_count / router_seconds:,.0f} commands/s, {routed} routed)")
+    print(f"if/elif chain: {chain_seconds:.3f}s ({command_count / chain_seconds:,.0f} commands/s, {chained} routed)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the compiled intent router.")
+    parser.add_argument("--commands", type=int, default=100_000)
+    parser.add_argument("--intents", type=int, default=40)
+    args = parser.parse_args()
+    run(args.commands, args.intents)
@@ -0,0 +1,81 @@
+"""
+Benchmark for the weather service (modules.weather_service.WeatherService) against the
+offline stand-in server.
+
+Starts services.standin_server in-process, then runs the same burst of lookups (a few
+cities, typed with varying case and spacing, from many threads at once) twice: without
+caching, and with the TTL cache. Reports lookup latency and how many requests reached
+the server.
+
+No network access or API keys are needed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_weather [--lookups 500] [--cities 10] [--concurrency 16]
+                                       [--latency-ms 150] [--ttl 600]
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.bench_chat import format_latencies
+from modules.weather_service import WeatherService
+from operate.utils.http_client import HTTPClient
+from services.standin_server import StandInProfile, StandInServer
+
+CITIES = ("London", "Paris", "New York", "Tokyo", "Berlin", "Madrid", "Rome", "Lisbon", "Oslo", "Cairo",
+          "Lagos", "Lima", "Seoul", "Delhi", "Sydney", "Toronto")
+
+
+def spellings(city):
+    return (city, city.lower(), city.upper(), f"  {city} ", city.replace(" ", "  "))
+
+
+def run(server, label, lookups, ttl_seconds, concurrency):
+    client = HTTPClient(pool_maxsize=concurrency)
+    service = WeatherService(client, api_key="standin", base_url=server.weather_url, ttl_seconds=ttl_seconds)
+    before = server.stats["weather"]
+    latencies = []
+
+    def lookup(location):
+        start_time = time.perf_counter()
+        service.get(location)
+        latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lookup, lookups))
+    elapsed = time.perf_counter() - start_time
+    client.close()
+
+    print(f"{label}: {len(lookups)} lookups at concurrency {concurrency} in {elapsed:.2f}s, "
+          f"{server.stats['weather'] - before} server requests "
+          f"({service.stats['hits']} cache hits, {service.inflight.stats['saved']} joined in flight)")
+    print(format_latencies("  lookup latency", latencies))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the weather service against the offline stand-in server.")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--cities", type=int, default=10, choices=range(1, len(CITIES) + 1), metavar="N")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--latency-dist", choices=StandInProfile.LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--ttl", type=float, default=600, help="Cache TTL in seconds for the cached run.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    lookups = [rng.choice(spellings(rng.choice(CITIES[:args.cities]))) for _ in range(args.lookups)]
+    server = StandInServer(StandInProfile(latency_ms=args.latency_ms, latency_dist=args.latency_dist,
+                                          seed=args.seed), port=0)
+    server.start()
+    try:
+        print(f"Stand-in: {args.latency_dist} latency ~{args.latency_ms:.0f} ms, {args.cities} cities")
+        run(server, "Uncached", lookups, 0, args.concurrency)
+        run(server, f"Cached (TTL {args.ttl:g}s)", lookups, args.ttl, args.concurrency)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
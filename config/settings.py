@@ -16,8 +16,32 @@ class Config:
 
     # AI & Machine Learning Settings
     MODEL_TYPE = os.getenv("MODEL_TYPE", "random_forest")
+    ML_MODEL_PATH = os.getenv("ML_MODEL_PATH", "")  # Trained model loaded by the ML module, if set
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # openai, or http for any OpenAI-compatible server
+    LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://127.0.0.1:8089/v1")  # Used by the http backend
+
+    # Chat Response Cache
+    CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "True").strip().lower() == "true"
+    CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "256"))  # Entries kept in memory
+    CHAT_CACHE_TTL_SECONDS = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+    CHAT_CACHE_DB_PATH = os.getenv("CHAT_CACHE_DB_PATH", "")  # SQLite file for the persistent tier, empty disables it
+    CHAT_CACHE_DB_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_DB_MAX_ENTRIES", "10000"))
+    # Skip the cache for sampled (temperature > 0) requests when fresh answers matter more than latency
+    CHAT_CACHE_BYPASS_SAMPLED = os.getenv("CHAT_CACHE_BYPASS_SAMPLED", "False").strip().lower() == "true"
+    # Canned prompts answered without the conversation history, so their cached reply is reused in any context
+    CHAT_CONTEXT_FREE_PROMPTS = os.getenv("CHAT_CONTEXT_FREE_PROMPTS", "help,status,what can you do?").split(",")
+
+    # Chat Request Budget (0 disables a limit)
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "90000"))
+    CHAT_BATCH_CONCURRENCY = int(os.getenv("CHAT_BATCH_CONCURRENCY", "8"))
+
+    # Chat Conversation Memory
+    CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "2000"))  # Token budget per request, history included
+    CHAT_SYSTEM_PROMPT = os.getenv("CHAT_SYSTEM_PROMPT", "You are AIA, a helpful personal assistant.")
+    CHAT_MEMORY_SUMMARIZE = os.getenv("CHAT_MEMORY_SUMMARIZE", "False").strip().lower() == "true"
 
     # White Rabbit AI Integration
     WHITERABBIT_API_KEY = os.getenv("WHITERABBIT_API_KEY", "")
@@ -25,6 +49,17 @@ class Config:
 
     # Task Scheduling
     TASK_REFRESH_RATE = int(os.getenv("TASK_REFRESH_RATE", "60"))  # In seconds
+    TASK_TIMEOUT_SECONDS = float(os.getenv("TASK_TIMEOUT_SECONDS", "120"))
+    MODULE_WORKERS = int(os.getenv("MODULE_WORKERS", "2"))  # Worker threads per module
+    PROCESS_POOL_SIZE = int(os.getenv("PROCESS_POOL_SIZE", "0"))  # Worker processes for CPU-bound modules, 0 = CPU count
+    PROCESS_START_METHOD = os.getenv("PROCESS_START_METHOD", "spawn")
+
+    # Voice Command Pipeline
+    PIPELINE_ENABLED = os.getenv("PIPELINE_ENABLED", "True").strip().lower() == "true"
+    COMMAND_QUEUE_SIZE = int(os.getenv("COMMAND_QUEUE_SIZE", "8"))
+    COMMAND_WORKERS = int(os.getenv("COMMAND_WORKERS", "1"))
+    COMMAND_QUEUE_POLICY = os.getenv("COMMAND_QUEUE_POLICY", "block")  # block, drop_newest, drop_oldest
+    COMMAND_QUEUE_PUT_TIMEOUT = float(os.getenv("COMMAND_QUEUE_PUT_TIMEOUT", "0"))  # 0 waits indefinitely
 
     # OCR Settings
     OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "en")
@@ -40,10 +75,56 @@ class Config:
     SOCIAL_MEDIA_ENABLED = os.getenv("SOCIAL_MEDIA_ENABLED", "False").strip().lower() == "true"
     ALLOWED_SOCIAL_PLATFORMS = os.getenv("ALLOWED_SOCIAL_PLATFORMS", "twitter,facebook,instagram").split(",")
 
+    # Internet Tasks
+    DEFAULT_LOCATION = os.getenv("DEFAULT_LOCATION", "London")
+    WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://api.openweathermap.org/data/2.5")
+    WEATHER_UNITS = os.getenv("WEATHER_UNITS", "metric")  # metric, imperial or standard
+    WEATHER_CACHE_TTL_SECONDS = float(os.getenv("WEATHER_CACHE_TTL_SECONDS", "600"))  # 0 disables caching
+    WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "256"))  # Locations kept
+    # Per-day cache of historical weather (past days never change)
+    WEATHER_HISTORY_DB_PATH = os.getenv("WEATHER_HISTORY_DB_PATH", os.path.join(TEMP_DIRECTORY, "weather_history.db"))
+    WEATHER_HISTORY_MAX_WORKERS = int(os.getenv("WEATHER_HISTORY_MAX_WORKERS", "8"))  # Days requested at once
+    NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2")
+    NEWS_CATEGORIES = os.getenv("NEWS_CATEGORIES", "general,technology,business,science").split(",")
+    NEWS_PAGE_SIZE = int(os.getenv("NEWS_PAGE_SIZE", "50"))  # Articles requested per category
+    NEWS_REFRESH_SECONDS = float(os.getenv("NEWS_REFRESH_SECONDS", "300"))  # Stored headlines older than this are refreshed
+    NEWS_DB_PATH = os.getenv("NEWS_DB_PATH", "")  # SQLite file for the article store, empty keeps it in memory
+    NEWS_MAX_ARTICLES = int(os.getenv("NEWS_MAX_ARTICLES", "5000"))
+    NEWS_MAX_WORKERS = int(os.getenv("NEWS_MAX_WORKERS", "8"))  # Categories fetched at once
+
+    # Background Prefetch (warms weather and news ahead of the times they are usually asked for)
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "True").strip().lower() == "true"
+    PREFETCH_LOG_PATH = os.getenv("PREFETCH_LOG_PATH", os.path.join(TEMP_DIRECTORY, "command_log.db"))
+    PREFETCH_MAX_REQUESTS_PER_HOUR = float(os.getenv("PREFETCH_MAX_REQUESTS_PER_HOUR", "20"))  # Background budget
+    # Keep below WEATHER_CACHE_TTL_SECONDS and NEWS_REFRESH_SECONDS, or warmed entries expire before use
+    PREFETCH_LEAD_SECONDS = float(os.getenv("PREFETCH_LEAD_SECONDS", "120"))
+    PREFETCH_SLOT_MINUTES = int(os.getenv("PREFETCH_SLOT_MINUTES", "30"))  # Time-of-day granularity of predictions
+    PREFETCH_MIN_DAYS = int(os.getenv("PREFETCH_MIN_DAYS", "3"))  # Days a query must recur in a slot to be prefetched
+    PREFETCH_WINDOW_DAYS = int(os.getenv("PREFETCH_WINDOW_DAYS", "14"))  # Days of usage considered
+
     # Network Settings
     PROXY_ENABLED = os.getenv("PROXY_ENABLED", "False").strip().lower() == "true"
     PROXY_URL = os.getenv("PROXY_URL", "")
     TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", "30"))
+    # Per-service overrides of TIMEOUT_SECONDS, e.g. "openai=60,whiterabbit=15"
+    SERVICE_TIMEOUTS = {
+        name.strip(): float(value)
+        for name, _, value in (item.partition("=") for item in os.getenv("SERVICE_TIMEOUTS", "").split(","))
+        if value.strip()
+    }
+
+    # Outbound Call Resilience (retries with jittered exponential backoff, circuit breaker per service)
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # 1 disables retries
+    RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "0.5"))
+    RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "10"))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # Consecutive failures that open it
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))  # Fail-fast period before a probe
+
+    # Shared HTTP Client (keep-alive connection pools)
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "16"))  # Hosts whose pools are kept
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # Open connections kept per host
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "False").strip().lower() == "true"
+    HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
 
     # Security Settings
     ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "default-encryption-key")
@@ -68,8 +149,41 @@ class Config:
     NOTIFICATION_ENABLED = os.getenv("NOTIFICATION_ENABLED", "True").strip().lower() == "true"
     NOTIFICATION_CHANNELS = os.getenv("NOTIFICATION_CHANNELS", "email,sms").split(",")
 
+    # System Monitoring
+    MONITOR_INTERVAL_SECONDS = float(os.getenv("MONITOR_INTERVAL_SECONDS", "2"))
+    MONITOR_SAMPLE_CAPACITY = int(os.getenv("MONITOR_SAMPLE_CAPACITY", "300"))
+
+    # Metrics Endpoint (/metrics and /health)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").strip().lower() == "true"
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
+    # Startup Performance
+    STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "1.5"))
+
     # API Rate Limiting
-    API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", "100"))
+    API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", "100"))  # Requests per minute per host, 0 disables
+    # Per-host overrides of API_RATE_LIMIT, e.g. "api.openai.com=500,api.twitter.com=50"
+    API_RATE_LIMITS = {
+        name.strip(): float(value)
+        for name, _, value in (item.partition("=") for item in os.getenv("API_RATE_LIMITS", "").split(","))
+        if value.strip()
+    }
+    API_RATE_LIMIT_MODE = os.getenv("API_RATE_LIMIT_MODE", "block")  # block waits for the budget, fail raises
+    API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "16"))  # Requests AsyncAPIManager keeps in flight
+
+    # API Response Cache (GET responses, revalidated with ETag / Last-Modified)
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "True").strip().lower() == "true"
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))  # Body bytes kept in memory
+    HTTP_CACHE_DEFAULT_TTL_SECONDS = float(os.getenv("HTTP_CACHE_DEFAULT_TTL_SECONDS", "0"))  # 0 revalidates every use
+    # Per-endpoint TTLs as glob=seconds over host and path, e.g. "api.twitter.com/2/tweets*=30"
+    HTTP_CACHE_TTLS = {
+        pattern.strip(): float(value)
+        for pattern, _, value in (item.rpartition("=") for item in os.getenv("HTTP_CACHE_TTLS", "").split(","))
+        if pattern.strip()
+    }
+    HTTP_CACHE_DB_PATH = os.getenv("HTTP_CACHE_DB_PATH", "")  # SQLite file entries spill to, empty disables it
+    HTTP_CACHE_DB_MAX_BYTES = int(os.getenv("HTTP_CACHE_DB_MAX_BYTES", str(256 * 1024 * 1024)))
 
     # Database Settings
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database.db")
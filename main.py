@@ -1,99 +1,96 @@
 import os
+import argparse
+import concurrent.futures
 import logging
 import subprocess
 from config.settings import Config
-from modules.voice_assistant import VoiceAssistant
-from modules.chatbot import ChatBot
-from modules.social_media import SocialMediaManager
-from modules.internet_tasks import InternetTasks
 from modules.face_detection import FaceDetection
 from modules.face_recognition import FaceRecognitionSystem
 from modules.data_retrieval import DataRetrievalEngine
 from operate.orchestrator import Orchestrator
-from modules.device_control import DeviceControl
-from modules.machine_learning import ModelManager
 from modules.pimeye_integration import PimEyeIntegration
+from operate.utils.ocr import OCRUtility
+from operate.utils.shared_resources import RESOURCES
 from apis.whiterabbit import WhiteRabbitAI
 
-# Setup logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("aia.log"), logging.StreamHandler()]
-)
-
 logger = logging.getLogger("AIA_Main")
 
+def setup_logging():
+    """
+    Log to aia.log and the console. Called from main() rather than at import, so importing
+    main (tests, --profile-startup) does not create the log file.
+    """
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler("aia.log"), logging.StreamHandler()]
+    )
+
 def initialize_modules(orchestrator, config):
     """
-    Initialize and register additional modules, including advanced integrations.
+    Register additional modules, including advanced integrations.
+    Modules are registered as factories and only constructed on first use.
     """
     logger = logging.getLogger("ModuleInitializer")
     logging.info("Initializing modules...")
 
-    try:
-        # Device Control Module
-        device_control = DeviceControl(config=config)
-        orchestrator.register_module("device_control", device_control)
-        logger.info("Device Control module initialized.")
-    except Exception as e:
-        logger.error(f"Error initializing Device Control module: {e}", exc_info=True)
-    
-    try:
-        # Machine Learning Manager
-        model_manager = ModelManager(model_type=config.get_model_config("MODEL_TYPE"))
-        orchestrator.register_module("model_manager", model_manager)
-        logger.info("Machine Learning module initialized.")
-    except Exception as e:
-        logger.error(f"Error initializing Machine Learning module: {e}", exc_info=True)
-    
+    # Aliases for modules the orchestrator already owns, so no second copy is built
+    orchestrator.register_alias("model_manager", "ml")
+    orchestrator.register_alias("social_media", "social_media_manager")
+
     try:
         # PimEye Integration
-        # pimeye_api_key = config["pimeye_api_key"]
         pimeye_api_key = config.get_api_key("PIMEYE_API_KEY")
-        pimeye = PimEyeIntegration(api_key=pimeye_api_key)
-        orchestrator.register_module("pimeye_integration", pimeye)
-        # logger.info("PimEye integration initialized.")
-        logging.info(f"PimEye API Key: {pimeye_api_key}")
+        orchestrator.register_module("pimeye_integration", factory=lambda: PimEyeIntegration(api_key=pimeye_api_key))
+        logger.info("PimEye integration registered.")
     except Exception as e:
-        logger.error(f"Error initializing PimEye integration: {e}", exc_info=True)
+        logger.error(f"Error registering PimEye integration: {e}", exc_info=True)
 
     try:
         # Face Detection Module
         face_detection_model_path = config.get_model_config("face_detection_model_path")
         face_detection_threshold = config.get_model_config("detection_threshold")
-        face_detection = FaceDetection(model_path=face_detection_model_path, threshold=face_detection_threshold)
-        orchestrator.register_module("face_detection", face_detection)
-        logger.info("Face Detection module initialized.")
+        orchestrator.register_module(
+            "face_detection",
+            factory=lambda: FaceDetection(model_path=face_detection_model_path, threshold=face_detection_threshold),
+        )
+        logger.info("Face Detection module registered.")
     except Exception as e:
-        logger.error(f"Error initializing Face Detection module: {e}", exc_info=True)
-    
+        logger.error(f"Error registering Face Detection module: {e}", exc_info=True)
+
     try:
         # Face Recognition Module
         face_recognition_model_path = config.get_model_config("face_recognition_model_path")
-        face_recognition = FaceRecognitionSystem(model_path=face_recognition_model_path)
-        orchestrator.register_module("face_recognition", face_recognition)
-        logger.info("Face Recognition module initialized.")
+        orchestrator.register_module(
+            "face_recognition",
+            factory=lambda: FaceRecognitionSystem(model_path=face_recognition_model_path),
+        )
+        logger.info("Face Recognition module registered.")
     except Exception as e:
-        logger.error(f"Error initializing Face Recognition module: {e}", exc_info=True)
-    
+        logger.error(f"Error registering Face Recognition module: {e}", exc_info=True)
+
     try:
         # Data Retrieval Engine
         data_sources = config.get_model_config("data_sources")
-        data_engine = DataRetrievalEngine(data_sources=data_sources)
-        orchestrator.register_module("data_retrieval", data_engine)
-        logger.info("Data Retrieval engine initialized.")
+        orchestrator.register_module("data_retrieval", factory=lambda: DataRetrievalEngine(data_sources=data_sources))
+        logger.info("Data Retrieval engine registered.")
+    except Exception as e:
+        logger.error(f"Error registering Data Retrieval Engine: {e}", exc_info=True)
+
+    try:
+        # OCR runs in worker processes: Tesseract calls are CPU-bound
+        orchestrator.register_module("ocr", factory=OCRUtility, cpu_bound=True)
+        logger.info("OCR utility registered.")
     except Exception as e:
-        logger.error(f"Error initializing Data Retrieval Engine: {e}", exc_info=True)
+        logger.error(f"Error registering OCR utility: {e}", exc_info=True)
 
     try:
         # WhiteRabbit AI API
-        white_rabbit_api_key = config["white_rabbit_api_key"]
-        white_rabbit = WhiteRabbitAI(api_key=white_rabbit_api_key)
-        orchestrator.register_module("white_rabbit_ai", white_rabbit)
-        logger.info("WhiteRabbit AI integration initialized.")
+        white_rabbit_api_key = config.get_api_key("WHITERABBIT_API_KEY")
+        orchestrator.register_module("white_rabbit_ai", factory=lambda: WhiteRabbitAI(api_key=white_rabbit_api_key))
+        logger.info("WhiteRabbit AI integration registered.")
     except Exception as e:
-        logger.error(f"Error initializing WhiteRabbit AI API: {e}", exc_info=True)
+        logger.error(f"Error registering WhiteRabbit AI API: {e}", exc_info=True)
 
 
 def start_s3_service():
@@ -106,50 +103,138 @@ def start_s3_service():
     except Exception as e:
         logger.error(f"Error starting S3 service: {e}", exc_info=True)
 
+def job_reporter(label):
+    """
+    Build an on_done callback that prints a background job's outcome at the prompt.
+    """
+    def report(job):
+        if job.state == "finished":
+            print(f"\n[Job {job.job_id} finished in {job.duration:.2f}s] {label}: {job.future.result()}")
+        elif job.state == "failed":
+            print(f"\n[Job {job.job_id} failed after {job.duration:.2f}s] {job.future.exception()}")
+    return report
+
+def show_job_result(orchestrator, argument, wait):
+    """
+    Print the result of a background job, optionally waiting for it to finish.
+    """
+    try:
+        job = orchestrator.jobs.get(int(argument))
+    except (ValueError, KeyError):
+        print(f"Unknown job ID: {argument!r}. Type 'status' to list jobs.")
+        return
+    try:
+        result = job.future.result(timeout=None if wait else 0)
+        print(f"Job {job.job_id} ({job.description}): {result}")
+    except concurrent.futures.TimeoutError:
+        print(f"Job {job.job_id} is still {job.state}. Use 'wait {job.job_id}' to block until it finishes.")
+    except concurrent.futures.CancelledError:
+        print(f"Job {job.job_id} was cancelled.")
+    except KeyboardInterrupt:
+        print(f"\nStopped waiting; job {job.job_id} keeps running in the background.")
+    except Exception as e:
+        print(f"Job {job.job_id} failed: {e}")
+
+def stream_chat(orchestrator, prompt):
+    """
+    Print a chatbot reply token by token as it arrives. Ctrl+C stops the reply early.
+    """
+    chunks = orchestrator.chatbot.stream_response(prompt)
+    print("AIA: ", end="", flush=True)
+    try:
+        for chunk in chunks:
+            print(chunk, end="", flush=True)
+    except KeyboardInterrupt:
+        chunks.close()
+        print(" [stopped]", end="")
+    print()
+
 def interactive_ui(orchestrator):
     """
     Command-line UI for interacting with the AIA system.
+    Long-running commands run as background jobs so the prompt stays responsive.
     """
     logger = logging.getLogger("InteractiveUI")
     print("\nWelcome to the Advanced Intelligent Assistant (AIA) System!")
     print("Type 'help' for available commands or 'exit' to quit.\n")
     
-    while True:
-        # try:
-        user_input = input("AIA > ").strip()
-        if user_input.lower() == "exit":
-            print("Exiting AIA System. Goodbye!")
-            break
-        elif user_input.lower() == "help":
-            print("Available Commands: [start, stop, detect_face, recognize_person, retrieve_data, download_file, status, exit]")
-        elif user_input.lower() == "download_file":
-            file_name = input("Enter the file name to download from S3: ")
-            # Call the new S3 download function
-            download_from_s3(file_name)
-        elif user_input.lower() == "detect_face":
-            image_path = input("Enter the image path for face detection: ")
-            results = orchestrator.execute_task("face_detection", {"image_path": image_path})
-            print(f"Detected Faces: {results}")
-        elif user_input.lower() == "recognize_person":
-            image_path = input("Enter the image path for recognition: ")
-            results = orchestrator.execute_task("face_recognition", {"image_path": image_path})
-            print(f"Recognition Results: {results}")
-        elif user_input.lower() == "retrieve_data":
-            image_path = input("Enter the image path for data retrieval: ")
-            results = orchestrator.execute_task("data_retrieval", {"image_path": image_path})
-            print(f"Data Retrieved: {results}")
-        else:
-            response = orchestrator.chatbot.generate_response(user_input)
-            print(f"AIA: {response}")
-
-def download_from_s3(file_name):
+    # One session for the whole UI: downloads reuse its pooled connections
+    session = RESOURCES.acquire("http_session")
+    try:
+        while True:
+            user_input = input("AIA > ").strip()
+            command, _, argument = user_input.partition(" ")
+            command, argument = command.lower(), argument.strip()
+            try:
+                if user_input.lower() == "exit":
+                    print("Exiting AIA System. Goodbye!")
+                    break
+                elif user_input.lower() == "help":
+                    print("Available Commands: [start, stop, detect_face, recognize_person, retrieve_data, download_file, "
+                          "status, wait <id>, result <id>, cancel <id>, metrics, modules, resources, forget, exit]")
+                elif user_input.lower() == "modules":
+                    print(orchestrator.module_report())
+                elif user_input.lower() == "forget":
+                    orchestrator.chatbot.memory.clear()
+                    print("Conversation history cleared.")
+                elif user_input.lower() == "resources":
+                    print(RESOURCES.memory_report())
+                    print(RESOURCES.peek("http_session").format_stats())
+                elif user_input.lower() == "metrics":
+                    print(orchestrator.sampler.format_summary())
+                elif user_input.lower() == "status":
+                    print(orchestrator.jobs.format_status())
+                elif command in ("wait", "result") and argument:
+                    show_job_result(orchestrator, argument, wait=command == "wait")
+                elif command == "cancel" and argument:
+                    try:
+                        cancelled = orchestrator.jobs.cancel(int(argument))
+                        print(f"Job {argument} cancelled." if cancelled else f"Job {argument} already finished.")
+                    except (ValueError, KeyError):
+                        print(f"Unknown job ID: {argument!r}.")
+                elif user_input.lower() == "download_file":
+                    file_name = input("Enter the file name to download from S3: ")
+                    job = orchestrator.jobs.submit(
+                        f"download {file_name}", "s3_download", download_from_s3, file_name, session,
+                        on_done=job_reporter("Download"),
+                    )
+                    print(f"Job {job.job_id} submitted: downloading {file_name}.")
+                elif user_input.lower() == "detect_face":
+                    image_path = input("Enter the image path for face detection: ")
+                    job = orchestrator.submit_job(
+                        f"detect_face {image_path}", "face_detection", {"video_source": image_path},
+                        on_done=job_reporter("Detected Faces"),
+                    )
+                    print(f"Job {job.job_id} submitted: face detection.")
+                elif user_input.lower() == "recognize_person":
+                    image_path = input("Enter the image path for recognition: ")
+                    job = orchestrator.submit_job(
+                        f"recognize_person {image_path}", "face_recognition", {"video_source": image_path},
+                        on_done=job_reporter("Recognition Results"),
+                    )
+                    print(f"Job {job.job_id} submitted: person recognition.")
+                elif user_input.lower() == "retrieve_data":
+                    image_path = input("Enter the image path for data retrieval: ")
+                    job = orchestrator.submit_job(
+                        f"retrieve_data {image_path}", "data_retrieval", {"image_path": image_path},
+                        on_done=job_reporter("Data Retrieved"),
+                    )
+                    print(f"Job {job.job_id} submitted: data retrieval.")
+                elif user_input:
+                    stream_chat(orchestrator, user_input)
+            except Exception as e:
+                logger.error(f"Error handling command '{user_input}': {e}", exc_info=True)
+                print(f"Error: {e}")
+    finally:
+        RESOURCES.release("http_session")
+
+def download_from_s3(file_name, session):
     """
     Function to download files from S3 using the FastAPI endpoint.
     """
-    import requests
     url = f"http://localhost:8000/download/{file_name}"
-    response = requests.get(url)
-    
+    response = session.get(url)
+
     if response.status_code == 200:
         with open(file_name, 'wb') as f:
             f.write(response.content)
@@ -157,11 +242,35 @@ def download_from_s3(file_name):
     else:
         print(f"Error: {response.json()}")
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse command-line arguments for the AIA entry point.
+    """
+    parser = argparse.ArgumentParser(description="Advanced Intelligent Assistant (AIA)")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print a ranked import-time breakdown of startup and exit.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus /metrics and /health on this port (overrides METRICS_PORT).",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main entry point for the AIA system.
     Initializes configurations, orchestrator, and various modules.
     """
+    args = parse_args(argv)
+    if args.profile_startup:
+        from operate.utils.startup_profiler import profile_startup
+        print(profile_startup("main"))
+        return
+
+    setup_logging()
     logger.info("Starting AIA System...")
     
     # Load configuration
@@ -169,33 +278,29 @@ def main():
     config = Config.load_config()  # Correct way to call the static method
     logging.info("Configuration loaded successfully.")
     
-    # Initialize orchestrator
+    # Initialize orchestrator; it registers the core modules (voice assistant, chatbot,
+    # social media, internet tasks, ...) and builds each one on first use
     orchestrator = Orchestrator(config=config)
-    
-    # Initialize voice assistant
-    voice_assistant = VoiceAssistant(config=config)
-    orchestrator.register_module("voice_assistant", voice_assistant)
-    
-    # Initialize chatbot
-    chatbot = ChatBot()
-    orchestrator.register_module("chatbot", chatbot)
-    
-    # Initialize social media manager
-    social_media_manager = SocialMediaManager(config=config)
-    orchestrator.register_module("social_media", social_media_manager)
-    
-    # Initialize internet tasks manager
-    internet_task_manager = InternetTasks(config=config)
-    orchestrator.register_module("internet_tasks", internet_task_manager)
-    
-    # Initialize additional modules
+
+    # Register additional modules
     initialize_modules(orchestrator, config)  # Pass the orchestrator and config
-    
+
     # Start the S3 service
     start_s3_service()
     
+    # Sample resource usage in the background (queryable with 'metrics')
+    orchestrator.monitor_system()
+
+    # Expose /metrics and /health for dashboards
+    if config.METRICS_ENABLED or args.metrics_port is not None:
+        orchestrator.start_metrics_server(port=args.metrics_port)
+
     # Start interactive UI
-    interactive_ui(orchestrator)
+    try:
+        interactive_ui(orchestrator)
+    finally:
+        # Do not keep the process alive for background jobs the user walked away from
+        orchestrator.shutdown(wait=False)
 
 if __name__ == "__main__":
     main()
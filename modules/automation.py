@@ -2,9 +2,11 @@ import os
 import time
 import threading
 from datetime import datetime
-import pyautogui
 from modules.error_handling import ErrorHandling
 from modules.device_control import DeviceControl
+from operate.utils.lazy_import import lazy_import
+
+pyautogui = lazy_import("pyautogui")
 
 
 class Automation:
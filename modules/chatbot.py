@@ -1,46 +1,380 @@
-import openai
+import json
 import logging
 import os
-from transformers import GPT2TokenizerFast
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
+from operate.utils.shared_resources import RESOURCES
+from modules.response_cache import ResponseCache
+from modules.conversation_memory import ConversationMemory
+from modules.llm_backends import create_backend
+from operate.utils.metrics import REGISTRY
+from operate.utils.rate_limit import RequestBudget
+from operate.utils.resilience import CircuitOpenError, for_service
+from operate.utils.singleflight import SingleFlight
+from config.settings import Config
 
 load_dotenv()
 
+FALLBACK_RESPONSE = "Sorry, I couldn't process your request at the moment."
+UNAVAILABLE_RESPONSE = "The chat service is temporarily unavailable. Please try again in a moment."
+TOKEN_COUNT_CACHE_SIZE = 4096
+
+CHAT_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "aia_chat_time_to_first_token_seconds", "Time from request to the first streamed token."
+)
+CHAT_RESPONSE_SECONDS = REGISTRY.histogram(
+    "aia_chat_response_seconds", "Time from request to the complete response.", ("mode",)
+)
+
+# A sentence ends at ., ! or ? followed by whitespace, or at a line break
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one prompt in ChatBot.generate_responses."""
+    prompt: str
+    response: Optional[str] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def iter_sentences(chunks):
+    """
+    Regroup streamed text chunks into complete sentences, so speech can start on the
+    first sentence instead of waiting for the whole reply.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        parts = _SENTENCE_END.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+    if buffer.strip():
+        yield buffer.strip()
+
 class ChatBot:
-    def __init__(self, model='gpt-3.5-turbo', api_key=None):
+    def __init__(self, model='gpt-3.5-turbo', api_key=None, cache=None, bypass_cache_when_sampling=None,
+                 memory=None, budget=None, backend=None, resilience=None, context_free_prompts=None):
         """
         Initialize the Chatbot with OpenAI's model.
+
+        :param backend: LLMBackend answering requests (selected by Config.LLM_BACKEND if omitted).
+        :param cache: ResponseCache for completions (built from Config if omitted, unless disabled
+                      there; False disables caching).
+        :param bypass_cache_when_sampling: Skip the cache for temperature > 0 (defaults to Config).
+        :param memory: ConversationMemory holding the chat history (built from Config if omitted).
+        :param budget: RequestBudget shared by every request of this bot (built from Config if omitted).
+        :param resilience: Retries and circuit breaker for backend calls (the backend service's
+                           shared one if omitted).
+        :param context_free_prompts: Canned prompts (e.g. "help") answered without the conversation
+                                     history and cached across contexts (defaults to Config).
         """
         self.model = model
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("API key for OpenAI is required.")
-        openai.api_key = self.api_key
-        self.tokenizer = GPT2TokenizerFast.from_pretrained("gpt2")
+        self.backend = backend or create_backend(Config, api_key=self.api_key)
+        self.resilience = resilience or for_service(self.backend.service)
+        self._tokenizer = None
+        self._token_counts = OrderedDict()
+        self._token_counts_lock = threading.Lock()
+        if cache is None and Config.CHAT_CACHE_ENABLED:
+            cache = ResponseCache.from_config(Config)
+        self.cache = cache if cache is not False else None
+        if bypass_cache_when_sampling is None:
+            bypass_cache_when_sampling = Config.CHAT_CACHE_BYPASS_SAMPLED
+        self.bypass_cache_when_sampling = bypass_cache_when_sampling
+        if context_free_prompts is None:
+            context_free_prompts = Config.CHAT_CONTEXT_FREE_PROMPTS
+        self.context_free_prompts = {
+            ResponseCache.normalize_prompt(prompt) for prompt in context_free_prompts if prompt.strip()
+        }
+        self.last_stream_timing = None
+        self.memory = memory or ConversationMemory(
+            self.estimate_tokens_batch,
+            max_tokens=Config.CHAT_CONTEXT_TOKENS,
+            system_prompt=Config.CHAT_SYSTEM_PROMPT,
+            summarizer=self._summarize if Config.CHAT_MEMORY_SUMMARIZE else None,
+        )
+        self.budget = budget or RequestBudget(Config.OPENAI_REQUESTS_PER_MINUTE, Config.OPENAI_TOKENS_PER_MINUTE)
+        # Identical requests arriving together (e.g. from the voice and REPL paths) share one call
+        self.inflight = SingleFlight("chatbot")
+
+    @property
+    def tokenizer(self):
+        """The shared GPT-2 tokenizer, loaded on first use."""
+        if self._tokenizer is None:
+            self._tokenizer = RESOURCES.acquire("gpt2_tokenizer")
+        return self._tokenizer
 
-    def generate_response(self, user_prompt, max_tokens=300, temperature=0.7):
+    def close(self):
+        """
+        Return the shared tokenizer.
+        """
+        if self._tokenizer is not None:
+            RESOURCES.release("gpt2_tokenizer")
+            self._tokenizer = None
+
+    def generate_response(self, user_prompt, max_tokens=300, temperature=0.7, bypass_cache=False,
+                          raise_errors=False):
         """
         Generate a response for the given user prompt using the OpenAI model.
+        Repeated prompts are answered from the response cache; failures are never cached.
+        Transient backend failures are retried; while the backend's circuit is open the call
+        fails fast.
+
+        :param bypass_cache: Always ask the model (the fresh answer still refreshes the cache).
+        :param raise_errors: Re-raise a failure instead of answering with a fallback reply.
         """
         logging.info("Generating response for user prompt.")
+        cache_key, cached = self._cache_lookup(user_prompt, max_tokens, temperature, bypass_cache)
+        if cached is not None:
+            self.memory.add_exchange(user_prompt, cached)
+            return cached
+        messages = self._build_messages(user_prompt)
+
+        def remember(response):
+            # Runs once per coalesced flight, so the turn is recorded once however many callers share it
+            if cache_key is not None:
+                self.cache.set(cache_key, response)
+            self.memory.add_exchange(user_prompt, response)
+
+        start_time = time.perf_counter()
+        try:
+            response = self._complete_shared(messages, max_tokens, temperature, on_complete=remember)
+        except Exception as e:
+            if raise_errors:
+                raise
+            return self._fallback(e, "generating response")
+        CHAT_RESPONSE_SECONDS.observe(time.perf_counter() - start_time, mode="complete")
+        return response
+
+    def stream_response(self, user_prompt, max_tokens=300, temperature=0.7, bypass_cache=False):
+        """
+        Like generate_response, but yields the reply in chunks as the model produces them.
+        A cached reply is yielded in one piece. Time to first token and total latency are
+        recorded for every streamed call and kept in `last_stream_timing`.
+        """
+        logging.info("Streaming response for user prompt.")
+        cache_key, cached = self._cache_lookup(user_prompt, max_tokens, temperature, bypass_cache)
+        if cached is not None:
+            self.memory.add_exchange(user_prompt, cached)
+            yield cached
+            return
+        messages = self._build_messages(user_prompt)
+        self._reserve(messages, max_tokens)
+        start_time = time.perf_counter()
+        first_token_seconds = None
+        parts = []
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[{"role": "user", "content": user_prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                stop=None
-            )
-            return response['choices'][0]['message']['content'].strip()
+            for chunk in self._stream(messages, max_tokens, temperature):
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - start_time
+                    CHAT_FIRST_TOKEN_SECONDS.observe(first_token_seconds)
+                parts.append(chunk)
+                yield chunk
         except Exception as e:
-            logging.error(f"Error generating response: {e}")
-            return "Sorry, I couldn't process your request at the moment."
+            fallback = self._fallback(e, "streaming response")
+            if not parts:
+                yield fallback
+            return
+        total_seconds = time.perf_counter() - start_time
+        CHAT_RESPONSE_SECONDS.observe(total_seconds, mode="stream")
+        self.last_stream_timing = {"first_token_seconds": first_token_seconds, "total_seconds": total_seconds}
+        logging.info(
+            f"Streamed response: first token after {first_token_seconds or 0:.3f}s, complete after {total_seconds:.3f}s."
+        )
+        response = "".join(parts).strip()
+        if cache_key is not None and response:
+            self.cache.set(cache_key, response)
+        self.memory.add_exchange(user_prompt, response)
+
+    def generate_responses(self, prompts, max_tokens=300, temperature=0.7, max_concurrency=None,
+                           bypass_cache=False):
+        """
+        Answer many independent prompts concurrently (e.g. bulk summarization). Requests run
+        at most `max_concurrency` at a time and within the bot's requests/tokens-per-minute
+        budget. Prompts do not see or change the conversation memory.
+
+        :return: One BatchResult per prompt, in input order. A failed prompt carries its
+                 exception instead of failing the batch.
+        """
+        prompts = list(prompts)
+        if not prompts:
+            return []
+        if self.budget.tokens is not None:
+            # One tokenizer call for the whole batch; workers then hit the memoized counts
+            self.estimate_tokens_batch(prompts)
+        workers = min(max_concurrency or Config.CHAT_BATCH_CONCURRENCY, len(prompts))
+
+        def answer(prompt):
+            try:
+                cache_key, cached = self._cache_lookup(prompt, max_tokens, temperature, bypass_cache, context="batch")
+                if cached is not None:
+                    return BatchResult(prompt, response=cached)
+                messages = [{"role": "user", "content": prompt}]
+                start_time = time.perf_counter()
+                response = self._complete_shared(messages, max_tokens, temperature)
+                CHAT_RESPONSE_SECONDS.observe(time.perf_counter() - start_time, mode="batch")
+                if cache_key is not None:
+                    self.cache.set(cache_key, response)
+                return BatchResult(prompt, response=response)
+            except Exception as e:
+                logging.error(f"Error generating batch response: {e}")
+                return BatchResult(prompt, error=e)
+
+        logging.info(f"Generating {len(prompts)} responses with {workers} concurrent request(s).")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ChatBatch") as executor:
+            return list(executor.map(answer, prompts))
+
+    @staticmethod
+    def _fallback(error, action):
+        """
+        Log a failed request and return the reply to give instead. An open circuit is
+        expected while the backend is down, so it is logged without a traceback.
+        """
+        if isinstance(error, CircuitOpenError):
+            logging.warning(f"Error {action}: {error}")
+            return UNAVAILABLE_RESPONSE
+        logging.error(f"Error {action}: {error}", exc_info=True)
+        return FALLBACK_RESPONSE
+
+    def _reserve(self, messages, max_tokens):
+        """
+        Wait until a request of this size fits the budget. Like the API, counts the prompt
+        plus the completion allowance.
+        """
+        if self.budget.tokens is None:
+            self.budget.acquire()
+            return
+        prompt_tokens = sum(self.estimate_tokens_batch([message["content"] for message in messages]))
+        self.budget.acquire(prompt_tokens + max_tokens)
+
+    def is_context_free(self, user_prompt):
+        """Whether `user_prompt` is a canned query whose answer does not depend on the conversation."""
+        return ResponseCache.normalize_prompt(user_prompt) in self.context_free_prompts
+
+    def _build_messages(self, user_prompt):
+        """
+        Chat messages for `user_prompt`: the conversation so far, or only the system prompt
+        for a context-free query.
+        """
+        if not self.is_context_free(user_prompt):
+            return self.memory.build_messages(user_prompt)
+        system_prompt = self.memory.system_prompt
+        head = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        return head + [{"role": "user", "content": user_prompt}]
+
+    def _cache_lookup(self, user_prompt, max_tokens, temperature, bypass_cache, context=None):
+        """
+        Return (cache key, cached response). The key is None when caching is disabled and the
+        response None on a miss or bypass.
+
+        :param context: Identifies the context the prompt is asked in (defaults to the
+                        conversation memory's digest, or none for a context-free prompt).
+        """
+        if self.cache is None:
+            return None, None
+        # The same prompt can deserve a different answer in a different conversation
+        if context is None:
+            context = "none" if self.is_context_free(user_prompt) else self.memory.digest()
+        cache_key = ResponseCache.make_key(user_prompt, self.model, temperature, max_tokens, context=context)
+        if bypass_cache or (self.bypass_cache_when_sampling and temperature > 0):
+            self.cache.record_bypass()
+            return cache_key, None
+        return cache_key, self.cache.get(cache_key)
+
+    def _complete(self, messages, max_tokens, temperature):
+        """
+        Ask the backend for a completion of the chat `messages`, retrying transient
+        failures. Raises on failure, or CircuitOpenError while the backend is down.
+        """
+        return self.resilience.call(self.backend.complete, messages, self.model, max_tokens, temperature)
+
+    def _complete_shared(self, messages, max_tokens, temperature, on_complete=None):
+        """
+        Budgeted completion, coalesced with any identical request already in flight:
+        all callers get the one upstream result (or its exception).
+
+        :param on_complete: Called with the result by the caller that made the upstream call
+                            only, before the others are handed the result.
+        """
+        key = (json.dumps(messages, sort_keys=True), max_tokens, round(float(temperature), 3))
+
+        def reserve_and_complete():
+            self._reserve(messages, max_tokens)
+            response = self._complete(messages, max_tokens, temperature)
+            if on_complete is not None:
+                on_complete(response)
+            return response
+
+        return self.inflight.do(key, reserve_and_complete)
+
+    def _stream(self, messages, max_tokens, temperature):
+        """
+        Ask the backend for a streamed completion of the chat `messages` and yield its text
+        chunks. Opening the stream (up to the first chunk) is retried like `_complete`; a
+        stream that breaks after text was yielded is not, since the text cannot be taken back.
+        """
+        def open_stream():
+            chunks = iter(self.backend.stream(messages, self.model, max_tokens, temperature))
+            return chunks, next(chunks, None)
+
+        chunks, first = self.resilience.call(open_stream)
+        if first is None:
+            return
+        yield first
+        yield from chunks
+
+    def _summarize(self, previous_summary, messages):
+        """
+        Fold messages dropped from the conversation memory into its running summary.
+        """
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        prompt = (
+            "Update the summary of this conversation with the new messages. Keep facts, names and "
+            f"open requests; be brief.\n\nSummary so far:\n{previous_summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+        summary = self._complete([{"role": "user", "content": prompt}], max_tokens=150, temperature=0)
+        return f"Summary of the earlier conversation: {summary}"
 
     def estimate_tokens(self, text):
         """
         Estimate the number of tokens in the text using GPT-2 tokenizer.
         """
-        return len(self.tokenizer.encode(text))
+        return self.estimate_tokens_batch([text])[0]
+
+    def estimate_tokens_batch(self, texts):
+        """
+        Token counts for several texts. Counts are memoized per text, and texts not seen
+        before are encoded together in one tokenizer call.
+        """
+        counts = {}
+        with self._token_counts_lock:
+            for text in texts:
+                if text in self._token_counts:
+                    self._token_counts.move_to_end(text)
+                    counts[text] = self._token_counts[text]
+        missing = list(dict.fromkeys(text for text in texts if text not in counts))
+        if missing:
+            encoded = self.tokenizer(missing)["input_ids"]
+            with self._token_counts_lock:
+                for text, ids in zip(missing, encoded):
+                    counts[text] = self._token_counts[text] = len(ids)
+                while len(self._token_counts) > TOKEN_COUNT_CACHE_SIZE:
+                    self._token_counts.popitem(last=False)
+        return [counts[text] for text in texts]
 
     def interact(self):
         """
@@ -54,8 +388,10 @@ class ChatBot:
                 break
             estimated_tokens = self.estimate_tokens(user_input)
             print(f"Estimated Tokens: {estimated_tokens}")
-            response = self.generate_response(user_input)
-            print(f"Chatbot: {response}")
+            print("Chatbot: ", end="", flush=True)
+            for chunk in self.stream_response(user_input):
+                print(chunk, end="", flush=True)
+            print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+# Approximate per-message framing cost of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@dataclass(frozen=True)
+class Message:
+    role: str
+    content: str
+    tokens: int
+
+    def as_dict(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+
+class ConversationMemory:
+    """
+    Conversation history kept within a token budget.
+
+    Token counts are computed once per message when it is added (in one batch call to
+    `count_tokens`), so building a request never re-tokenizes the history. When the history
+    outgrows `max_tokens`, the oldest messages are dropped; if a `summarizer` is given they
+    are folded into a running summary that is sent ahead of the remaining history instead.
+    """
+
+    def __init__(self, count_tokens: Callable[[List[str]], List[int]], max_tokens: int = 2000,
+                 system_prompt: Optional[str] = None,
+                 summarizer: Optional[Callable[[str, List[Message]], str]] = None):
+        """
+        :param count_tokens: Returns the token count of each text in a list.
+        :param max_tokens: Budget for the whole request: system prompt, summary, history and prompt.
+        :param system_prompt: Instructions sent first on every turn.
+        :param summarizer: Called with (previous summary, dropped messages), returns the new summary.
+        """
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.logger = logging.getLogger("ConversationMemory")
+        self.history = deque()
+        self.history_tokens = 0
+        self.system_prompt = system_prompt
+        self._system_message = None
+        self.summary: Optional[Message] = None
+        self._unsummarized: List[Message] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._summary_lock = threading.Lock()
+
+    @property
+    def system_message(self) -> Optional[Message]:
+        # Counted on first use so building the memory does not load the tokenizer
+        if self._system_message is None and self.system_prompt:
+            self._system_message = self._message("system", self.system_prompt)
+        return self._system_message
+
+    def _message(self, role: str, content: str) -> Message:
+        return Message(role, content, self.count_tokens([content])[0] + MESSAGE_OVERHEAD_TOKENS)
+
+    def _fixed_tokens(self) -> int:
+        return sum(message.tokens for message in (self.system_message, self.summary) if message is not None)
+
+    def add_exchange(self, user_message: str, assistant_message: str):
+        """
+        Record one user/assistant turn and trim the history back into budget.
+        """
+        user_tokens, assistant_tokens = self.count_tokens([user_message, assistant_message])
+        with self._lock:
+            for message in (
+                Message("user", user_message, user_tokens + MESSAGE_OVERHEAD_TOKENS),
+                Message("assistant", assistant_message, assistant_tokens + MESSAGE_OVERHEAD_TOKENS),
+            ):
+                self.history.append(message)
+                self.history_tokens += message.tokens
+            dropped = self._trim()
+        # The summarizer is usually an LLM call, so it runs without blocking readers of the history
+        if dropped and self.summarizer is not None:
+            self._summarize()
+
+    def _trim(self) -> List[Message]:
+        dropped = []
+        while self.history and self.history_tokens + self._fixed_tokens() > self.max_tokens:
+            message = self.history.popleft()
+            self.history_tokens -= message.tokens
+            dropped.append(message)
+        if dropped:
+            self._unsummarized.extend(dropped)
+            self.logger.debug(f"Trimmed {len(dropped)} message(s) from conversation history.")
+        return dropped
+
+    def _summarize(self):
+        # One summary at a time, folding in everything dropped so far in the order it was dropped
+        with self._summary_lock:
+            with self._lock:
+                if not self._unsummarized:
+                    return
+                dropped, self._unsummarized = self._unsummarized, []
+                previous = self.summary
+                generation = self._generation
+            try:
+                summary = self._message("system", self.summarizer(previous.content if previous else "", dropped))
+            except Exception:
+                self.logger.error("Failed to summarize conversation history.", exc_info=True)
+                return
+            # A summary that outgrows the budget is worth less than the history it would crowd out
+            if summary.tokens > self.max_tokens // 2:
+                self.logger.warning("Conversation summary outgrew its budget; keeping the previous one.")
+                return
+            with self._lock:
+                # Cleared while summarizing: the summary describes a conversation that is gone
+                if self._generation == generation:
+                    self.summary = summary
+
+    def build_messages(self, prompt: str, prompt_tokens: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Chat messages for the next request: system prompt, summary, as much recent history as
+        fits in the budget, then `prompt`.
+        """
+        if prompt_tokens is None:
+            prompt_tokens = self.count_tokens([prompt])[0]
+        with self._lock:
+            available = self.max_tokens - self._fixed_tokens() - prompt_tokens - MESSAGE_OVERHEAD_TOKENS
+            recent = []
+            for message in reversed(self.history):
+                if message.tokens > available:
+                    break
+                available -= message.tokens
+                recent.append(message)
+            head = [message for message in (self.system_message, self.summary) if message is not None]
+        return [message.as_dict() for message in head + recent[::-1]] + [{"role": "user", "content": prompt}]
+
+    def digest(self) -> str:
+        """
+        Fingerprint of the current context, so cached replies are only reused in the same context.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(f"system\0{self.system_prompt or ''}\0".encode("utf-8"))
+        with self._lock:
+            for message in (self.summary, *self.history):
+                if message is not None:
+                    hasher.update(f"{message.role}\0{message.content}\0".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def total_tokens(self) -> int:
+        with self._lock:
+            return self.history_tokens + self._fixed_tokens()
+
+    def clear(self):
+        with self._lock:
+            self.history.clear()
+            self.history_tokens = 0
+            self.summary = None
+            self._unsummarized = []
+            self._generation += 1
@@ -1,9 +1,11 @@
-import pyautogui
 import os
 import subprocess
 import time
 import platform
-import psutil
+from operate.utils.lazy_import import lazy_import
+
+pyautogui = lazy_import("pyautogui")
+psutil = lazy_import("psutil")
 
 class DeviceControl:
 
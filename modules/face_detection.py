@@ -1,10 +1,12 @@
-import cv2
-import face_recognition
-import numpy as np
 import os
+from operate.utils.lazy_import import lazy_import
 from modules.social_media_search import SocialMediaSearch  # Correct import for SocialMediaSearch
 from modules.error_handling import ErrorLogger
 
+cv2 = lazy_import("cv2")
+face_recognition = lazy_import("face_recognition")
+np = lazy_import("numpy")
+
 class FaceDetection:
     """
     AIA's module for real-time face detection and person information retrieval from social media platforms.
@@ -1,9 +1,13 @@
-import cv2
-import face_recognition
-import numpy as np
 from modules.error_handling import ErrorLogger
 from config.social_media_keys import SocialMediaKeys
 from modules.pimeye_integration import PimEyeIntegration
+from operate.utils.lazy_import import lazy_import
+from operate.utils.shared_resources import RESOURCES
+
+cv2 = lazy_import("cv2")
+face_recognition = lazy_import("face_recognition")
+np = lazy_import("numpy")
+requests = lazy_import("requests")
 
 
 class FaceRecognitionSystem:
@@ -24,6 +28,15 @@ class FaceRecognitionSystem:
         self.tolerance = 0.5
         self.known_faces = []
         self.known_names = []
+        self.session = RESOURCES.acquire("http_session")
+
+    def close(self):
+        """
+        Return the shared HTTP session.
+        """
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
 
     def load_known_faces(self, directory="known_faces"):
         """
@@ -104,7 +117,7 @@ class FaceRecognitionSystem:
             # Simulated API request
             headers = {"Authorization": f"Bearer {config['api_key']}"}
             payload = {"face_encoding": face_encoding.tolist()}
-            response = requests.post(f"{config['base_url']}face/search", json=payload, headers=headers)
+            response = self.session.post(f"{config['base_url']}face/search", json=payload, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
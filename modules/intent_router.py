@@ -0,0 +1,186 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Trie key marking the end of a keyword (never a single character, so it cannot clash)
+_TERMINAL = ""
+
+
+@dataclass
+class Intent:
+    """
+    A declarative intent: the keywords that trigger it, the handler it maps to and an
+    optional regular expression whose named groups become keyword arguments of the handler.
+    """
+    name: str
+    keywords: Tuple[str, ...]
+    handler: Callable
+    pattern: Optional[re.Pattern] = None
+    priority: int = 0
+
+
+@dataclass
+class IntentMatch:
+    """
+    Result of routing a command: the winning intent, the keyword that triggered it and
+    the arguments extracted from the command.
+    """
+    intent: Intent
+    keyword: str
+    position: int
+    arguments: Dict[str, str] = field(default_factory=dict)
+
+    def dispatch(self):
+        """Call the intent handler with the extracted arguments."""
+        return self.intent.handler(**self.arguments)
+
+
+class IntentRouter:
+    """
+    Routes free-text commands to handlers with a single pass over the command.
+
+    All intent keywords are merged into one prefix trie that is compiled into a single
+    regular expression, so a command is scanned once regardless of how many intents are
+    registered. When several keywords occur in a command the winner is decided explicitly,
+    not by registration order: highest priority first, then the longest keyword, then the
+    earliest occurrence.
+
+    Routing cost is flat in the number of intents but higher per command than a substring
+    if/elif chain, which stays faster up to roughly 50 intents (see
+    benchmarks/bench_intent_router.py). The router is for deterministic precedence and
+    argument extraction, not speed at the handful of intents the assistant registers.
+    """
+
+    def __init__(self, whole_words: bool = True):
+        """
+        :param whole_words: Only match keywords on word boundaries ("chat" does not match "chatter").
+        """
+        self.whole_words = whole_words
+        self.intents: List[Intent] = []
+        self._lock = threading.Lock()
+        self._compiled = None
+
+    def register(self, name: str, keywords: Iterable[str], handler: Callable,
+                 pattern: Optional[str] = None, priority: int = 0) -> Intent:
+        """
+        Register an intent.
+
+        :param name: Intent name, used for logging and metrics.
+        :param keywords: Phrases that trigger the intent (matched case-insensitively).
+        :param handler: Callable invoked with the arguments extracted by `pattern`.
+        :param pattern: Optional regex; its named groups that matched are passed to the handler.
+        :param priority: Intents with a higher priority win over longer keyword matches.
+        :return: The registered Intent.
+        """
+        keywords = tuple(keyword.lower().strip() for keyword in keywords if keyword.strip())
+        if not keywords:
+            raise ValueError(f"Intent '{name}' needs at least one keyword.")
+        compiled_pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        intent = Intent(name, keywords, handler, compiled_pattern, priority)
+        with self._lock:
+            self.intents.append(intent)
+            self._compiled = None
+        return intent
+
+    def compile(self):
+        """
+        Build the keyword matcher. Called automatically on the first match after a change.
+        """
+        keywords = {}
+        trie = {}
+        for intent in self.intents:
+            for keyword in intent.keywords:
+                keywords.setdefault(keyword, []).append(intent)
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[_TERMINAL] = keyword
+
+        body = _trie_to_regex(trie) or r"(?!x)x"
+        if self.whole_words:
+            pattern = rf"(?<!\w)(?=({body})(?!\w))"
+        else:
+            pattern = rf"(?=({body}))"
+        compiled = (re.compile(pattern), trie, keywords)
+        with self._lock:
+            self._compiled = compiled
+        return compiled
+
+    def find_all(self, command: str) -> List[Tuple[int, str, Intent]]:
+        """
+        Return every (start position, keyword, intent) occurring in the command.
+        """
+        compiled = self._compiled or self.compile()
+        pattern, trie, keywords = compiled
+        text = command.lower()
+        hits = []
+        for found in pattern.finditer(text):
+            start, end = found.span(1)
+            # The regex reports the longest keyword at each position; walk the trie along it
+            # to also pick up shorter keywords that are prefixes of it.
+            node = trie
+            for position in range(start, end):
+                node = node[text[position]]
+                keyword = node.get(_TERMINAL)
+                if keyword is None:
+                    continue
+                if self.whole_words and position + 1 < len(text) and _is_word_char(text[position + 1]):
+                    continue
+                for intent in keywords[keyword]:
+                    hits.append((start, keyword, intent))
+        return hits
+
+    def match(self, command: str) -> Optional[IntentMatch]:
+        """
+        Route a command to the best matching intent.
+
+        :param command: Free-text command.
+        :return: IntentMatch, or None when no keyword occurs in the command.
+        """
+        hits = self.find_all(command)
+        if not hits:
+            return None
+        start, keyword, intent = max(hits, key=lambda hit: (hit[2].priority, len(hit[1]), -hit[0]))
+
+        arguments = {}
+        if intent.pattern is not None:
+            found = intent.pattern.search(command)
+            if found:
+                arguments = {key: value.strip() for key, value in found.groupdict().items() if value}
+        return IntentMatch(intent, keyword, start, arguments)
+
+    def dispatch(self, command: str, default: Optional[Callable] = None):
+        """
+        Route a command and call the winning handler.
+
+        :param default: Called with the command when no intent matches.
+        :return: The handler's return value, or None when nothing matched and no default is set.
+        """
+        match = self.match(command)
+        if match is None:
+            return default(command) if default else None
+        return match.dispatch()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _trie_to_regex(node: dict) -> str:
+    """
+    Turn a keyword trie into a regular expression that shares common prefixes, so the whole
+    keyword set is scanned by the regex engine in one pass. Optional tails are greedy, which
+    makes the longest keyword at a position win.
+    """
+    alternatives = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char != _TERMINAL
+    ]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if _TERMINAL in node:
+        body = f"(?:{body})?"
+    return body
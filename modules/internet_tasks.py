@@ -1,60 +1,117 @@
-import requests
-from datetime import datetime
-import json
 import os
+import time
 from config.apis import APIKeys  # Import the APIKeys class
+from config.settings import Config
+from modules.news_aggregator import NewsAggregator
+from modules.prefetch import PrefetchScheduler
+from modules.weather_history import WeatherHistory
+from modules.weather_service import UNIT_SYMBOLS, WeatherService, normalize_location
+from operate.utils.shared_resources import RESOURCES
 
 class InternetTasks:
     def __init__(self, config=None):
+        self.config = config or Config
         # Create an instance of APIKeys to access the keys
         api_keys = APIKeys()
         self.weather_api_key = api_keys.get_weather_api_key()  # Use the getter method
         self.news_api_key = api_keys.get_news_api_key()  # Use the getter method
+        self.session = RESOURCES.acquire("http_session")
+        self.weather = WeatherService.from_config(self.config, self.session, self.weather_api_key)
+        self.weather_history = WeatherHistory.from_config(self.config, self.session, self.weather_api_key)
+        self.news = NewsAggregator.from_config(self.config, self.session, self.news_api_key)
+        # Learns when weather and news are usually asked for and warms them shortly before
+        self.prefetch = PrefetchScheduler.from_config(self.config)
+        self.prefetch.register(
+            "weather", self.weather.get,
+            cost=lambda location: 0 if self.weather.cached(location) is not None else 1,
+        )
+        self.prefetch.register("news", self._warm_news, cost=self._news_refresh_cost)
+        if self.config.PREFETCH_ENABLED:
+            self.prefetch.start()
 
-    def get_weather(self, location):
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={self.weather_api_key}&units=metric"
-        response = requests.get(url)
-        if response.status_code == 200:
-            weather_data = response.json()
-            temperature = weather_data['main']['temp']
-            weather_description = weather_data['weather'][0]['description']
-            print(f"Weather in {location}: {temperature}°C, {weather_description}")
-        else:
-            print(f"Error fetching weather data: {response.status_code}")
+    def close(self):
+        """
+        Stop background prefetching, close the local stores and return the shared HTTP session.
+        """
+        self.prefetch.close()
+        self.news.close()
+        self.weather_history.close()
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
+
+    def fetch_weather(self, location=None):
+        """
+        Current weather at `location` (Config.DEFAULT_LOCATION if omitted) as a WeatherReport,
+        served from the weather cache while it is fresh.
+        """
+        location = location or self.config.DEFAULT_LOCATION
+        self.prefetch.record("weather", normalize_location(location))
+        return self.weather.get(location)
+
+    def get_weather(self, location=None):
+        location = location or self.config.DEFAULT_LOCATION
+        try:
+            report = self.fetch_weather(location)
+        except Exception as e:
+            print(f"Error fetching weather data: {e}")
+            return None
+        print(f"Weather in {location}: {report.temperature}{UNIT_SYMBOLS.get(report.units, '')}, {report.description}")
+        return report
+
+    def fetch_news(self, categories=None, limit=5, max_age=None):
+        """
+        The newest `limit` headlines in `categories` (Config.NEWS_CATEGORIES if omitted) as
+        NewsArticles. The local store is refreshed first only if it is older than `max_age`
+        seconds (Config.NEWS_REFRESH_SECONDS if omitted).
+        """
+        categories = [categories] if isinstance(categories, str) else list(categories or self.news.categories)
+        self.prefetch.record("news", ",".join(categories))
+        if self._news_refresh_cost(categories, max_age):
+            self.news.refresh(categories)
+        return self.news.headlines(categories, limit=limit)
+
+    def _news_refresh_cost(self, categories, max_age=None):
+        """Requests needed to bring `categories` up to date: none while the store is fresh."""
+        categories = categories.split(",") if isinstance(categories, str) else categories
+        max_age = self.config.NEWS_REFRESH_SECONDS if max_age is None else max_age
+        refreshed_at = self.news.last_refreshed(categories)
+        if refreshed_at is not None and time.time() - refreshed_at < max_age:
+            return 0
+        return len(categories)
+
+    def _warm_news(self, categories):
+        self.news.refresh(categories.split(","))
 
     def get_news(self, category="general"):
-        url = f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={self.news_api_key}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            news_data = response.json()
-            articles = news_data['articles']
-            print(f"Latest {category} news:")
-            for article in articles[:5]:
-                title = article['title']
-                description = article['description']
-                url = article['url']
-                print(f"Title: {title}")
-                print(f"Description: {description}")
-                print(f"Read more: {url}\n")
-        else:
-            print(f"Error fetching news: {response.status_code}")
+        articles = self.fetch_news(category)
+        if not articles:
+            print(f"No {category} news available.")
+            return articles
+        print(f"Latest {category} news:")
+        for article in articles:
+            print(f"Title: {article.title}")
+            print(f"Description: {article.description}")
+            print(f"Read more: {article.url}\n")
+        return articles
+
+    def fetch_historical_weather(self, location, start_date, end_date):
+        """
+        Hourly weather at `location` ({"lat": ..., "lon": ...}) for every day from `start_date`
+        to `end_date` ("YYYY-MM-DD" or dates, inclusive) as a HistoricalWeather of NumPy columns.
+        """
+        return self.weather_history.fetch(location['lat'], location['lon'], start_date, end_date)
 
     def get_historical_data(self, location, start_date, end_date):
-        # Fetch historical weather data (example)
-        url = f"http://api.openweathermap.org/data/2.5/onecall/timemachine"
-        params = {
-            "lat": location['lat'],
-            "lon": location['lon'],
-            "dt": int(datetime.timestamp(datetime.strptime(start_date, "%Y-%m-%d"))),
-            "appid": self.weather_api_key
-        }
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            historical_data = response.json()
-            print(f"Historical data for {location} from {start_date} to {end_date}:")
-            print(json.dumps(historical_data, indent=4))
-        else:
-            print(f"Error fetching historical data: {response.status_code}")
+        history = self.fetch_historical_weather(location, start_date, end_date)
+        print(f"Historical data for {location} from {start_date} to {end_date}: {len(history)} hourly observations")
+        if len(history):
+            temperatures = history["temp"]
+            print(f"Temperature: min {temperatures.min():.1f}, mean {temperatures.mean():.1f}, "
+                  f"max {temperatures.max():.1f} {UNIT_SYMBOLS.get(self.config.WEATHER_UNITS, '')}")
+        if history.missing_days:
+            print(f"Could not fetch: {', '.join(day.isoformat() for day in history.missing_days)}")
+        return history
 
 if __name__ == "__main__":
     internet_tasks = InternetTasks()
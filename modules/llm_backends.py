@@ -0,0 +1,141 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+from operate.utils.lazy_import import lazy_import
+from operate.utils.resilience import service_timeout
+from operate.utils.shared_resources import RESOURCES
+
+openai = lazy_import("openai")
+
+
+class LLMBackend(ABC):
+    """
+    Interface of a chat-completion backend used by ChatBot. Both methods raise on failure.
+    """
+
+    name = "base"
+    # Service name for timeouts and the circuit breaker (operate.utils.resilience)
+    service = "llm"
+
+    @abstractmethod
+    def complete(self, messages: List[Dict[str, str]], model: str, max_tokens: int, temperature: float) -> str:
+        """Return the full completion of the chat `messages`."""
+
+    @abstractmethod
+    def stream(self, messages: List[Dict[str, str]], model: str, max_tokens: int,
+               temperature: float) -> Iterator[str]:
+        """Yield the completion of the chat `messages` in text chunks as they are produced."""
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    OpenAI's hosted chat completions, through the `openai` client.
+    """
+
+    name = "openai"
+    service = "openai"
+
+    def __init__(self, api_key: str, timeout: float = 60):
+        if not api_key:
+            raise ValueError("API key for OpenAI is required.")
+        self.api_key = api_key
+        self.timeout = timeout
+        openai.api_key = api_key
+
+    def complete(self, messages, model, max_tokens, temperature):
+        response = openai.ChatCompletion.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=None,
+            request_timeout=self.timeout,
+        )
+        return response['choices'][0]['message']['content'].strip()
+
+    def stream(self, messages, model, max_tokens, temperature):
+        response = openai.ChatCompletion.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            request_timeout=self.timeout,
+        )
+        for event in response:
+            content = event['choices'][0].get('delta', {}).get('content')
+            if content:
+                yield content
+
+
+class HTTPChatBackend(LLMBackend):
+    """
+    Any server speaking the OpenAI chat-completions HTTP protocol, e.g. the offline stand-in
+    (services/standin_server.py) or a locally hosted model.
+    """
+
+    name = "http"
+    service = "llm_http"
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: float = 60):
+        """
+        :param base_url: URL up to and including the API version, e.g. http://127.0.0.1:8089/v1
+        """
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.timeout = timeout
+        self.session = RESOURCES.acquire("http_session")
+
+    def _post(self, payload: dict, stream: bool = False):
+        # ChatBot enforces its own requests/tokens-per-minute budget, so skip the per-host limit
+        response = self.session.post(self.url, json=payload, headers=self.headers, timeout=self.timeout,
+                                     stream=stream, rate_limit=False)
+        response.raise_for_status()
+        return response
+
+    def complete(self, messages, model, max_tokens, temperature):
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        return self._post(payload).json()['choices'][0]['message']['content'].strip()
+
+    def stream(self, messages, model, max_tokens, temperature):
+        payload = {
+            "model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature, "stream": True,
+        }
+        response = self._post(payload, stream=True)
+        try:
+            # Server-sent events: one "data: <json>" line per chunk, terminated by "data: [DONE]"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                content = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                if content:
+                    yield content
+        finally:
+            response.close()
+
+    def close(self):
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
+
+
+def create_backend(config, api_key: Optional[str] = None) -> LLMBackend:
+    """
+    Build the backend selected by `config.LLM_BACKEND` ("openai" or "http"), with its
+    service's timeout from `config.SERVICE_TIMEOUTS` / `config.TIMEOUT_SECONDS`.
+
+    :raises ValueError: For an unknown backend name.
+    """
+    name = config.LLM_BACKEND.strip().lower()
+    if name == "openai":
+        return OpenAIBackend(api_key or config.OPENAI_API_KEY,
+                             timeout=service_timeout(config, OpenAIBackend.service))
+    if name == "http":
+        logging.getLogger("LLMBackend").info(f"Using OpenAI-compatible backend at {config.LLM_BASE_URL}.")
+        return HTTPChatBackend(config.LLM_BASE_URL, api_key=api_key or config.OPENAI_API_KEY or None,
+                               timeout=service_timeout(config, HTTPChatBackend.service))
+    raise ValueError(f"Unknown LLM backend '{config.LLM_BACKEND}'. Choose 'openai' or 'http'.")
@@ -1,26 +1,34 @@
+import copy
 import os
-import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.metrics import accuracy_score, classification_report
+from operate.utils.lazy_import import lazy_import
+from operate.utils import shared_resources
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+model_selection = lazy_import("sklearn.model_selection")
+preprocessing = lazy_import("sklearn.preprocessing")
+ensemble = lazy_import("sklearn.ensemble")
+linear_model = lazy_import("sklearn.linear_model")
+tree = lazy_import("sklearn.tree")
+metrics = lazy_import("sklearn.metrics")
 
 class ModelManager:
-    def __init__(self, model_type='random_forest'):
+    def __init__(self, model_type='random_forest', model_path=None):
         self.model_type = model_type
         self.model = self._initialize_model()
+        # Key of the shared model held in RESOURCES while self.model is a loaded, read-only copy
+        self._shared_key = None
+        if model_path:
+            self.load_model(model_path)
 
     def _initialize_model(self):
         """Initialize model based on the model_type"""
         if self.model_type == 'random_forest':
-            return RandomForestClassifier(n_estimators=100, random_state=42)
+            return ensemble.RandomForestClassifier(n_estimators=100, random_state=42)
         elif self.model_type == 'logistic_regression':
-            return LogisticRegression(random_state=42)
+            return linear_model.LogisticRegression(random_state=42)
         elif self.model_type == 'decision_tree':
-            return DecisionTreeClassifier(random_state=42)
+            return tree.DecisionTreeClassifier(random_state=42)
         else:
             raise ValueError(f"Model type '{self.model_type}' not supported. Supported types: 'random_forest', 'logistic_regression', 'decision_tree'.")
 
@@ -34,30 +42,52 @@ class ModelManager:
         data = data.dropna()  # Dropping rows with missing values
         features = data.drop('target', axis=1)
         target = data['target']
-        scaler = StandardScaler()
+        scaler = preprocessing.StandardScaler()
         features_scaled = scaler.fit_transform(features)
         return features_scaled, target
 
     def train_model(self, X_train, y_train):
         """Train the model using the training data"""
+        self._own_model()
         self.model.fit(X_train, y_train)
 
     def evaluate_model(self, X_test, y_test):
         """Evaluate the model on test data"""
         predictions = self.model.predict(X_test)
-        accuracy = accuracy_score(y_test, predictions)
-        report = classification_report(y_test, predictions)
+        accuracy = metrics.accuracy_score(y_test, predictions)
+        report = metrics.classification_report(y_test, predictions)
         return accuracy, report
 
+    def predict(self, X):
+        """Predict targets for the given features with the trained model"""
+        return self.model.predict(X)
+
     def save_model(self, model_filepath):
         """Save the trained model to a file"""
         import joblib
         joblib.dump(self.model, model_filepath)
 
     def load_model(self, model_filepath):
-        """Load a trained model from a file"""
-        import joblib
-        self.model = joblib.load(model_filepath)
+        """Load a trained model from a file, shared with other managers loading the same file"""
+        model = shared_resources.load_model(model_filepath)
+        self._release_shared()
+        self.model = model
+        self._shared_key = shared_resources.model_key(model_filepath)
+
+    def _own_model(self):
+        """Swap a shared model for a private copy before mutating it, so other managers are unaffected"""
+        if self._shared_key is not None:
+            self.model = copy.deepcopy(self.model)
+            self._release_shared()
+
+    def _release_shared(self):
+        if self._shared_key is not None:
+            shared_resources.RESOURCES.release(self._shared_key)
+            self._shared_key = None
+
+    def close(self):
+        """Return a shared model loaded with load_model"""
+        self._release_shared()
 
 if __name__ == "__main__":
     ml = ModelManager(model_type='logistic_regression')  # Change model type if needed
@@ -69,7 +99,7 @@ if __name__ == "__main__":
     X, y = ml.preprocess_data(data)
     
     # Train the model
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
     ml.train_model(X_train, y_train)
     
     # Evaluate the model
@@ -0,0 +1,305 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from operate.utils.metrics import REGISTRY
+from operate.utils.resilience import for_service
+from operate.utils.singleflight import SingleFlight
+
+NEWS_ARTICLES = REGISTRY.counter(
+    "aia_news_articles_total", "Articles seen by the news aggregator, by outcome.", ("result",)
+)
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def url_key(url: str) -> str:
+    """Hash of an article URL, ignoring scheme, "www.", case of the host and any query or fragment."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return hashlib.sha256(f"{host}{parts.path.rstrip('/')}".encode("utf-8")).hexdigest()
+
+
+def title_key(title: str) -> str:
+    """
+    Hash of an article title, ignoring case and punctuation. NewsAPI appends the source as
+    " - Source", which is dropped so syndicated copies of a story match.
+    """
+    headline = title.rsplit(" - ", 1)[0] if " - " in title else title
+    return hashlib.sha256(_NON_WORD.sub(" ", headline.casefold()).strip().encode("utf-8")).hexdigest()
+
+
+@dataclass
+class NewsArticle:
+    """One headline, as stored and returned by the aggregator."""
+    title: str
+    description: Optional[str]
+    url: str
+    source: Optional[str]
+    category: str
+    published_at: str
+    fetched_at: float
+
+    @classmethod
+    def from_newsapi(cls, data: dict, category: str, fetched_at: float) -> "NewsArticle":
+        return cls(
+            title=data.get("title") or "",
+            description=data.get("description"),
+            url=data.get("url") or "",
+            source=(data.get("source") or {}).get("name"),
+            category=category,
+            published_at=data.get("publishedAt") or "",
+            fetched_at=fetched_at,
+        )
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def __str__(self):
+        return self.title
+
+
+class NewsAggregator:
+    """
+    Top headlines from NewsAPI across several categories, kept in a local SQLite store.
+
+    A refresh fetches every category concurrently, keeps only articles published after that
+    category's previous refresh, and stores each article once: one already stored or seen in
+    another category (matched by URL or by title) is only linked to the new category. Reads (`headlines`) come from the store and make
+    no request, so a refresh can run ahead of time and the answer is ready when asked for.
+    """
+
+    def __init__(self, session, api_key: Optional[str], base_url: str = "https://newsapi.org/v2",
+                 categories: Iterable[str] = ("general",), page_size: int = 50, db_path: Optional[str] = None,
+                 max_articles: int = 5000, max_workers: int = 8, clock: Callable[[], float] = time.time):
+        """
+        :param session: HTTP session used for requests (the shared HTTPClient in the app).
+        :param categories: Categories refreshed when none are given.
+        :param page_size: Articles requested per category (NewsAPI allows at most 100).
+        :param db_path: SQLite file for the store (None keeps it in memory).
+        :param max_articles: Articles kept in the store; the oldest are dropped.
+        :param max_workers: Categories fetched at once.
+        :param clock: Time source, in seconds.
+        """
+        self.session = session
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.categories = tuple(categories)
+        self.page_size = page_size
+        self.max_articles = max_articles
+        self.max_workers = max_workers
+        self.clock = clock
+        self.logger = logging.getLogger("NewsAggregator")
+        self.resilience = for_service("newsapi")
+        self.inflight = SingleFlight("news")
+        self.stats = {"refreshes": 0, "fetched": 0, "stored": 0, "duplicates": 0, "stale": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._open_db(db_path or ":memory:")
+
+    @classmethod
+    def from_config(cls, config, session, api_key: Optional[str]) -> "NewsAggregator":
+        return cls(
+            session,
+            api_key,
+            base_url=config.NEWS_API_URL,
+            categories=config.NEWS_CATEGORIES,
+            page_size=config.NEWS_PAGE_SIZE,
+            db_path=config.NEWS_DB_PATH or None,
+            max_articles=config.NEWS_MAX_ARTICLES,
+            max_workers=config.NEWS_MAX_WORKERS,
+        )
+
+    def _open_db(self, db_path: str):
+        directory = os.path.dirname(db_path) if db_path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS news_articles ("
+            "url_key TEXT PRIMARY KEY, title_key TEXT NOT NULL, title TEXT NOT NULL, description TEXT, "
+            "url TEXT NOT NULL, source TEXT, category TEXT NOT NULL, published_at TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS news_articles_title_key ON news_articles (title_key)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS news_articles_published_at ON news_articles (published_at)"
+        )
+        # Every category an article appeared in; news_articles.category is only the first
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS news_article_categories ("
+            "url_key TEXT NOT NULL, category TEXT NOT NULL, PRIMARY KEY (category, url_key))"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO news_article_categories (url_key, category) "
+            "SELECT url_key, category FROM news_articles"
+        )
+        # Per category: when it was last refreshed, and the newest article seen so far
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS news_refreshes ("
+            "category TEXT PRIMARY KEY, refreshed_at REAL NOT NULL, newest_published_at TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def refresh(self, categories: Optional[Iterable[str]] = None) -> Dict[str, List[NewsArticle]]:
+        """
+        Fetch `categories` (the configured ones if omitted) concurrently and store what is new.
+        A refresh of the same categories already in progress is joined instead of repeated.
+
+        :return: {category: articles added by this refresh, newest first}. A category whose
+                 request failed maps to an empty list and keeps its previous watermark.
+        """
+        categories = tuple(dict.fromkeys(categories or self.categories))
+        return self.inflight.do(categories, self._refresh, categories)
+
+    def _refresh(self, categories) -> Dict[str, List[NewsArticle]]:
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(categories))),
+                                thread_name_prefix="NewsAggregator") as pool:
+            responses = dict(zip(categories, pool.map(self._fetch_category, categories)))
+
+        fetched_at = self.clock()
+        added = {category: [] for category in categories}
+        with self._lock:
+            self.stats["refreshes"] += 1
+            # Keys of the articles stored by this refresh -> the url_key they were stored under
+            seen_urls, seen_titles = {}, {}
+            for category, articles in responses.items():
+                if articles is None:
+                    continue
+                watermark = self._watermark(category)
+                newest = watermark
+                for data in articles:
+                    article = NewsArticle.from_newsapi(data, category, fetched_at)
+                    if not article.url or not article.title or article.title == "[Removed]":
+                        continue
+                    self.stats["fetched"] += 1
+                    newest = max(newest, article.published_at)
+                    if article.published_at <= watermark:
+                        self._count("stale", "stale")
+                        continue
+                    keys = (url_key(article.url), title_key(article.title))
+                    stored_key = seen_urls.get(keys[0]) or seen_titles.get(keys[1]) or self._stored(*keys)
+                    if stored_key is not None:
+                        self._link(stored_key, category)
+                        self._count("duplicate", "duplicates")
+                        continue
+                    seen_urls[keys[0]] = seen_titles[keys[1]] = keys[0]
+                    self._insert(keys, article)
+                    self._count("stored", "stored")
+                    added[category].append(article)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO news_refreshes (category, refreshed_at, newest_published_at) "
+                    "VALUES (?, ?, ?)",
+                    (category, fetched_at, newest),
+                )
+            self._prune()
+            self._db.commit()
+        for articles in added.values():
+            articles.sort(key=lambda article: article.published_at, reverse=True)
+        return added
+
+    def _fetch_category(self, category: str) -> Optional[List[dict]]:
+        def attempt():
+            response = self.session.get(
+                f"{self.base_url}/top-headlines",
+                params={"category": category, "pageSize": self.page_size, "apiKey": self.api_key},
+                timeout=self.resilience.timeout,
+            )
+            response.raise_for_status()
+            return response.json().get("articles") or []
+
+        try:
+            return self.resilience.call(attempt)
+        except Exception as e:
+            with self._lock:
+                self.stats["failed"] += 1
+            self.logger.warning(f"Fetching '{category}' news failed: {e}")
+            return None
+
+    def _count(self, result: str, key: str):
+        self.stats[key] += 1
+        NEWS_ARTICLES.inc(result=result)
+
+    def _watermark(self, category: str) -> str:
+        row = self._db.execute(
+            "SELECT newest_published_at FROM news_refreshes WHERE category = ?", (category,)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def _stored(self, url_hash: str, title_hash: str) -> Optional[str]:
+        """The url_key of the stored article matching either key, or None."""
+        row = self._db.execute(
+            "SELECT url_key FROM news_articles WHERE url_key = ? OR title_key = ? LIMIT 1", (url_hash, title_hash)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _link(self, url_hash: str, category: str):
+        self._db.execute(
+            "INSERT OR IGNORE INTO news_article_categories (url_key, category) VALUES (?, ?)", (url_hash, category)
+        )
+
+    def _insert(self, keys, article: NewsArticle):
+        self._db.execute(
+            "INSERT OR REPLACE INTO news_articles "
+            "(url_key, title_key, title, description, url, source, category, published_at, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*keys, article.title, article.description, article.url, article.source, article.category,
+             article.published_at, article.fetched_at),
+        )
+        self._link(keys[0], article.category)
+
+    def _prune(self):
+        self._db.execute(
+            "DELETE FROM news_articles WHERE url_key IN ("
+            "SELECT url_key FROM news_articles ORDER BY published_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_articles,),
+        )
+        self._db.execute(
+            "DELETE FROM news_article_categories WHERE url_key NOT IN (SELECT url_key FROM news_articles)"
+        )
+
+    def last_refreshed(self, categories: Optional[Iterable[str]] = None) -> Optional[float]:
+        """When the least recently refreshed of `categories` was refreshed, or None if one never was."""
+        categories = tuple(dict.fromkeys(categories or self.categories))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT refreshed_at FROM news_refreshes WHERE category IN ({','.join('?' * len(categories))})",
+                categories,
+            ).fetchall()
+        if len(rows) < len(categories):
+            return None
+        return min(row[0] for row in rows)
+
+    def headlines(self, categories: Optional[Iterable[str]] = None, limit: int = 5) -> List[NewsArticle]:
+        """
+        The newest stored articles that appeared in any of `categories` (all stored articles if
+        omitted); no request is made.
+        """
+        query = "SELECT title, description, url, source, category, published_at, fetched_at FROM news_articles"
+        params = ()
+        if categories:
+            categories = tuple(dict.fromkeys(categories))
+            query += (" WHERE url_key IN (SELECT url_key FROM news_article_categories "
+                      f"WHERE category IN ({','.join('?' * len(categories))}))")
+            params = categories
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY published_at DESC LIMIT ?", (*params, limit)).fetchall()
+        return [NewsArticle(*row) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM news_articles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
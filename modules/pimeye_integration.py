@@ -1,7 +1,7 @@
-import requests
 import json
 import logging
 from typing import List, Dict
+from operate.utils.shared_resources import RESOURCES
 
 class PimEyeIntegration:
     """
@@ -22,6 +22,15 @@ class PimEyeIntegration:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        self.session = RESOURCES.acquire("http_session")
+
+    def close(self):
+        """
+        Return the shared HTTP session.
+        """
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
 
     def upload_image(self, image_path: str) -> Dict:
         """
@@ -34,7 +43,7 @@ class PimEyeIntegration:
         try:
             with open(image_path, 'rb') as image_file:
                 files = {"image": image_file}
-                response = requests.post(url, headers=self.headers, files=files)
+                response = self.session.post(url, headers=self.headers, files=files)
                 response.raise_for_status()
                 return response.json()
         except Exception as e:
@@ -50,7 +59,7 @@ class PimEyeIntegration:
         """
         url = f"{self.base_url}/search/{image_id}"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("results", [])
         except Exception as e:
@@ -0,0 +1,237 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from operate.utils.metrics import REGISTRY
+from operate.utils.rate_limit import TokenBucket
+
+PREFETCHES = REGISTRY.counter(
+    "aia_prefetch_total", "Background cache warm-ups by outcome.", ("kind", "result")
+)
+
+
+class CommandLog:
+    """
+    Timestamped log of the queries the user made (e.g. ("weather", "london")), kept in SQLite
+    so usage patterns survive restarts. Entries older than `retention_days` are dropped.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, retention_days: float = 28,
+                 clock: Callable[[], float] = time.time):
+        """
+        :param db_path: SQLite file for the log (None keeps it in memory).
+        :param retention_days: Age after which entries are dropped.
+        """
+        self.retention_days = retention_days
+        self.clock = clock
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path) if db_path else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS command_log (kind TEXT NOT NULL, argument TEXT NOT NULL, "
+                         "at REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS command_log_at ON command_log (at)")
+        self._db.commit()
+
+    def record(self, kind: str, argument: str = "", at: Optional[float] = None):
+        at = self.clock() if at is None else at
+        with self._lock:
+            self._db.execute("INSERT INTO command_log (kind, argument, at) VALUES (?, ?, ?)", (kind, argument, at))
+            self._db.execute("DELETE FROM command_log WHERE at < ?", (at - self.retention_days * 86400,))
+            self._db.commit()
+
+    def entries(self, since: float = 0) -> List[Tuple[str, str, float]]:
+        """(kind, argument, timestamp) of every query since `since`, oldest first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT kind, argument, at FROM command_log WHERE at >= ? ORDER BY at", (since,)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """A query expected around the same time of day: in slot `slot` (local time) on most recent days."""
+    kind: str
+    argument: str
+    slot: int
+    days_seen: int
+
+
+class PrefetchScheduler:
+    """
+    Warms caches ahead of queries the user makes at predictable times.
+
+    The day is split into `slot_minutes` slots of local time. A (kind, argument) query that
+    was made in the same slot on at least `min_days` distinct days of the last `window_days`
+    is predicted to recur there, and is warmed once per day, `lead_seconds` before its slot
+    starts (or as soon as the scheduler notices, while the slot is still open).
+
+    Warm-ups are background requests the user did not ask for, so they draw from a budget
+    of `max_requests_per_hour`; a warm-up that does not fit is skipped, not queued.
+    """
+
+    def __init__(self, command_log: CommandLog, max_requests_per_hour: float = 20, lead_seconds: float = 300,
+                 slot_minutes: int = 30, min_days: int = 3, window_days: int = 14, interval: float = 60,
+                 clock: Callable[[], float] = time.time, localtime: Callable[[float], time.struct_time] = time.localtime):
+        """
+        :param command_log: Where user queries are recorded and learned from.
+        :param max_requests_per_hour: Background request budget (also the largest burst).
+        :param lead_seconds: How long before a predicted slot its warm-up runs.
+        :param slot_minutes: Granularity of the time of day a query is predicted at.
+        :param min_days: Distinct days a query must have recurred in a slot to be predicted.
+        :param window_days: How far back usage is considered.
+        :param interval: Seconds between checks for due warm-ups.
+        """
+        self.command_log = command_log
+        self.lead_seconds = lead_seconds
+        self.slot_minutes = slot_minutes
+        self.min_days = min_days
+        self.window_days = window_days
+        self.interval = interval
+        self.clock = clock
+        self.localtime = localtime
+        self.budget = TokenBucket(max_requests_per_hour / 3600.0, capacity=max_requests_per_hour, clock=clock)
+        self.logger = logging.getLogger("PrefetchScheduler")
+        self.stats = {"warmed": 0, "over_budget": 0, "failed": 0}
+        self._warmers: Dict[str, Tuple[Callable[[str], object], Callable[[str], float]]] = {}
+        self._warmed = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config) -> "PrefetchScheduler":
+        return cls(
+            CommandLog(config.PREFETCH_LOG_PATH or None, retention_days=config.PREFETCH_WINDOW_DAYS * 2),
+            max_requests_per_hour=config.PREFETCH_MAX_REQUESTS_PER_HOUR,
+            lead_seconds=config.PREFETCH_LEAD_SECONDS,
+            slot_minutes=config.PREFETCH_SLOT_MINUTES,
+            min_days=config.PREFETCH_MIN_DAYS,
+            window_days=config.PREFETCH_WINDOW_DAYS,
+        )
+
+    def register(self, kind: str, warm: Callable[[str], object], cost: Optional[Callable[[str], float]] = None):
+        """
+        Warm queries of `kind` with `warm(argument)`.
+
+        :param cost: Requests a warm-up of `argument` would make right now (1 if omitted);
+                     0 for an entry that is still fresh, so it is not charged to the budget.
+        """
+        with self._lock:
+            self._warmers[kind] = (warm, cost or (lambda argument: 1))
+
+    def record(self, kind: str, argument: str = ""):
+        """Log a query the user made."""
+        self.command_log.record(kind, argument)
+
+    def _day_start(self, now: float) -> float:
+        local = self.localtime(now)
+        return now - (local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec)
+
+    def predictions(self, now: Optional[float] = None) -> List[Prediction]:
+        """The recurring queries learned from the log, most regular first."""
+        now = self.clock() if now is None else now
+        days = defaultdict(set)
+        for kind, argument, at in self.command_log.entries(since=now - self.window_days * 86400):
+            local = self.localtime(at)
+            slot = (local.tm_hour * 60 + local.tm_min) // self.slot_minutes
+            days[(kind, argument, slot)].add((local.tm_year, local.tm_yday))
+        predictions = [Prediction(kind, argument, slot, len(seen))
+                       for (kind, argument, slot), seen in days.items() if len(seen) >= self.min_days]
+        return sorted(predictions, key=lambda prediction: (-prediction.days_seen, prediction.slot))
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[Prediction, float]]:
+        """
+        Predictions whose warm-up window is open at `now` and that were not warmed for this
+        occurrence yet, with the start time of the slot they are due for.
+        """
+        now = self.clock() if now is None else now
+        slot_seconds = self.slot_minutes * 60
+        today = self._day_start(now)
+        due = []
+        with self._lock:
+            kinds = set(self._warmers)
+        for prediction in self.predictions(now):
+            if prediction.kind not in kinds:
+                continue
+            # Tomorrow's occurrence matters for slots just after midnight
+            for day_start in (today, today + 86400):
+                slot_start = day_start + prediction.slot * slot_seconds
+                if slot_start - self.lead_seconds <= now < slot_start + slot_seconds:
+                    key = (prediction.kind, prediction.argument, round(slot_start))
+                    with self._lock:
+                        if key not in self._warmed:
+                            due.append((prediction, slot_start))
+        return due
+
+    def run_once(self, now: Optional[float] = None) -> List[Prediction]:
+        """
+        Warm every due prediction the budget allows.
+
+        :return: The predictions warmed.
+        """
+        now = self.clock() if now is None else now
+        warmed = []
+        for prediction, slot_start in self.due(now):
+            with self._lock:
+                warm, cost = self._warmers[prediction.kind]
+            try:
+                requests_needed = cost(prediction.argument)
+                if requests_needed and not self.budget.acquire(requests_needed, blocking=False):
+                    self.stats["over_budget"] += 1
+                    PREFETCHES.inc(kind=prediction.kind, result="over_budget")
+                    continue
+                if requests_needed:
+                    warm(prediction.argument)
+            except Exception as e:
+                self.stats["failed"] += 1
+                PREFETCHES.inc(kind=prediction.kind, result="failed")
+                self.logger.warning(f"Prefetching {prediction.kind} '{prediction.argument}' failed: {e}")
+                continue
+            with self._lock:
+                self._warmed.add((prediction.kind, prediction.argument, round(slot_start)))
+                # Forget occurrences whose slot is long over
+                self._warmed = {key for key in self._warmed if key[2] > now - 86400}
+            self.stats["warmed"] += 1
+            PREFETCHES.inc(kind=prediction.kind, result="warmed")
+            self.logger.debug(f"Prefetched {prediction.kind} '{prediction.argument}' for slot {prediction.slot}.")
+            warmed.append(prediction)
+        return warmed
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                self.logger.error("Prefetch pass failed.", exc_info=True)
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Check for due warm-ups every `interval` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PrefetchScheduler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Prefetch scheduler started (every {self.interval}s).")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.command_log.close()
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from operate.utils.metrics import REGISTRY
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "aia_chat_cache_lookups_total", "Chat response cache lookups by outcome.", ("result",)
+)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for chat completions.
+
+    Entries live in an in-memory LRU (bounded by `max_entries`) and, if `db_path` is set,
+    in a SQLite table (bounded by `max_db_entries`) that survives restarts. Both tiers expire
+    entries `ttl_seconds` after they were stored. A disk hit is promoted back into memory.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, db_path: Optional[str] = None,
+                 max_db_entries: int = 10000, clock: Callable[[], float] = time.time):
+        """
+        :param max_entries: Entries kept in memory.
+        :param ttl_seconds: Lifetime of an entry (0 disables expiry).
+        :param db_path: SQLite file for the persistent tier (None keeps the cache in memory only).
+        :param max_db_entries: Entries kept on disk; the least recently used are evicted.
+        :param clock: Time source, in seconds.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_db_entries = max_db_entries
+        self.clock = clock
+        self.logger = logging.getLogger("ResponseCache")
+        self.stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "evictions": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_config(cls, config) -> "ResponseCache":
+        return cls(
+            max_entries=config.CHAT_CACHE_SIZE,
+            ttl_seconds=config.CHAT_CACHE_TTL_SECONDS,
+            db_path=config.CHAT_CACHE_DB_PATH or None,
+            max_db_entries=config.CHAT_CACHE_DB_MAX_ENTRIES,
+        )
+
+    def _open_db(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """
+        Case- and whitespace-insensitive form of a prompt, so trivially different
+        phrasings of the same question share an entry.
+        """
+        return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+    @classmethod
+    def make_key(cls, prompt: str, model: str, temperature: float, max_tokens: int, **extra) -> str:
+        """
+        Cache key for a completion request. `extra` holds anything else the response depends on.
+        """
+        material = {
+            "prompt": cls.normalize_prompt(prompt),
+            "model": model,
+            "temperature": round(float(temperature), 3),
+            "max_tokens": max_tokens,
+            **extra,
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and self.clock() - created_at > self.ttl_seconds
+
+    def _count(self, result: str, *keys: str):
+        for key in keys:
+            self.stats[key] += 1
+        CACHE_LOOKUPS.inc(result=result)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cached response for `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at):
+                    self._entries.move_to_end(key)
+                    self._count("memory_hit", "hits", "memory_hits")
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at):
+                        self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (self.clock(), key))
+                        self._db.commit()
+                        self._store_memory(key, value, created_at)
+                        self._count("disk_hit", "hits", "disk_hits")
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._count("miss", "misses")
+            return None
+
+    def record_bypass(self):
+        """Count a request that deliberately skipped the cache."""
+        with self._lock:
+            self._count("bypass", "bypassed")
+
+    def _store_memory(self, key: str, value: str, created_at: float):
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def set(self, key: str, value: str):
+        now = self.clock()
+        with self._lock:
+            self._store_memory(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                # Keep the table bounded: drop the least recently used rows beyond the limit
+                cursor = self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_entries,),
+                )
+                self.stats["evictions"] += max(cursor.rowcount, 0)
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,7 +1,7 @@
 import os
-import requests
 import json
 from config.settings import Config  # Ensure you import the Config class
+from operate.utils.shared_resources import RESOURCES
 
 class SocialMediaManager:
     def __init__(self, config):
@@ -11,6 +11,15 @@ class SocialMediaManager:
         # Access Twitter and Facebook API keys using methods from Config
         self.twitter_api_key = self.config.get_api_key("TWITTER_API_KEY")
         self.facebook_api_key = self.config.get_api_key("FACEBOOK_API_KEY")
+        self.session = RESOURCES.acquire("http_session")
+
+    def close(self):
+        """
+        Return the shared HTTP session.
+        """
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
 
     def post_to_twitter(self, message):
         url = "https://api.twitter.com/2/tweets"
@@ -21,7 +30,7 @@ class SocialMediaManager:
         payload = {
             "text": message
         }
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         if response.status_code == 201:
             print("Successfully posted to Twitter!")
         else:
@@ -36,7 +45,7 @@ class SocialMediaManager:
         payload = {
             "message": message
         }
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         if response.status_code == 200:
             print("Successfully posted to Facebook!")
         else:
@@ -48,7 +57,7 @@ class SocialMediaManager:
             headers = {
                 "Authorization": f"Bearer {self.twitter_api_key}"
             }
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             if response.status_code == 200:
                 print("Latest posts from Twitter:", response.json())
             else:
@@ -58,7 +67,7 @@ class SocialMediaManager:
             headers = {
                 "Authorization": f"Bearer {self.facebook_api_key}"
             }
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             if response.status_code == 200:
                 print("Latest posts from Facebook:", response.json())
             else:
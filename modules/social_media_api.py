@@ -1,7 +1,7 @@
 import os
-import requests
 import json
 from dotenv import load_dotenv
+from operate.utils.shared_resources import RESOURCES
 
 load_dotenv()
 
@@ -12,6 +12,15 @@ class SocialMediaAPI:
         self.facebook_access_token = os.getenv("FACEBOOK_ACCESS_TOKEN")
         self.instagram_access_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.linkedin_access_token = os.getenv("LINKEDIN_ACCESS_TOKEN")
+        self.session = RESOURCES.acquire("http_session")
+
+    def close(self):
+        """
+        Return the shared HTTP session.
+        """
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
 
     # Twitter API methods
     def post_to_twitter(self, message):
@@ -23,7 +32,7 @@ class SocialMediaAPI:
         payload = {
             "status": message
         }
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         if response.status_code == 201:
             print("Successfully posted to Twitter!")
         else:
@@ -34,7 +43,7 @@ class SocialMediaAPI:
         headers = {
             "Authorization": f"Bearer {self.twitter_access_token}"
         }
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         if response.status_code == 200:
             tweets = response.json()
             for tweet in tweets['data']:
@@ -52,7 +61,7 @@ class SocialMediaAPI:
         payload = {
             "message": message
         }
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         if response.status_code == 200:
             print("Successfully posted to Facebook!")
         else:
@@ -63,7 +72,7 @@ class SocialMediaAPI:
         headers = {
             "Authorization": f"Bearer {self.facebook_access_token}"
         }
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         if response.status_code == 200:
             posts = response.json()
             for post in posts['data']:
@@ -78,7 +87,7 @@ class SocialMediaAPI:
             "image_url": image_url,
             "caption": caption
         }
-        response = requests.post(url, data=payload)
+        response = self.session.post(url, data=payload)
         if response.status_code == 200:
             print("Successfully posted to Instagram!")
         else:
@@ -86,7 +95,7 @@ class SocialMediaAPI:
 
     def get_instagram_posts(self):
         url = f"https://graph.instagram.com/v12.0/{self.instagram_access_token}/media"
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code == 200:
             posts = response.json()
             for post in posts['data']:
@@ -116,7 +125,7 @@ class SocialMediaAPI:
                 "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
             }
         }
-        response = requests.post(url, headers=headers, json=payload)
+        response = self.session.post(url, headers=headers, json=payload)
         if response.status_code == 201:
             print("Successfully posted to LinkedIn!")
         else:
@@ -127,7 +136,7 @@ class SocialMediaAPI:
         headers = {
             "Authorization": f"Bearer {self.linkedin_access_token}"
         }
-        response = requests.get(url, headers=headers)
+        response = self.session.get(url, headers=headers)
         if response.status_code == 200:
             posts = response.json()
             for post in posts['elements']:
@@ -1,31 +1,63 @@
 import os
+import threading
 import time
-import pyttsx3
-import speech_recognition as sr
+from operate.utils.lazy_import import lazy_import
 from modules.error_handling import ErrorLogger
 from modules.internet_tasks import InternetTasks
+from modules.intent_router import IntentRouter
+from operate.utils.shared_resources import RESOURCES
+
+sr = lazy_import("speech_recognition")
+
+# The TTS engine is one process-wide handle and pyttsx3 is not thread-safe: with the command
+# pipeline, the listener thread (error prompts) and the worker threads (replies) both speak
+_SPEECH_LOCK = threading.Lock()
 
 class VoiceAssistant:
     """
     Voice Assistant for interaction with the user via voice commands.
     """
-    def __init__(self, config):
+    def __init__(self, config, internet_tasks=None):
+        """
+        :param internet_tasks: InternetTasks instance to reuse (a new one is created if omitted,
+                               and closed with the assistant).
+        """
         self.config = config
-        self.speech_engine = pyttsx3.init()
+        # The TTS engine and microphone are process-wide handles shared by every assistant
+        self.speech_engine = RESOURCES.acquire("tts_engine")
         self.speech_engine.setProperty("rate", 150)
         self.speech_engine.setProperty("volume", 0.9)
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = RESOURCES.acquire("microphone")
         self.error_logger = ErrorLogger()
-        self.internet_tasks = InternetTasks()
+        self._owns_internet_tasks = internet_tasks is None
+        self.internet_tasks = internet_tasks or InternetTasks()
+        self.intent_router = IntentRouter()
+        self.intent_router.register("weather", ["weather", "forecast"], self.handle_weather_request)
+        self.intent_router.register("news", ["news", "headlines"], self.handle_news_request)
+        self.intent_router.register("time", ["time"], self.tell_time)
+
+    def close(self):
+        """
+        Return the shared TTS engine and microphone, and close the InternetTasks the
+        assistant created itself.
+        """
+        if self.speech_engine is not None:
+            RESOURCES.release("tts_engine")
+            RESOURCES.release("microphone")
+            self.speech_engine = self.microphone = None
+        if self._owns_internet_tasks:
+            self.internet_tasks.close()
+            self._owns_internet_tasks = False
 
     def speak(self, text):
         """
-        Converts text to speech.
+        Converts text to speech. Utterances from different threads are spoken one at a time.
         """
         try:
-            self.speech_engine.say(text)
-            self.speech_engine.runAndWait()
+            with _SPEECH_LOCK:
+                self.speech_engine.say(text)
+                self.speech_engine.runAndWait()
         except Exception as e:
             self.error_logger.log_error("[VoiceAssistant][speak]", str(e))
 
@@ -52,15 +84,10 @@ class VoiceAssistant:
         """
         Processes the voice command and executes corresponding actions.
         """
-        command = command.lower()
-        if "weather" in command:
-            self.handle_weather_request()
-        elif "news" in command:
-            self.handle_news_request()
-        elif "time" in command:
-            self.tell_time()
-        else:
-            self.speak("Sorry, I didn't understand that command.")
+        self.intent_router.dispatch(command, default=self._handle_unknown_command)
+
+    def _handle_unknown_command(self, command):
+        self.speak("Sorry, I didn't understand that command.")
 
     def handle_weather_request(self):
         """
@@ -78,10 +105,10 @@ class VoiceAssistant:
         Fetches and speaks news headlines.
         """
         try:
-            news_headlines = self.internet_tasks.fetch_news()
+            articles = self.internet_tasks.fetch_news(limit=5)
             self.speak("Here are the top news headlines:")
-            for headline in news_headlines[:5]:
-                self.speak(headline)
+            for article in articles:
+                self.speak(article.title)
         except Exception as e:
             self.error_logger.log_error("[VoiceAssistant][handle_news_request]", str(e))
             self.speak("I couldn't fetch the news headlines.")
@@ -0,0 +1,217 @@
+import calendar
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Union
+from operate.utils.lazy_import import lazy_import
+from operate.utils.metrics import REGISTRY
+from operate.utils.resilience import for_service
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+WEATHER_HISTORY_DAYS = REGISTRY.counter(
+    "aia_weather_history_days_total", "Days of historical weather requested, by source.", ("source",)
+)
+
+# Hourly observations are kept as rows of these columns; absent values are NaN
+COLUMNS = ("dt", "temp", "feels_like", "humidity", "pressure", "wind_speed", "clouds")
+
+DateLike = Union[str, date]
+
+
+def parse_day(value: DateLike) -> date:
+    """A date from a date/datetime or a "YYYY-MM-DD" string."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@dataclass
+class HistoricalWeather:
+    """
+    Hourly observations at one point over a range of days, stored column-wise as NumPy
+    arrays (`dt` in Unix seconds, the rest as float64). Days that could not be fetched are
+    listed in `missing_days` and contribute no rows.
+    """
+    lat: float
+    lon: float
+    start: date
+    end: date
+    columns: Dict[str, "np.ndarray"]
+    missing_days: List[date] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.columns["dt"])
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        return self.columns[column]
+
+    def to_frame(self) -> "pd.DataFrame":
+        """The observations as a DataFrame indexed by UTC timestamp."""
+        frame = pd.DataFrame({name: values for name, values in self.columns.items() if name != "dt"})
+        frame.index = pd.to_datetime(self.columns["dt"], unit="s", utc=True)
+        frame.index.name = "time"
+        return frame
+
+
+class WeatherHistory:
+    """
+    Historical hourly weather from OpenWeatherMap's time machine endpoint over a date range.
+
+    The endpoint answers one day per request, so a range is fetched as one request per day,
+    run concurrently. Past days never change, so each fetched day is kept in a SQLite cache
+    keyed by (lat, lon, day, units) and a repeated query only requests the days it lacks.
+    Days are stored as packed float64 rows, which load straight back into arrays.
+    """
+
+    def __init__(self, session, api_key: Optional[str], base_url: str = "https://api.openweathermap.org/data/2.5",
+                 units: str = "metric", db_path: Optional[str] = None, max_workers: int = 8,
+                 clock: Callable[[], float] = time.time):
+        """
+        :param session: HTTP session used for requests (the shared HTTPClient in the app).
+        :param units: "metric", "imperial" or "standard".
+        :param db_path: SQLite file for the per-day cache (None keeps it in memory).
+        :param max_workers: Days requested at once.
+        :param clock: Time source, in seconds; days from the current UTC day on are not cached.
+        """
+        self.session = session
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.units = units
+        self.max_workers = max_workers
+        self.clock = clock
+        self.logger = logging.getLogger("WeatherHistory")
+        self.resilience = for_service("openweathermap")
+        self.stats = {"cached_days": 0, "fetched_days": 0, "failed_days": 0}
+        self._lock = threading.Lock()
+        self._open_db(db_path or ":memory:")
+
+    @classmethod
+    def from_config(cls, config, session, api_key: Optional[str]) -> "WeatherHistory":
+        return cls(
+            session,
+            api_key,
+            base_url=config.WEATHER_API_URL,
+            units=config.WEATHER_UNITS,
+            db_path=config.WEATHER_HISTORY_DB_PATH or None,
+            max_workers=config.WEATHER_HISTORY_MAX_WORKERS,
+        )
+
+    def _open_db(self, db_path: str):
+        directory = os.path.dirname(db_path) if db_path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS weather_history ("
+            "lat TEXT NOT NULL, lon TEXT NOT NULL, day TEXT NOT NULL, units TEXT NOT NULL, "
+            "hours INTEGER NOT NULL, rows BLOB NOT NULL, PRIMARY KEY (lat, lon, day, units))"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _coordinates(lat: float, lon: float):
+        # About 11 m of precision: nearby lookups of the same place share cache entries
+        return f"{lat:.4f}", f"{lon:.4f}"
+
+    def fetch(self, lat: float, lon: float, start: DateLike, end: DateLike) -> HistoricalWeather:
+        """
+        Hourly weather at (lat, lon) for every day from `start` to `end`, inclusive.
+
+        :raises ValueError: If `end` is before `start`.
+        """
+        start, end = parse_day(start), parse_day(end)
+        if end < start:
+            raise ValueError(f"End date {end} is before start date {start}.")
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        blocks = self._load(lat, lon, start, end)
+        missing = [day for day in days if day not in blocks]
+        WEATHER_HISTORY_DAYS.inc(len(days) - len(missing), source="cache")
+        WEATHER_HISTORY_DAYS.inc(len(missing), source="api")
+
+        failed = []
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing))),
+                                    thread_name_prefix="WeatherHistory") as pool:
+                fetched = list(pool.map(lambda day: self._fetch_day(lat, lon, day), missing))
+            today = datetime.fromtimestamp(self.clock(), timezone.utc).date()
+            for day, rows in zip(missing, fetched):
+                if rows is None:
+                    failed.append(day)
+                    continue
+                blocks[day] = rows
+                if day < today:
+                    self._store(lat, lon, day, rows)
+        with self._lock:
+            self.stats["cached_days"] += len(days) - len(missing)
+            self.stats["fetched_days"] += len(missing) - len(failed)
+            self.stats["failed_days"] += len(failed)
+
+        present = [blocks[day] for day in days if day in blocks]
+        matrix = np.concatenate(present) if present else np.empty((0, len(COLUMNS)))
+        columns = {name: matrix[:, index] for index, name in enumerate(COLUMNS)}
+        columns["dt"] = columns["dt"].astype(np.int64)
+        return HistoricalWeather(lat, lon, start, end, columns, failed)
+
+    def _fetch_day(self, lat: float, lon: float, day: date) -> Optional["np.ndarray"]:
+        day_start = calendar.timegm(day.timetuple())
+
+        def attempt():
+            response = self.session.get(
+                f"{self.base_url}/onecall/timemachine",
+                params={"lat": lat, "lon": lon, "dt": day_start, "appid": self.api_key, "units": self.units},
+                timeout=self.resilience.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            payload = self.resilience.call(attempt)
+        except Exception as e:
+            self.logger.warning(f"Fetching weather history for {day} at ({lat}, {lon}) failed: {e}")
+            return None
+        hours = [
+            hour for hour in payload.get("hourly") or payload.get("data") or []
+            if day_start <= hour.get("dt", -1) < day_start + 86400
+        ]
+        rows = np.full((len(hours), len(COLUMNS)), np.nan)
+        for row, hour in zip(rows, hours):
+            for index, name in enumerate(COLUMNS):
+                value = hour.get(name)
+                if isinstance(value, (int, float)):
+                    row[index] = value
+        return rows
+
+    def _load(self, lat: float, lon: float, start: date, end: date) -> Dict[date, "np.ndarray"]:
+        with self._lock:
+            records = self._db.execute(
+                "SELECT day, rows FROM weather_history WHERE lat = ? AND lon = ? AND units = ? AND day BETWEEN ? AND ?",
+                (*self._coordinates(lat, lon), self.units, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return {
+            date.fromisoformat(day): np.frombuffer(rows, dtype="<f8").reshape(-1, len(COLUMNS))
+            for day, rows in records
+        }
+
+    def _store(self, lat: float, lon: float, day: date, rows: "np.ndarray"):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO weather_history (lat, lon, day, units, hours, rows) VALUES (?, ?, ?, ?, ?, ?)",
+                (*self._coordinates(lat, lon), day.isoformat(), self.units, len(rows),
+                 np.ascontiguousarray(rows, dtype="<f8").tobytes()),
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,185 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+from operate.utils.metrics import REGISTRY
+from operate.utils.resilience import for_service
+from operate.utils.singleflight import SingleFlight
+
+WEATHER_LOOKUPS = REGISTRY.counter(
+    "aia_weather_lookups_total", "Weather lookups by outcome.", ("result",)
+)
+
+UNIT_SYMBOLS = {"metric": "°C", "imperial": "°F", "standard": "K"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_location(location: str) -> str:
+    """
+    Cache key for a location as users type it: case, surrounding and repeated whitespace,
+    and spaces around commas are ignored, so "New  York, US" and "new york,us" match.
+    """
+    parts = (_WHITESPACE.sub(" ", part).strip() for part in location.casefold().split(","))
+    return ",".join(part for part in parts if part)
+
+
+@dataclass
+class WeatherReport:
+    """Current conditions at one location."""
+    location: str
+    country: Optional[str]
+    temperature: float
+    feels_like: Optional[float]
+    humidity: Optional[int]
+    description: str
+    wind_speed: Optional[float]
+    units: str
+    observed_at: Optional[int]
+    fetched_at: float
+
+    @classmethod
+    def from_openweathermap(cls, data: dict, units: str, fetched_at: float) -> "WeatherReport":
+        main = data.get("main", {})
+        conditions = data.get("weather") or [{}]
+        return cls(
+            location=data.get("name", ""),
+            country=data.get("sys", {}).get("country"),
+            temperature=main["temp"],
+            feels_like=main.get("feels_like"),
+            humidity=main.get("humidity"),
+            description=conditions[0].get("description", ""),
+            wind_speed=data.get("wind", {}).get("speed"),
+            units=units,
+            observed_at=data.get("dt"),
+            fetched_at=fetched_at,
+        )
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def __str__(self):
+        return f"{self.temperature:g}{UNIT_SYMBOLS.get(self.units, '')}, {self.description} in {self.location}"
+
+
+class WeatherService:
+    """
+    Current weather from OpenWeatherMap, cached per location.
+
+    Conditions change on a scale of minutes, so a report is reused for `ttl_seconds` before
+    the location is fetched again. Concurrent lookups of the same location share one request.
+    Failed lookups are not cached.
+    """
+
+    def __init__(self, session, api_key: Optional[str], base_url: str = "https://api.openweathermap.org/data/2.5",
+                 units: str = "metric", ttl_seconds: float = 600, max_entries: int = 256,
+                 clock: Callable[[], float] = time.time):
+        """
+        :param session: HTTP session used for requests (the shared HTTPClient in the app).
+        :param base_url: OpenWeatherMap API root; point it at services.standin_server to benchmark.
+        :param units: "metric", "imperial" or "standard".
+        :param ttl_seconds: Lifetime of a cached report (0 disables caching).
+        :param max_entries: Locations kept; the least recently used are evicted.
+        :param clock: Time source, in seconds.
+        """
+        self.session = session
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.units = units
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.logger = logging.getLogger("WeatherService")
+        self.resilience = for_service("openweathermap")
+        self.stats = {"hits": 0, "misses": 0, "fetches": 0, "expired": 0}
+        self._reports: "OrderedDict[tuple, WeatherReport]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.inflight = SingleFlight("weather")
+
+    @classmethod
+    def from_config(cls, config, session, api_key: Optional[str]) -> "WeatherService":
+        return cls(
+            session,
+            api_key,
+            base_url=config.WEATHER_API_URL,
+            units=config.WEATHER_UNITS,
+            ttl_seconds=config.WEATHER_CACHE_TTL_SECONDS,
+            max_entries=config.WEATHER_CACHE_SIZE,
+        )
+
+    def get(self, location: str) -> WeatherReport:
+        """
+        Current weather at `location`, from the cache while it is fresh.
+
+        :raises ValueError: If `location` is blank.
+        :raises requests.HTTPError: If the API rejects the lookup (e.g. 404 for an unknown city).
+        :raises CircuitOpenError: If the API has been failing and is not being called.
+        """
+        key = (normalize_location(location), self.units)
+        if not key[0]:
+            raise ValueError("A location is required for a weather lookup.")
+        report = self._cached(key)
+        if report is not None:
+            self._count("hit", "hits")
+            return report
+        self._count("miss", "misses")
+        return self.inflight.do(key, self._fetch, key, location)
+
+    def cached(self, location: str) -> Optional[WeatherReport]:
+        """The fresh cached report for `location`, or None; never makes a request."""
+        return self._cached((normalize_location(location), self.units))
+
+    def _cached(self, key: tuple) -> Optional[WeatherReport]:
+        with self._lock:
+            report = self._reports.get(key)
+            if report is None:
+                return None
+            if self.clock() - report.fetched_at >= self.ttl_seconds:
+                del self._reports[key]
+                self.stats["expired"] += 1
+                return None
+            self._reports.move_to_end(key)
+            return report
+
+    def _fetch(self, key: tuple, location: str) -> WeatherReport:
+        # A lookup that queued behind a flight which has since landed is served from the cache
+        report = self._cached(key)
+        if report is not None:
+            return report
+        with self._lock:
+            self.stats["fetches"] += 1
+
+        def attempt():
+            response = self.session.get(
+                f"{self.base_url}/weather",
+                params={"q": key[0], "appid": self.api_key, "units": self.units},
+                timeout=self.resilience.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        report = WeatherReport.from_openweathermap(self.resilience.call(attempt), self.units, self.clock())
+        self.logger.debug(f"Fetched weather for '{location}': {report}")
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._reports[key] = report
+                self._reports.move_to_end(key)
+                while len(self._reports) > self.max_entries:
+                    self._reports.popitem(last=False)
+        return report
+
+    def _count(self, result: str, key: str):
+        with self._lock:
+            self.stats[key] += 1
+        WEATHER_LOOKUPS.inc(result=result)
+
+    def clear(self):
+        with self._lock:
+            self._reports.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._reports)
@@ -0,0 +1,194 @@
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from operate.utils.metrics import REGISTRY
+
+TASK_TIMEOUTS = REGISTRY.counter("aia_task_timeouts_total", "Tasks that exceeded their timeout.", ("module",))
+
+
+class TaskTimeoutError(TimeoutError):
+    """Raised when a task does not finish within its timeout."""
+
+
+class ExecutionEngine:
+    """
+    Asyncio-based task engine used by the orchestrator.
+
+    An event loop runs on a dedicated background thread. Blocking module calls are run on a
+    bounded thread pool owned by each module, so one slow module cannot starve the others,
+    and several tasks can be in flight at once. Tasks are submitted from any thread and
+    handed back as concurrent.futures.Future objects; awaiting code can use `run` instead.
+    """
+
+    def __init__(self, default_workers: int = 2, default_timeout: Optional[float] = None,
+                 module_workers: Optional[Dict[str, int]] = None):
+        """
+        :param default_workers: Thread pool size for modules without an explicit size.
+        :param default_timeout: Timeout (seconds) applied to tasks that do not set their own.
+        :param module_workers: Per-module thread pool sizes.
+        """
+        self.default_workers = default_workers
+        self.default_timeout = default_timeout
+        self.module_workers = dict(module_workers or {})
+        self.logger = logging.getLogger("ExecutionEngine")
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pools = {}
+        self._in_flight = {}
+
+    def start(self):
+        """
+        Start the event loop thread. Called automatically on the first submission.
+        """
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run_loop, name="ExecutionEngine", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+        self.logger.info("Execution engine started.")
+
+    def set_pool_size(self, module_name: str, workers: int):
+        """
+        Set the thread pool size of a module. Takes effect the next time its pool is created.
+        """
+        if workers < 1:
+            raise ValueError("A module pool needs at least one worker.")
+        with self._lock:
+            self.module_workers[module_name] = workers
+
+    def _get_pool(self, module_name: str) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(module_name)
+            if pool is None:
+                workers = self.module_workers.get(module_name, self.default_workers)
+                pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=f"aia-{module_name}"
+                )
+                self._pools[module_name] = pool
+            return pool
+
+    def queue_depth(self, module_name: str) -> int:
+        """
+        Number of tasks for a module that are queued or running. A task that timed out while
+        running still occupies its worker until the call returns, so it is counted until then.
+        """
+        with self._lock:
+            return self._in_flight.get(module_name, 0)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Queued or running task counts for every module that has received tasks.
+        """
+        with self._lock:
+            return dict(self._in_flight)
+
+    async def run(self, module_name: str, function: Callable, *args,
+                  timeout: Optional[float] = None, **kwargs):
+        """
+        Run a blocking call on the module's thread pool and await its result.
+        Must be awaited on the engine's event loop.
+
+        :raises TaskTimeoutError: If the call does not finish within the timeout. A call that
+                                  is already running keeps its worker until it returns.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        pool = self._get_pool(module_name)
+        call = functools.partial(function, *args, **kwargs)
+
+        def finished(_):
+            with self._lock:
+                self._in_flight[module_name] -= 1
+
+        with self._lock:
+            self._in_flight[module_name] = self._in_flight.get(module_name, 0) + 1
+        # Counted until the worker is free again (or the queued call is dropped), not until
+        # the awaiting side gives up, so a timed-out call still shows up as occupying the pool
+        try:
+            work = pool.submit(call)
+        except BaseException:
+            finished(None)
+            raise
+        work.add_done_callback(finished)
+        pending = asyncio.wrap_future(work)
+        if timeout is None:
+            return await pending
+        try:
+            return await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            TASK_TIMEOUTS.inc(module=module_name)
+            raise TaskTimeoutError(
+                f"Task on module '{module_name}' did not finish within {timeout}s."
+            ) from None
+
+    def submit(self, module_name: str, function: Callable, *args,
+               timeout: Optional[float] = None, **kwargs) -> concurrent.futures.Future:
+        """
+        Submit a blocking call from any thread.
+
+        Cancelling the returned future cancels the task: a call still waiting for a worker
+        is dropped, and a call that is already running has its result discarded (Python
+        threads cannot be interrupted).
+
+        :return: Future resolving to the call's return value.
+        """
+        return self.submit_coroutine(self.run(module_name, function, *args, timeout=timeout, **kwargs))
+
+    def submit_coroutine(self, coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the engine's event loop from any thread, e.g. one awaiting
+        several module or API calls concurrently.
+
+        :return: Future resolving to the coroutine's return value.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    @staticmethod
+    async def _settle_tasks(cancel: bool):
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True):
+        """
+        Stop the event loop and the module thread pools.
+
+        :param wait: Wait for running calls to return.
+        :param cancel_pending: Cancel unfinished tasks instead of letting them complete.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            pools = list(self._pools.values())
+            self._loop, self._thread, self._pools = None, None, {}
+
+        if loop is not None:
+            # Let the tasks settle so every returned future is resolved before the loop stops
+            settled = asyncio.run_coroutine_threadsafe(self._settle_tasks(cancel_pending), loop)
+            try:
+                settled.result(timeout=None if wait else 5)
+            except concurrent.futures.TimeoutError:
+                self.logger.warning("Tasks were still running when the execution engine stopped.")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+        self.logger.info("Execution engine shut down.")
@@ -0,0 +1,133 @@
+import concurrent.futures
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+
+@dataclass
+class Job:
+    """
+    A long-running command submitted in the background.
+    """
+    job_id: int
+    description: str
+    future: concurrent.futures.Future = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.future.cancelled():
+            return "cancelled"
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "finished"
+        return "running" if self.started_at is not None else "queued"
+
+    @property
+    def duration(self) -> float:
+        """Seconds spent running (so far), or waiting in the queue if not started yet."""
+        if self.started_at is None:
+            return (self.finished_at or time.monotonic()) - self.submitted_at
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+class JobManager:
+    """
+    Tracks background jobs submitted to the execution engine, so the REPL can return to
+    the prompt immediately and fetch results later by job ID.
+    """
+
+    def __init__(self, engine, max_finished_jobs: int = 100):
+        """
+        :param engine: ExecutionEngine that runs the jobs.
+        :param max_finished_jobs: How many finished jobs to keep for `status`/`result`.
+        """
+        self.engine = engine
+        self.max_finished_jobs = max_finished_jobs
+        self.logger = logging.getLogger("JobManager")
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, description: str, module_name: str, function: Callable, *args,
+               on_done: Optional[Callable[[Job], None]] = None, timeout: Optional[float] = None,
+               **kwargs) -> Job:
+        """
+        Run `function(*args, **kwargs)` in the background on the module's worker pool.
+
+        :param description: Short label shown by `status`.
+        :param module_name: Module whose worker pool runs the job.
+        :param on_done: Called with the Job once it finishes, fails or is cancelled.
+        :return: The submitted Job.
+        """
+        job = Job(next(self._ids), description)
+
+        def run_job():
+            job.started_at = time.monotonic()
+            return function(*args, **kwargs)
+
+        job.future = self.engine.submit(module_name, run_job, timeout=timeout)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+
+        def finish(_):
+            job.finished_at = time.monotonic()
+            self.logger.info(f"Job {job.job_id} ({job.description}) {job.state} in {job.duration:.2f}s.")
+            if on_done is not None:
+                try:
+                    on_done(job)
+                except Exception:
+                    self.logger.error(f"on_done callback for job {job.job_id} failed.", exc_info=True)
+
+        job.future.add_done_callback(finish)
+        return job
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.future.done()]
+        for job_id in finished[:max(len(finished) - self.max_finished_jobs, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: int) -> Job:
+        """
+        :raises KeyError: If no such job exists (or it was pruned).
+        """
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"No job with ID {job_id}.")
+            return self._jobs[job_id]
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def result(self, job_id: int, timeout: Optional[float] = 0):
+        """
+        Return a job's result, waiting up to `timeout` seconds (None waits indefinitely).
+
+        :raises concurrent.futures.TimeoutError: If the job is still queued or running.
+        """
+        return self.get(job_id).future.result(timeout=timeout)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job. Returns False if it had already finished.
+        """
+        return self.get(job_id).future.cancel()
+
+    def format_status(self) -> str:
+        """
+        Table of queued, running and finished jobs with their durations.
+        """
+        jobs = self.jobs()
+        if not jobs:
+            return "No background jobs."
+        lines = [f"{'ID':>4}  {'STATE':<10} {'DURATION':>9}  DESCRIPTION"]
+        for job in jobs:
+            lines.append(f"{job.job_id:>4}  {job.state:<10} {job.duration:8.2f}s  {job.description}")
+        return "\n".join(lines)
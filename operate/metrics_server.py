@@ -0,0 +1,91 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from operate.utils.metrics import REGISTRY, MetricsRegistry
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Small embedded HTTP server exposing `/metrics` (Prometheus text format) and `/health`
+    (JSON) for the running assistant. Runs on a daemon thread next to the REPL.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9464,
+                 health_check: Optional[Callable[[], dict]] = None):
+        """
+        :param registry: Metrics to expose.
+        :param host: Interface to bind.
+        :param port: Port to bind (0 picks a free port).
+        :param health_check: Returns extra fields for `/health`; an exception marks the process unhealthy.
+        """
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.health_check = health_check
+        self.started_at = time.time()
+        self.logger = logging.getLogger("MetricsServer")
+        self._server = None
+        self._thread = None
+
+    def _health(self):
+        body = {"status": "ok", "uptime_seconds": round(time.time() - self.started_at, 1)}
+        try:
+            if self.health_check is not None:
+                body.update(self.health_check())
+            return 200, body
+        except Exception as e:
+            body.update(status="error", error=str(e))
+            return 503, body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    self._reply(200, server.registry.render(), PROMETHEUS_CONTENT_TYPE)
+                elif path == "/health":
+                    status, body = server._health()
+                    self._reply(status, json.dumps(body), "application/json")
+                else:
+                    self._reply(404, "Not found\n", "text/plain")
+
+            def _reply(self, status, body, content_type):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> int:
+        """
+        Start serving in the background.
+
+        :return: The bound port.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -1,7 +1,18 @@
 import requests
+import asyncio
+import functools
 import os
+import json
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional
+from config.settings import Config
+from operate.utils.http_cache import HTTPCache
+from operate.utils.rate_limit import RateLimitExceeded
+from operate.utils.resilience import CircuitOpenError, for_service
+from operate.utils.shared_resources import RESOURCES
+from operate.utils.singleflight import SingleFlight
 
 
 class APIManager:
@@ -10,10 +21,27 @@ class APIManager:
     Handles requests to external APIs like OpenAI, WhiteRabbit AI, and social media platforms.
     """
 
-    def __init__(self):
-        self.api_keys = self._load_api_keys()
+    def __init__(self, http_cache: Optional[HTTPCache] = None):
+        """
+        Args:
+            http_cache: Cache for GET responses (built from Config if omitted, unless disabled there).
+        """
         self.logger = logging.getLogger("APIManager")
-        self.session = requests.Session()
+        self.api_keys = self._load_api_keys()
+        self.session = RESOURCES.acquire("http_session")
+        # Concurrent identical requests share one upstream call; callers get their own copy
+        self.inflight = SingleFlight("api", copy_result=True)
+        if http_cache is None and Config.HTTP_CACHE_ENABLED:
+            http_cache = HTTPCache.from_config(Config)
+        self.http_cache = http_cache
+
+    def close(self):
+        """Return the shared HTTP session and close the response cache."""
+        if self.session is not None:
+            RESOURCES.release("http_session")
+            self.session = None
+        if self.http_cache is not None:
+            self.http_cache.close()
 
     def _load_api_keys(self) -> Dict[str, str]:
         """Load API keys from environment variables."""
@@ -29,7 +57,8 @@ class APIManager:
         return keys
 
     def send_request(
-        self, service: str, endpoint: str, payload: Dict[str, Any], method: str = "POST"
+        self, service: str, endpoint: str, payload: Dict[str, Any], method: str = "POST",
+        coalesce: Optional[bool] = None, rate_limit: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Sends a request to the specified API service.
@@ -39,9 +68,18 @@ class APIManager:
             endpoint: The API endpoint for the request.
             payload: The request body or parameters.
             method: HTTP method ('GET', 'POST', etc.).
+            coalesce: Share one upstream call between identical requests in flight at the same
+                time. Defaults to True for GET; only enable it for POSTs without side effects.
+            rate_limit: "block" to wait for the host's rate limit, "fail" to give up at once
+                when it is spent (Config.API_RATE_LIMIT_MODE if None).
 
         Returns:
-            JSON response if successful, None otherwise.
+            JSON response if successful, None otherwise. Timeouts, 429 and 5xx responses are
+            retried with backoff first (POSTs only when they were not sent or the service
+            asked for a retry, see may_resend); while the service's circuit is open or (fail-fast)
+            its rate limit is spent, None is returned without calling it. GET responses are
+            cached: a fresh entry is returned without a request, a stale one is revalidated
+            with a conditional GET.
         """
         base_urls = {
             "openai": "https://api.openai.com/v1",
@@ -55,21 +93,53 @@ class APIManager:
             return None
 
         url = f"{base_urls[service]}{endpoint}"
+        method = method.upper()
+        if coalesce is None:
+            coalesce = method == "GET"
+        if not coalesce:
+            return self._send(service, url, payload, method, rate_limit)
+        key = (service, method, url, json.dumps(payload, sort_keys=True, default=str))
+        return self.inflight.do(key, self._send, service, url, payload, method, rate_limit)
+
+    def _send(self, service: str, url: str, payload: Dict[str, Any], method: str,
+              rate_limit: Optional[str] = None) -> Optional[Dict[str, Any]]:
         headers = {"Authorization": f"Bearer {self.api_keys.get(service)}"}
+        if method not in ("POST", "GET"):
+            self.logger.error(f"Unsupported HTTP method: {method}")
+            return None
+        cache_key = entry = None
+        if method == "GET" and self.http_cache is not None:
+            cache_key = HTTPCache.make_key(url, payload, vary=service)
+            entry = self.http_cache.lookup(cache_key)
+            if entry is not None:
+                if self.http_cache.is_fresh(entry):
+                    self.logger.debug(f"Serving GET {url} from cache.")
+                    return entry.json()
+                headers.update(entry.validators())
         self.logger.debug(f"Sending {method} request to {url} with payload {payload}")
+        resilience = for_service(service)
 
-        try:
-            if method.upper() == "POST":
-                response = self.session.post(url, json=payload, headers=headers)
-            elif method.upper() == "GET":
-                response = self.session.get(url, params=payload, headers=headers)
+        def attempt():
+            if method == "POST":
+                response = self.session.post(url, json=payload, headers=headers, timeout=resilience.timeout,
+                                             rate_limit=rate_limit)
             else:
-                self.logger.error(f"Unsupported HTTP method: {method}")
-                return None
-
+                response = self.session.get(url, params=payload, headers=headers, timeout=resilience.timeout,
+                                            rate_limit=rate_limit)
             response.raise_for_status()
+            return response
+
+        try:
+            response = resilience.call_http(method, attempt)
             self.logger.info(f"API call to {service} succeeded.")
+            if cache_key is not None:
+                if response.status_code == 304 and entry is not None:
+                    return self.http_cache.revalidated(cache_key, entry, response.headers).json()
+                self.http_cache.store(cache_key, url, response)
             return response.json()
+        except (CircuitOpenError, RateLimitExceeded) as e:
+            self.logger.warning(f"API call to {service} skipped: {e}")
+            return None
         except requests.RequestException as e:
             self.logger.error(f"API call to {service} failed: {e}")
             return None
@@ -85,7 +155,7 @@ class APIManager:
             Generated response if successful, None otherwise.
         """
         payload = {"model": "gpt-4", "prompt": prompt, "max_tokens": 100}
-        response = self.send_request("openai", "/completions", payload)
+        response = self.send_request("openai", "/completions", payload, coalesce=True)
         return response.get("choices", [{}])[0].get("text") if response else None
 
     def analyze_with_whiterabbit(self, text: str) -> Optional[Dict[str, Any]]:
@@ -99,10 +169,99 @@ class APIManager:
             Analysis result if successful, None otherwise.
         """
         payload = {"text": text}
-        response = self.send_request("whiterabbit", "/analyze", payload)
+        response = self.send_request("whiterabbit", "/analyze", payload, coalesce=True)
         return response if response else None
 
 
+@dataclass
+class APICall:
+    """One request for AsyncAPIManager.gather; the fields are APIManager.send_request's arguments."""
+    service: str
+    endpoint: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    method: str = "POST"
+    coalesce: Optional[bool] = None
+    rate_limit: Optional[str] = None
+
+
+class AsyncAPIManager:
+    """
+    asyncio front end to APIManager, for fanning out to several APIs at once: awaiting
+    calls concurrently costs about the slowest call instead of the sum of them.
+
+    Requests still go through the wrapped APIManager, run on a bounded thread pool, so they
+    share its HTTP connection pools, in-flight coalescing, retries and circuit breakers (and
+    rate limits) with synchronous callers.
+    """
+
+    def __init__(self, manager: Optional[APIManager] = None, max_concurrency: int = 16):
+        """
+        :param manager: The APIManager to send requests through (a new one if omitted).
+        :param max_concurrency: Requests in flight at once; keep it within the HTTP pool size.
+        """
+        self.manager = manager or APIManager()
+        # A manager passed in belongs to the caller, who closes it
+        self._owns_manager = manager is None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="AsyncAPI")
+
+    async def send_request(
+        self, service: str, endpoint: str, payload: Dict[str, Any], method: str = "POST",
+        coalesce: Optional[bool] = None, rate_limit: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Awaitable APIManager.send_request: JSON response if successful, None otherwise.
+        """
+        call = functools.partial(self.manager.send_request, service, endpoint, payload, method, coalesce, rate_limit)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def gather(self, calls: Iterable[APICall], timeout: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send all `calls` concurrently.
+
+        Returns:
+            One result per call, in input order; None for a failed call (or, with `timeout`,
+            for a call still unfinished when it expires).
+        """
+        calls = list(calls)
+        tasks = [
+            asyncio.ensure_future(self.send_request(call.service, call.endpoint, call.payload, call.method,
+                                                    call.coalesce, call.rate_limit))
+            for call in calls
+        ]
+        if not tasks:
+            return []
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.manager.logger.warning(f"{len(pending)} of {len(tasks)} API call(s) did not finish within {timeout}s.")
+        results = []
+        for call, task in zip(calls, tasks):
+            if task in pending:
+                results.append(None)
+            elif task.exception() is not None:
+                self.manager.logger.error(f"API call to {call.service} failed: {task.exception()}")
+                results.append(None)
+            else:
+                results.append(task.result())
+        return results
+
+    async def generate_text_with_openai(self, prompt: str) -> Optional[str]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.manager.generate_text_with_openai, prompt
+        )
+
+    async def analyze_with_whiterabbit(self, text: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.manager.analyze_with_whiterabbit, text
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_manager:
+            self.manager.close()
+
+
 # Example Usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -1,11 +1,13 @@
 import os
-import psutil
-import pyautogui
 import subprocess
 import time
 import platform
 import logging
 from typing import Optional
+from operate.utils.lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
+pyautogui = lazy_import("pyautogui")
 
 
 class SystemInteraction:
@@ -1,103 +1,512 @@
+import concurrent.futures
+import functools
 import logging
+import threading
 import time
 from modules.voice_assistant import VoiceAssistant
 from modules.internet_tasks import InternetTasks
 from modules.device_control import DeviceControl
 from modules.social_media import SocialMediaManager
-from modules.chatbot import ChatBot
+from modules.chatbot import ChatBot, iter_sentences
 from modules.machine_learning import ModelManager
 from modules.error_handling import ErrorLogger
+from modules.intent_router import IntentRouter
+from operate.execution_engine import ExecutionEngine
+from operate.models.apis import APIManager, AsyncAPIManager
+from operate.process_pool import ProcessOffloader, TaskEnvelope
+from operate.jobs import JobManager
+from operate.pipeline import CommandPipeline
+from operate.utils.system_monitor import SystemSampler
+from operate.utils.metrics import REGISTRY
+from operate.metrics_server import MetricsServer
 from config.settings import Config
 
+MODULE_REGISTRATIONS = REGISTRY.counter(
+    "aia_module_registrations_total", "Modules registered with the orchestrator.", ("module",)
+)
+MODULE_CONSTRUCTION_SECONDS = REGISTRY.histogram(
+    "aia_module_construction_seconds", "Time spent constructing modules on first use.", ("module",)
+)
+MODULE_CALLS = REGISTRY.counter(
+    "aia_module_calls_total", "Module calls made through execute_task or submit_job.", ("module", "action")
+)
+MODULE_ERRORS = REGISTRY.counter(
+    "aia_module_errors_total", "Module calls that raised an exception.", ("module", "action")
+)
+MODULE_CALL_SECONDS = REGISTRY.histogram(
+    "aia_module_call_duration_seconds", "Duration of module calls.", ("module", "action")
+)
+
+# When a weather command is about, not where: "weather for tomorrow", "forecast at the moment"
+_WHEN = (
+    r"(?:today|tonight|now|right\s+now|noon|midnight|weekdays"
+    r"|tomorrow(?:\s+(?:morning|afternoon|evening|night))?"
+    r"|the\s+(?:moment|weekend|week|day|morning|afternoon|evening|night|next\s+few\s+days)"
+    r"|(?:this|next)\s+(?:morning|afternoon|evening|week|weekend)"
+    r"|(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)s?)"
+)
+# "in|for|at <location>", skipping a preposition followed by a time, and dropping times that
+# trail the location ("in Paris tomorrow", "in Paris for the weekend")
+WEATHER_LOCATION_PATTERN = (
+    rf"\b(?:in|for|at)\s+(?!{_WHEN}\b)(?P<location>[a-z][\w\s,.-]*?)"
+    rf"(?:\s+(?:(?:in|for|at|on|over|during)\s+)?{_WHEN})*[\s.!?]*$"
+)
+
 class Orchestrator:
     """
     Orchestrates various AI modules and system operations, combining voice recognition,
     task automation, device control, social media interactions, and error handling.
     """
 
+    # Method called by execute_task when no explicit action is given
+    DEFAULT_TASK_ACTIONS = {
+        "face_detection": "detect_and_identify",
+        "face_recognition": "run_face_recognition",
+        "data_retrieval": "process_image",
+        "chatbot": "generate_response",
+        "internet_tasks": "get_weather",
+        "ml": "predict",
+        "ocr": "extract_text",
+    }
+
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger("Orchestrator")
 
-        # Initialize modules
-        self.voice_assistant = VoiceAssistant(config)
-        self.internet_tasks = InternetTasks(config)
-        self.device_control = DeviceControl(config)
-        self.social_media_manager = SocialMediaManager(config=config)
-        self.chatbot = ChatBot(config)
-        self.ml = ModelManager(model_type=self.config.get_model_config("MODEL_TYPE"))  # Pass the key name
-        self.error_handler = ErrorLogger(log_directory="logs")
-
-        # Register modules
+        # Module registry: instances are constructed on first use from their factories
         self.modules = {}
-        self.register_module("voice_assistant", self.voice_assistant)
-        self.register_module("internet_tasks", self.internet_tasks)
-        self.register_module("device_control", self.device_control)
-        self.register_module("social_media_manager", self.social_media_manager)
-        self.register_module("chatbot", self.chatbot)
-        self.register_module("ml", self.ml)
-        self.register_module("error_handler", self.error_handler)
+        self.module_factories = {}
+        self.module_load_times = {}
+        self._registry_lock = threading.Lock()
+        self._module_locks = {}
+        self.module_aliases = {}
+        self.cpu_bound_modules = set()
+        self.stateful_actions = {}
+
+        # CPU-bound modules run in worker processes so they scale across cores
+        self.process_pool = ProcessOffloader(
+            max_workers=config.PROCESS_POOL_SIZE or None,
+            start_method=config.PROCESS_START_METHOD,
+        )
+
+        self.register_module(
+            "voice_assistant", factory=lambda: VoiceAssistant(config, internet_tasks=self.get_module("internet_tasks"))
+        )
+        self.register_module("internet_tasks", factory=lambda: InternetTasks(config))
+        self.register_module("device_control", factory=lambda: DeviceControl(config))
+        self.register_module("social_media_manager", factory=lambda: SocialMediaManager(config=config))
+        self.register_module("chatbot", factory=ChatBot)
+        self.register_module("api_manager", factory=APIManager)
+        self.register_module(
+            "async_api",
+            factory=lambda: AsyncAPIManager(self.get_module("api_manager"), max_concurrency=config.API_MAX_CONCURRENCY),
+        )
+        self.register_module(
+            "ml",
+            factory=functools.partial(
+                ModelManager,
+                model_type=config.get_model_config("MODEL_TYPE"),
+                model_path=config.ML_MODEL_PATH or None,
+            ),
+            cpu_bound=True,
+            stateful_actions=("train_model", "load_model", "save_model"),
+        )
+        self.register_module("error_handler", factory=lambda: ErrorLogger(log_directory="logs"))
 
-    def register_module(self, module_name: str, module_object):
+        self.intent_router = self._build_intent_router()
+
+        # Module calls submitted through execute_task run here, off the caller's thread
+        self.engine = ExecutionEngine(
+            default_workers=config.MODULE_WORKERS,
+            default_timeout=config.TASK_TIMEOUT_SECONDS,
+        )
+        self.jobs = JobManager(self.engine)
+        self.pipeline = None
+
+        self.sampler = SystemSampler(
+            interval=config.MONITOR_INTERVAL_SECONDS,
+            capacity=config.MONITOR_SAMPLE_CAPACITY,
+        )
+        self.sampler.register_queue("engine", self.engine.queue_depths)
+        self.sampler.register_queue("pipeline", lambda: self.pipeline.queue_depth() if self.pipeline else 0)
+
+        self.metrics_server = None
+        self._register_metrics()
+
+    # Shortcuts to the core modules; each one is built the first time it is accessed.
+    voice_assistant = property(lambda self: self.get_module("voice_assistant"))
+    internet_tasks = property(lambda self: self.get_module("internet_tasks"))
+    device_control = property(lambda self: self.get_module("device_control"))
+    social_media_manager = property(lambda self: self.get_module("social_media_manager"))
+    chatbot = property(lambda self: self.get_module("chatbot"))
+    ml = property(lambda self: self.get_module("ml"))
+    error_handler = property(lambda self: self.get_module("error_handler"))
+    async_api = property(lambda self: self.get_module("async_api"))
+
+    def register_module(self, module_name: str, module_object=None, factory=None, cpu_bound: bool = False,
+                        stateful_actions=()):
         """
-        Registers a module by adding it to the orchestrator's modules dictionary.
+        Registers a module by name.
+
+        Either an already constructed module object or a zero-argument factory can be
+        given. Factories are not called until the module is first needed (see get_module),
+        so modules a session never touches are never constructed.
+
+        Calls to a `cpu_bound` module made through execute_task or submit_job run in a worker
+        process (see ProcessOffloader). Its factory must be picklable, e.g. a class or a
+        functools.partial rather than a lambda.
+
+        Each worker builds its own copy of a cpu_bound module, so `stateful_actions` (methods
+        that change the module or depend on earlier changes, such as train_model) run on the
+        in-process instance instead. Once that instance exists, every call to the module
+        runs in-process, so predictions see what was trained or loaded.
         """
-        self.modules[module_name] = module_object
+        if module_object is None and factory is None:
+            raise ValueError(f"Module '{module_name}' needs either a module object or a factory.")
+        if cpu_bound:
+            if factory is None:
+                raise ValueError(f"CPU-bound module '{module_name}' must be registered with a factory.")
+            self.process_pool.add_module(module_name, factory)
+
+        with self._registry_lock:
+            self.module_aliases.pop(module_name, None)
+            if factory is not None:
+                self.module_factories[module_name] = factory
+                self.modules.pop(module_name, None)
+                self.module_load_times.pop(module_name, None)
+            else:
+                self.module_factories.pop(module_name, None)
+                self.modules[module_name] = module_object
+            self._module_locks.setdefault(module_name, threading.Lock())
+            if cpu_bound:
+                self.cpu_bound_modules.add(module_name)
+                self.stateful_actions[module_name] = frozenset(stateful_actions)
+            else:
+                self.cpu_bound_modules.discard(module_name)
+                self.stateful_actions.pop(module_name, None)
+        MODULE_REGISTRATIONS.inc(module=module_name)
         self.logger.info(f"Module '{module_name}' registered successfully.")
 
+    def register_alias(self, alias: str, module_name: str):
+        """
+        Make `alias` another name for the module registered as `module_name`. Calls through
+        the alias share the module's instance and, for a cpu_bound module, its worker processes.
+        """
+        with self._registry_lock:
+            if alias in self._module_locks:
+                raise ValueError(f"'{alias}' is already registered as a module.")
+            self.module_aliases[alias] = module_name
+        self.logger.info(f"Module alias '{alias}' -> '{module_name}' registered.")
+
+    def _resolve(self, module_name: str) -> str:
+        return self.module_aliases.get(module_name, module_name)
+
+    def get_module(self, module_name: str):
+        """
+        Return the module registered under `module_name`, constructing it on first use.
+        """
+        module_name = self._resolve(module_name)
+        module = self.modules.get(module_name)
+        if module is not None:
+            return module
+
+        with self._registry_lock:
+            if module_name not in self._module_locks:
+                raise KeyError(f"Module '{module_name}' is not registered.")
+            module_lock = self._module_locks[module_name]
+
+        # Construct under a per-module lock so a slow module does not block the others
+        with module_lock:
+            module = self.modules.get(module_name)
+            if module is not None:
+                return module
+            factory = self.module_factories[module_name]
+            start_time = time.perf_counter()
+            try:
+                module = factory()
+            except Exception:
+                self.logger.error(f"Failed to construct module '{module_name}'.", exc_info=True)
+                raise
+            load_time = time.perf_counter() - start_time
+            with self._registry_lock:
+                self.modules[module_name] = module
+                self.module_load_times[module_name] = load_time
+            MODULE_CONSTRUCTION_SECONDS.observe(load_time, module=module_name)
+            self.logger.info(f"Module '{module_name}' constructed in {load_time:.3f}s.")
+            return module
+
+    def is_module_loaded(self, module_name: str) -> bool:
+        """
+        Check whether a registered module has already been constructed.
+        """
+        return self._resolve(module_name) in self.modules
+
+    def module_report(self) -> str:
+        """
+        Build a per-module construction-time report, slowest modules first.
+        Modules that have not been needed yet are listed as not loaded.
+        """
+        with self._registry_lock:
+            names = list(self._module_locks)
+            load_times = dict(self.module_load_times)
+            loaded = set(self.modules)
+
+        constructed = sorted(load_times.items(), key=lambda item: item[1], reverse=True)
+        lines = ["Module construction times:"]
+        for name, load_time in constructed:
+            lines.append(f"  {name:<24} {load_time * 1000:10.1f} ms")
+        for name in names:
+            if name in loaded and name not in load_times:
+                lines.append(f"  {name:<24} {'(pre-built)':>13}")
+        for name in names:
+            if name not in loaded:
+                lines.append(f"  {name:<24} {'(not loaded)':>13}")
+        lines.append(f"  {'total':<24} {sum(load_times.values()) * 1000:10.1f} ms")
+        return "\n".join(lines)
+
+    def _module_call(self, module_name: str, params: dict = None, action: str = None):
+        """
+        Build a zero-argument callable that runs `action` on a registered module.
+
+        :raises KeyError: If the module is not registered or has no default action.
+        """
+        # Resolved first, so an alias of a cpu_bound module is offloaded like the module itself
+        module_name = self._resolve(module_name)
+        params = params or {}
+        action = action or self.DEFAULT_TASK_ACTIONS.get(module_name)
+        if module_name not in self._module_locks:
+            raise KeyError(f"Module '{module_name}' is not registered.")
+        if action is None:
+            raise KeyError(f"Module '{module_name}' has no default action.")
+
+        def call_module():
+            MODULE_CALLS.inc(module=module_name, action=action)
+            start_time = time.perf_counter()
+            try:
+                if self._offloaded(module_name, action):
+                    factory = self.module_factories[module_name]
+                    return self.process_pool.run(TaskEnvelope(module_name, factory, action, params))
+                return getattr(self.get_module(module_name), action)(**params)
+            except Exception:
+                MODULE_ERRORS.inc(module=module_name, action=action)
+                raise
+            finally:
+                MODULE_CALL_SECONDS.observe(time.perf_counter() - start_time, module=module_name, action=action)
+
+        return call_module
+
+    def _offloaded(self, module_name: str, action: str) -> bool:
+        """Whether `action` on a module runs in a worker process rather than in-process."""
+        return (
+            module_name in self.cpu_bound_modules
+            and action not in self.stateful_actions.get(module_name, ())
+            and module_name not in self.modules
+        )
+
+    def execute_task(self, module_name: str, params: dict = None, action: str = None,
+                     timeout: float = None) -> concurrent.futures.Future:
+        """
+        Run a module method on the execution engine without blocking the caller.
+
+        The module is constructed on first use inside its own worker pool, so a slow
+        construction does not block the caller either.
+
+        :param module_name: Name of a registered module.
+        :param params: Keyword arguments for the module method.
+        :param action: Method to call; defaults to DEFAULT_TASK_ACTIONS[module_name].
+        :param timeout: Seconds before the task fails with TaskTimeoutError
+                        (defaults to Config.TASK_TIMEOUT_SECONDS).
+        :return: Future resolving to the method's return value. Cancel it to cancel the task.
+        """
+        try:
+            call_module = self._module_call(module_name, params, action)
+        except KeyError as e:
+            failed = concurrent.futures.Future()
+            failed.set_exception(e)
+            return failed
+
+        self.logger.debug(f"Submitting task '{module_name}'.")
+        return self.engine.submit(module_name, call_module, timeout=timeout)
+
+    def fan_out(self, calls, timeout: float = None) -> concurrent.futures.Future:
+        """
+        Send several API calls (operate.models.apis.APICall) concurrently on the execution
+        engine's event loop, without blocking the caller.
+
+        :return: Future resolving to one response per call, in order (None for a failed call).
+        """
+        return self.engine.submit_coroutine(self.async_api.gather(calls, timeout=timeout))
+
+    def submit_job(self, description: str, module_name: str, params: dict = None,
+                   action: str = None, on_done=None, timeout: float = None):
+        """
+        Submit a module call as a background job tracked by `self.jobs`.
+
+        :return: The submitted Job; its ID is used by the REPL's `status`, `wait` and `result`.
+        :raises KeyError: If the module is not registered or has no default action.
+        """
+        call_module = self._module_call(module_name, params, action)
+        return self.jobs.submit(description, module_name, call_module, on_done=on_done, timeout=timeout)
+
+    def _build_intent_router(self) -> IntentRouter:
+        """
+        Declare the voice command intents and the handlers they map to.
+        """
+        router = IntentRouter()
+        router.register(
+            "weather", ["weather", "forecast", "temperature"], self._handle_weather,
+            pattern=WEATHER_LOCATION_PATTERN,
+        )
+        router.register(
+            "news", ["news", "headlines"], self._handle_news,
+            pattern=r"\b(?P<category>business|entertainment|general|health|science|sports|technology)\b",
+        )
+        router.register("device_control", ["control"], self._handle_device_control)
+        router.register("post_to_twitter", ["post to twitter", "tweet"], self._handle_post_to_twitter)
+        router.register("fetch_twitter_posts", ["fetch twitter posts"], self._handle_fetch_twitter_posts)
+        router.register("post_to_facebook", ["post to facebook"], self._handle_post_to_facebook)
+        # Bare "social" only wins when no specific social media intent matched
+        router.register("social_unknown", ["social"], self._handle_unknown_social, priority=-1)
+        router.register("chat", ["chat"], self._handle_chat, pattern=r"\bchat\b\s*(?P<prompt>.+)")
+        return router
+
+    def _handle_weather(self, location=None):
+        self.logger.info("Fetching weather information.")
+        return self.internet_tasks.get_weather(location or self.config.DEFAULT_LOCATION)
+
+    def _handle_news(self, category="general"):
+        self.logger.info("Fetching news.")
+        return self.internet_tasks.get_news(category)
+
+    def _handle_device_control(self):
+        self.logger.info("Controlling devices.")
+        return self.device_control.move_mouse(100, 100)  # Example action
+
+    def _handle_post_to_twitter(self):
+        self.logger.info("Interacting with social media.")
+        return self.social_media_manager.post_to_twitter("Automated post!")
+
+    def _handle_fetch_twitter_posts(self):
+        self.logger.info("Interacting with social media.")
+        return self.social_media_manager.get_latest_posts("twitter")
+
+    def _handle_post_to_facebook(self):
+        self.logger.info("Interacting with social media.")
+        return self.social_media_manager.post_to_facebook("Automated post!")
+
+    def _handle_unknown_social(self):
+        self.logger.warning("Unknown social media command.")
+
+    def _handle_chat(self, prompt=""):
+        self.logger.info("Chatbot initiated.")
+        # Speak each sentence as soon as it has streamed in rather than after the whole reply
+        sentences = []
+        for sentence in iter_sentences(self.chatbot.stream_response(prompt or "Hello")):
+            self.voice_assistant.speak(sentence)
+            sentences.append(sentence)
+        return " ".join(sentences)
+
     def execute_voice_command(self, command: str):
         """
-        Process a voice command, calling the respective method or module.
+        Process a voice command by routing it to the matching intent handler.
         """
         try:
-            if "weather" in command:
-                self.logger.info("Fetching weather information.")
-                self.internet_tasks.get_weather()
-            elif "news" in command:
-                self.logger.info("Fetching news.")
-                self.internet_tasks.get_news()
-            elif "control" in command:
-                self.logger.info("Controlling devices.")
-                self.device_control.move_mouse(100, 100)  # Example action
-            elif "social" in command:
-                self.logger.info("Interacting with social media.")
-                if "post to twitter" in command:
-                    self.social_media_manager.post_to_twitter("Automated post!")
-                elif "fetch twitter posts" in command:
-                    self.social_media_manager.get_latest_posts("twitter")
-                elif "post to facebook" in command:
-                    self.social_media_manager.post_to_facebook("Automated post!")
-                else:
-                    self.logger.warning("Unknown social media command.")
-            elif "chat" in command:
-                self.logger.info("Chatbot initiated.")
-                self.chatbot.start_chatbot(command)
-            else:
+            match = self.intent_router.match(command)
+            if match is None:
                 self.logger.warning(f"Unknown command: {command}")
+                return None
+            self.logger.debug(f"Command routed to intent '{match.intent.name}' with {match.arguments}.")
+            return match.dispatch()
         except Exception as e:
             error_message = self.error_handler.handle_exception(e, "Error in execute_voice_command")
             self.logger.error(error_message)
 
-    def monitor_system(self):
+    def _queue_depths(self) -> dict:
+        depths = {f"engine.{name}": depth for name, depth in self.engine.queue_depths().items()}
+        if self.pipeline is not None:
+            depths["pipeline"] = self.pipeline.queue_depth()
+        return depths
+
+    def _register_metrics(self):
         """
-        Monitor the system's performance and handle any system-level requests.
+        Expose registry, queue and process state as scrape-time gauges.
         """
-        try:
-            while True:
-                self.logger.info("System is running...")
-                time.sleep(5)
-        except KeyboardInterrupt:
-            self.logger.info("System monitoring interrupted by user.")
+        REGISTRY.gauge(
+            "aia_module_loaded", "Whether a registered module has been constructed (1) or not (0).", ("module",),
+            function=lambda: {name: int(name in self.modules) for name in list(self._module_locks)},
+        )
+        REGISTRY.gauge(
+            "aia_queue_depth", "Tasks queued or running per engine module pool and voice commands waiting.",
+            ("queue",), function=self._queue_depths,
+        )
+        REGISTRY.gauge(
+            "aia_jobs", "Background jobs by state.", ("state",),
+            function=self._count_jobs_by_state,
+        )
+
+        def latest_sample(attribute):
+            sample = self.sampler.latest()
+            return getattr(sample, attribute) if sample is not None else None
+
+        REGISTRY.gauge("process_resident_memory_bytes", "Resident memory size in bytes.",
+                       function=lambda: latest_sample("rss_bytes"))
+        REGISTRY.gauge("process_threads", "Number of OS threads in the process.",
+                       function=lambda: latest_sample("threads"))
+        REGISTRY.gauge("process_open_fds", "Number of open file descriptors.",
+                       function=lambda: latest_sample("open_fds"))
+        REGISTRY.gauge("process_cpu_percent", "Process CPU usage in percent.",
+                       function=lambda: latest_sample("cpu_percent"))
+
+    def _count_jobs_by_state(self) -> dict:
+        counts = {}
+        for job in self.jobs.jobs():
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    def start_metrics_server(self, host: str = None, port: int = None) -> MetricsServer:
+        """
+        Serve `/metrics` and `/health` over HTTP (defaults: Config.METRICS_HOST/METRICS_PORT).
+        Starts the system sampler too, since process memory is read from it.
+        """
+        if self.metrics_server is None:
+            self.monitor_system()
+            self.metrics_server = MetricsServer(
+                REGISTRY,
+                host=host or self.config.METRICS_HOST,
+                port=self.config.METRICS_PORT if port is None else port,
+                health_check=lambda: {
+                    "modules_registered": len(self._module_locks),
+                    "modules_loaded": len(self.modules),
+                },
+            )
+            self.metrics_server.start()
+        return self.metrics_server
+
+    def monitor_system(self) -> SystemSampler:
+        """
+        Start sampling the system's resource usage in the background.
+        The sampler records CPU, RSS, threads, open FDs and module queue depths.
+        """
+        self.sampler.start()
+        return self.sampler
 
-    def run(self):
+    def run(self, pipelined: bool = None):
         """
         Run the orchestrator to handle commands, control the system, and process tasks.
+
+        :param pipelined: Listen and execute on separate threads so the microphone stays live
+                          while slow commands run (defaults to Config.PIPELINE_ENABLED).
         """
         self.logger.info("Starting Orchestrator...")
+        if pipelined is None:
+            pipelined = self.config.PIPELINE_ENABLED
+        if pipelined:
+            self._run_pipelined()
+            return
+
         while True:
             try:
-                # Simulate receiving a voice command for testing
-                command = self.voice_assistant.listen_for_command()
+                command = self.voice_assistant.listen()
                 if command:
                     self.logger.info(f"Received command: {command}")
                     self.execute_voice_command(command)
@@ -108,17 +517,59 @@ class Orchestrator:
                 error_message = self.error_handler.handle_exception(e, "Error in orchestrator.run")
                 self.logger.error(error_message)
 
-    def shutdown(self):
+    def _run_pipelined(self):
+        """
+        Listen on one thread and execute commands on worker threads, connected by a bounded
+        queue (see CommandPipeline for the overflow policies).
+        """
+        self.pipeline = CommandPipeline(
+            listen=self.voice_assistant.listen,
+            handle=self.execute_voice_command,
+            max_queue=self.config.COMMAND_QUEUE_SIZE,
+            workers=self.config.COMMAND_WORKERS,
+            policy=self.config.COMMAND_QUEUE_POLICY,
+            put_timeout=self.config.COMMAND_QUEUE_PUT_TIMEOUT or None,
+        )
+        self.pipeline.start()
+        try:
+            while self.pipeline.is_running():
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.pipeline.stop()
+            self.shutdown()
+
+    def shutdown(self, wait: bool = True):
         """
         Shutdown the orchestrator and clean up resources.
+
+        :param wait: Wait for running tasks and jobs to finish instead of abandoning them.
         """
         self.logger.info("Shutting down orchestrator...")
         try:
-            self.voice_assistant.stop_listening()
-            self.device_control.shutdown_system()
-        except Exception as e:
-            self.logger.error(f"Error during shutdown: {e}")
+            # Only tear down modules that were actually constructed during the session, newest
+            # first, and each object once (factories may hand out a shared one). Each close()
+            # hands back shared handles (HTTP session, TTS engine, microphone, tokenizer, models)
+            # or stops background workers, so one failing must not skip the rest.
+            with self._registry_lock:
+                loaded = list(self.modules.items())
+            closed = set()
+            for module_name, module in reversed(loaded):
+                close = getattr(module, "close", None)
+                if id(module) in closed or not callable(close):
+                    continue
+                closed.add(id(module))
+                try:
+                    close()
+                except Exception as e:
+                    self.logger.error(f"Error closing module '{module_name}': {e}")
         finally:
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+            self.sampler.stop()
+            self.engine.shutdown(wait=wait)
+            self.process_pool.shutdown(wait=wait)
             self.logger.info("Orchestrator shut down successfully.")
 
     def handle_command(self, command: str):
@@ -128,10 +579,10 @@ class Orchestrator:
         """
         if command.lower() == "detect face":
             # Call the face detection functionality
-            return self.execute_task("face_detection", {})
+            return self.execute_task("face_detection", {}).result()
         elif command.lower() == "recognize person":
             # Call the recognition functionality
-            return self.execute_task("face_recognition", {})
+            return self.execute_task("face_recognition", {}).result()
         # Add more commands as needed
         else:
             return "Command not recognized."
@@ -0,0 +1,156 @@
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class CommandPipeline:
+    """
+    Producer/consumer pipeline for voice commands.
+
+    A listener thread keeps capturing commands and pushes them into a bounded queue while
+    worker threads execute them, so the microphone stays live during slow commands.
+    What happens when the queue is full is decided by the overflow policy:
+
+    - "block":       backpressure; the listener waits for a free slot before listening again
+                     (after `put_timeout` seconds, if set, the new command is dropped)
+    - "drop_newest": the command that just arrived is discarded
+    - "drop_oldest": the oldest queued command is discarded to make room for the new one
+    """
+
+    POLICIES = ("block", "drop_newest", "drop_oldest")
+
+    def __init__(self, listen: Callable[[], Optional[str]], handle: Callable[[str], object],
+                 max_queue: int = 8, workers: int = 1, policy: str = "block",
+                 put_timeout: Optional[float] = None, on_drop: Optional[Callable[[str], None]] = None):
+        """
+        :param listen: Blocking call returning the next command (or None if nothing was heard).
+        :param handle: Called on a worker thread for every queued command.
+        :param max_queue: Maximum number of commands waiting for a worker.
+        :param workers: Number of worker threads. With one worker, commands run in order.
+        :param policy: Overflow policy, one of POLICIES.
+        :param put_timeout: With the "block" policy, how long to wait for a free slot.
+        :param on_drop: Called with every command dropped because the queue was full.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Choose from {', '.join(self.POLICIES)}.")
+        if max_queue < 1 or workers < 1:
+            raise ValueError("max_queue and workers must be at least 1.")
+        self.listen = listen
+        self.handle = handle
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.on_drop = on_drop
+        self.worker_count = workers
+        self.logger = logging.getLogger("CommandPipeline")
+        self.commands = queue.Queue(maxsize=max_queue)
+        self.stats = {"received": 0, "processed": 0, "failed": 0, "dropped": 0}
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _drop(self, command: str):
+        self._count("dropped")
+        self.logger.warning(f"Command queue full ({self.policy}); dropped command: {command}")
+        if self.on_drop is not None:
+            self.on_drop(command)
+
+    def offer(self, command: str) -> bool:
+        """
+        Queue a command according to the overflow policy.
+
+        :return: True if the command was queued, False if it was dropped.
+        """
+        self._count("received")
+        if self.policy == "block":
+            # Wait in short slices so stop() is honoured while the queue is full
+            waited = 0.0
+            while not self._stop_event.is_set():
+                try:
+                    self.commands.put(command, timeout=0.2)
+                    return True
+                except queue.Full:
+                    waited += 0.2
+                    if self.put_timeout is not None and waited >= self.put_timeout:
+                        break
+            self._drop(command)
+            return False
+
+        while True:
+            try:
+                self.commands.put_nowait(command)
+                return True
+            except queue.Full:
+                if self.policy == "drop_newest":
+                    self._drop(command)
+                    return False
+                try:
+                    self._drop(self.commands.get_nowait())
+                    self.commands.task_done()
+                except queue.Empty:
+                    pass
+
+    def _listen_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                command = self.listen()
+            except Exception:
+                self.logger.error("Listening failed.", exc_info=True)
+                continue
+            if command:
+                self.logger.info(f"Received command: {command}")
+                self.offer(command)
+
+    def _work_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                command = self.commands.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                self.handle(command)
+                self._count("processed")
+            except Exception:
+                self._count("failed")
+                self.logger.error(f"Command failed: {command}", exc_info=True)
+            finally:
+                self.commands.task_done()
+
+    def start(self):
+        """
+        Start the listener and worker threads.
+        """
+        self._stop_event.clear()
+        self._threads = [threading.Thread(target=self._listen_loop, name="CommandListener", daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._work_loop, name=f"CommandWorker-{index}", daemon=True)
+            for index in range(self.worker_count)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(
+            f"Command pipeline started ({self.worker_count} worker(s), queue size "
+            f"{self.commands.maxsize}, policy '{self.policy}')."
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop listening and let the workers finish the command they are running.
+        Commands still waiting in the queue are discarded.
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        self.logger.info(f"Command pipeline stopped. Stats: {self.stats}")
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def queue_depth(self) -> int:
+        """Number of commands waiting for a worker."""
+        return self.commands.qsize()
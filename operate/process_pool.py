@@ -0,0 +1,131 @@
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class TaskEnvelope:
+    """
+    Picklable description of a module call to run in a worker process.
+    The factory must be picklable too: a top-level class or function, or a
+    functools.partial of one (lambdas and bound methods are not).
+    """
+    module_name: str
+    factory: Callable
+    action: str
+    kwargs: Dict = field(default_factory=dict)
+
+
+# Module instances owned by the current worker process, built once and reused
+_worker_modules: Dict[str, object] = {}
+
+
+def _warm_worker(factories: Dict[str, Callable]):
+    """
+    Worker initializer: construct (and so load the models of) every CPU-bound module once,
+    before the worker accepts its first task.
+    """
+    for module_name, factory in factories.items():
+        try:
+            _worker_modules[module_name] = factory()
+        except Exception:
+            logging.getLogger("ProcessOffloader").error(
+                f"Failed to preload module '{module_name}' in worker {os.getpid()}.", exc_info=True
+            )
+
+
+def run_envelope(envelope: TaskEnvelope):
+    """
+    Execute a task envelope inside a worker process.
+    """
+    module = _worker_modules.get(envelope.module_name)
+    if module is None:
+        module = envelope.factory()
+        _worker_modules[envelope.module_name] = module
+    return getattr(module, envelope.action)(**envelope.kwargs)
+
+
+def ensure_picklable(module_name: str, factory: Callable):
+    """
+    :raises ValueError: If the factory cannot be sent to a worker process.
+    """
+    try:
+        pickle.dumps(factory)
+    except Exception as e:
+        raise ValueError(
+            f"Factory of CPU-bound module '{module_name}' must be picklable "
+            f"(a top-level class/function or functools.partial): {e}"
+        ) from None
+
+
+class ProcessOffloader:
+    """
+    Worker-process pool for CPU-bound modules (OCR, model training/prediction, image work),
+    so they scale across cores instead of sharing the orchestrator's GIL.
+
+    Workers are started lazily on the first task and warmed with every module registered
+    through `add_module` at that point; modules added later are built on first use in each
+    worker. Module state therefore lives per worker: calls should not rely on state left
+    behind by an earlier call.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = "spawn"):
+        """
+        :param max_workers: Number of worker processes (defaults to the CPU count).
+        :param start_method: multiprocessing start method. "spawn" is the safe default for a
+                             process that already runs threads.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.logger = logging.getLogger("ProcessOffloader")
+        self.factories: Dict[str, Callable] = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def add_module(self, module_name: str, factory: Callable):
+        """
+        Register a CPU-bound module so workers preload it.
+
+        :raises ValueError: If the factory is not picklable.
+        """
+        ensure_picklable(module_name, factory)
+        with self._lock:
+            self.factories[module_name] = factory
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm_worker,
+                    initargs=(dict(self.factories),),
+                )
+                self.logger.info(
+                    f"Started {self.max_workers} worker process(es), preloading: "
+                    f"{', '.join(self.factories) or 'nothing'}."
+                )
+            return self._executor
+
+    def submit(self, envelope: TaskEnvelope) -> concurrent.futures.Future:
+        """
+        Run a task envelope in a worker process.
+        """
+        return self._get_executor().submit(run_envelope, envelope)
+
+    def run(self, envelope: TaskEnvelope):
+        """
+        Run a task envelope in a worker process and wait for its result.
+        """
+        return self.submit(envelope).result()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,272 @@
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+from operate.utils.metrics import REGISTRY
+
+HTTP_CACHE_LOOKUPS = REGISTRY.counter(
+    "aia_http_cache_lookups_total", "HTTP response cache lookups by outcome.", ("result",)
+)
+
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with the validators needed to revalidate it."""
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    ttl: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def validators(self) -> Dict[str, str]:
+        """Headers that turn a refetch into a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class HTTPCache:
+    """
+    Cache for GET responses with HTTP revalidation.
+
+    An entry is served without any request while it is fresh (younger than its endpoint's
+    TTL). Once stale, the caller refetches with If-None-Match / If-Modified-Since; a 304 Not
+    Modified refreshes the entry without transferring the body again.
+
+    Entries live in an in-memory LRU bounded by `max_bytes` of body. With `db_path`, entries
+    evicted from memory spill to a SQLite table (bounded by `max_disk_bytes`) and are promoted
+    back on their next use.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, default_ttl: float = 0,
+                 ttl_rules: Optional[Mapping[str, float]] = None, db_path: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024, clock: Callable[[], float] = time.time):
+        """
+        :param max_bytes: Body bytes kept in memory.
+        :param default_ttl: Freshness lifetime in seconds for URLs without a rule or a
+                            Cache-Control max-age (0 revalidates on every use).
+        :param ttl_rules: {pattern: seconds}; patterns are globs over host and path, e.g.
+                          "api.twitter.com/2/tweets*". The first matching pattern wins.
+        :param db_path: SQLite file for entries spilled from memory (None disables spilling).
+        :param max_disk_bytes: Body bytes kept on disk; the least recently used are dropped.
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = dict(ttl_rules or {})
+        self.max_disk_bytes = max_disk_bytes
+        self.clock = clock
+        self.logger = logging.getLogger("HTTPCache")
+        self.stats = {
+            "fresh_hits": 0, "revalidated": 0, "misses": 0, "disk_hits": 0,
+            "evictions": 0, "spills": 0, "bytes_saved": 0,
+        }
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_config(cls, config) -> "HTTPCache":
+        return cls(
+            max_bytes=config.HTTP_CACHE_MAX_BYTES,
+            default_ttl=config.HTTP_CACHE_DEFAULT_TTL_SECONDS,
+            ttl_rules=config.HTTP_CACHE_TTLS,
+            db_path=config.HTTP_CACHE_DB_PATH or None,
+            max_disk_bytes=config.HTTP_CACHE_DB_MAX_BYTES,
+        )
+
+    def _open_db(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS http_responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+            "stored_at REAL NOT NULL, ttl REAL NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS http_responses_accessed_at ON http_responses (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping] = None, vary: str = "") -> str:
+        """
+        Cache key for a GET of `url` with query `params`. `vary` holds anything else the
+        response depends on, such as the credentials it was fetched with.
+        """
+        material = {"url": url, "params": params or {}, "vary": vary}
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """
+        Freshness lifetime of a response from `url`: the first matching TTL rule, else the
+        server's Cache-Control max-age, else the default. None means it must not be stored.
+        """
+        cache_control = (headers or {}).get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return None
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        for pattern, ttl in self.ttl_rules.items():
+            if fnmatch.fnmatchcase(target, pattern):
+                return ttl
+        if "no-cache" in cache_control:
+            return 0
+        max_age = _MAX_AGE.search(cache_control)
+        return float(max_age.group(1)) if max_age else self.default_ttl
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.clock() - entry.stored_at < entry.ttl
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """
+        The entry for `key`, fresh or stale (check `is_fresh`), or None. A fresh entry is
+        counted as a hit; a stale one is expected to be revalidated by the caller.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                entry = self._load_disk(key)
+                if entry is not None:
+                    self.stats["disk_hits"] += 1
+                    self._store_memory(key, entry)
+            if entry is None:
+                self._count("miss", "misses")
+            elif self.clock() - entry.stored_at < entry.ttl:
+                self.stats["bytes_saved"] += entry.size
+                self._count("fresh", "fresh_hits")
+            return entry
+
+    def store(self, key: str, url: str, response) -> Optional[CachedResponse]:
+        """
+        Cache a 200 response to a GET of `url`, unless its headers forbid it.
+        """
+        if response.status_code != 200:
+            return None
+        ttl = self.ttl_for(url, response.headers)
+        if ttl is None:
+            return None
+        entry = CachedResponse(
+            url=url, body=response.content, etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"), stored_at=self.clock(), ttl=ttl,
+        )
+        if entry.etag is None and entry.last_modified is None and not ttl:
+            # Neither fresh for a while nor revalidatable: storing it would never pay off
+            return None
+        with self._lock:
+            self._store_memory(key, entry)
+        return entry
+
+    def revalidated(self, key: str, entry: CachedResponse, headers: Mapping[str, str]) -> CachedResponse:
+        """
+        Record a 304 Not Modified for `entry`: it is fresh again, with any validators the
+        server sent along.
+        """
+        ttl = self.ttl_for(entry.url, headers)
+        entry = CachedResponse(
+            url=entry.url, body=entry.body, etag=headers.get("ETag") or entry.etag,
+            last_modified=headers.get("Last-Modified") or entry.last_modified,
+            stored_at=self.clock(), ttl=entry.ttl if ttl is None else ttl,
+        )
+        with self._lock:
+            self.stats["bytes_saved"] += entry.size
+            self._count("revalidated", "revalidated")
+            self._store_memory(key, entry)
+        return entry
+
+    def _count(self, result: str, key: str):
+        self.stats[key] += 1
+        HTTP_CACHE_LOOKUPS.inc(result=result)
+
+    def _store_memory(self, key: str, entry: CachedResponse):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        if entry.size > self.max_bytes:
+            self._spill(key, entry)
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats["evictions"] += 1
+            self._spill(evicted_key, evicted)
+
+    def _spill(self, key: str, entry: CachedResponse):
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO http_responses "
+            "(key, url, body, etag, last_modified, stored_at, ttl, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.url, entry.body, entry.etag, entry.last_modified, entry.stored_at, entry.ttl, entry.size,
+             self.clock()),
+        )
+        # Keep the table bounded: drop the least recently used rows beyond the byte limit
+        self._db.execute(
+            "DELETE FROM http_responses WHERE key IN (SELECT key FROM ("
+            "SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS running FROM http_responses"
+            ") WHERE running > ?)",
+            (self.max_disk_bytes,),
+        )
+        self._db.commit()
+        self.stats["spills"] += 1
+
+    def _load_disk(self, key: str) -> Optional[CachedResponse]:
+        row = self._db.execute(
+            "SELECT url, body, etag, last_modified, stored_at, ttl FROM http_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute("DELETE FROM http_responses WHERE key = ?", (key,))
+        self._db.commit()
+        url, body, etag, last_modified, stored_at, ttl = row
+        return CachedResponse(url, bytes(body), etag, last_modified, stored_at, ttl)
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM http_responses")
+                self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,187 @@
+import logging
+import threading
+import weakref
+from collections import Counter
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from operate.utils.lazy_import import lazy_import
+from operate.utils.metrics import REGISTRY
+from operate.utils.rate_limit import RateLimiter
+from operate.utils.resilience import retry_after
+
+requests = lazy_import("requests")
+
+HTTP_REQUESTS = REGISTRY.counter("aia_http_requests_total", "Outbound HTTP requests by host.", ("host",))
+
+Timeout = Union[float, Tuple[float, float]]
+
+_clients = weakref.WeakSet()
+
+
+class HTTPClient:
+    """
+    The process-wide HTTP client: one requests Session with a keep-alive connection pool per
+    host, so repeated calls to an API reuse an open TCP/TLS connection instead of a new
+    handshake each time.
+
+    Mirrors the parts of the requests.Session API the modules use (request, get, post, ...),
+    adding a default timeout to every call, per-host rate limits and connection-reuse
+    statistics. Retries are left to operate.utils.resilience, so the pool itself never retries.
+    """
+
+    RATE_LIMIT_MODES = {None: None, "block": True, "fail": False}
+
+    def __init__(self, pool_connections: int = 16, pool_maxsize: int = 32, pool_block: bool = False,
+                 timeout: Optional[Timeout] = (5, 30), proxy_url: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        :param pool_connections: Number of hosts whose connection pools are kept.
+        :param pool_maxsize: Connections kept open per host; size it to the highest concurrency
+                             used against one host, or surplus connections are discarded
+                             after use ("connection pool is full").
+        :param pool_block: Wait for a free connection instead of opening a surplus one.
+        :param timeout: Default (connect, read) timeout in seconds for calls that pass none.
+        :param proxy_url: Route http and https traffic through this proxy.
+        :param rate_limiter: Per-host request limits applied to every call (none if omitted).
+        """
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.logger = logging.getLogger("HTTPClient")
+        self.session = requests.Session()
+        self.adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, max_retries=0,
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if proxy_url:
+            self.session.proxies.update({"http": proxy_url, "https": proxy_url})
+        self.requests_by_host = Counter()
+        self._retired = Counter()
+        self._lock = threading.Lock()
+        self._track_retired_pools(self.adapter.poolmanager)
+        _clients.add(self)
+
+    @classmethod
+    def from_config(cls, config) -> "HTTPClient":
+        return cls(
+            pool_connections=config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=config.HTTP_POOL_MAXSIZE,
+            pool_block=config.HTTP_POOL_BLOCK,
+            timeout=(config.HTTP_CONNECT_TIMEOUT_SECONDS, config.TIMEOUT_SECONDS),
+            proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None,
+            rate_limiter=RateLimiter.from_config(config),
+        )
+
+    def request(self, method: str, url: str, rate_limit: Union[str, bool, None] = None, **kwargs):
+        """
+        Send a request through the shared pools; `timeout` defaults to the client's.
+
+        :param rate_limit: How to apply the host's rate limit: "block" waits for it, "fail"
+                           raises RateLimitExceeded instead of waiting, None uses the
+                           limiter's mode and False skips it (for callers with their own budget).
+        :raises RateLimitExceeded: If the host's budget is spent and the call may not wait.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        limiter = self.rate_limiter if rate_limit is not False else None
+        if limiter is not None:
+            limiter.acquire(host, blocking=self.RATE_LIMIT_MODES[rate_limit])
+        with self._lock:
+            self.requests_by_host[host] += 1
+        HTTP_REQUESTS.inc(host=host)
+        response = self.session.request(method, url, **kwargs)
+        if limiter is not None:
+            if response.status_code == 429:
+                limiter.throttled(host, retry_after(response))
+            else:
+                limiter.succeeded(host)
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def _track_retired_pools(self, manager):
+        """Keep the counts of host pools evicted from `manager`, so stats stay cumulative."""
+        pools = manager.pools
+        dispose = pools.dispose_func
+
+        def retire(pool):
+            with self._lock:
+                self._retired["requests"] += pool.num_requests
+                self._retired["connections"] += pool.num_connections
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = retire
+
+    def _live_pools(self):
+        managers = [self.adapter.poolmanager] + list(self.adapter.proxy_manager.values())
+        for manager in managers:
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    yield pool
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Connection reuse so far: requests sent, connections opened, and requests served
+        over an already open connection.
+        """
+        with self._lock:
+            sent = self._retired["requests"]
+            opened = self._retired["connections"]
+        for pool in self._live_pools():
+            sent += pool.num_requests
+            opened += pool.num_connections
+        reused = max(sent - opened, 0)
+        return {
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_ratio": reused / sent if sent else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        lines = [
+            f"HTTP requests: {stats['requests']}, connections opened: {stats['connections_opened']}, "
+            f"reused: {stats['connections_reused']} ({stats['reuse_ratio']:.0%})"
+        ]
+        with self._lock:
+            by_host = self.requests_by_host.most_common()
+        rates = self.rate_limiter.rates() if self.rate_limiter is not None else {}
+        lines.extend(
+            f"  {host:<40}{count:>8}" + (f"   limit {rates[host]:.0f}/min" if host in rates else "")
+            for host, count in by_host
+        )
+        return "\n".join(lines)
+
+
+def _connection_stats():
+    totals = Counter()
+    for client in list(_clients):
+        stats = client.stats()
+        totals["opened"] += stats["connections_opened"]
+        totals["reused"] += stats["connections_reused"]
+    return dict(totals)
+
+
+REGISTRY.gauge(
+    "aia_http_connections", "Outbound HTTP connections opened, and requests that reused one.", ("state",),
+    function=_connection_stats,
+)
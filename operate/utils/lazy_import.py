@@ -0,0 +1,86 @@
+import importlib
+import logging
+import sys
+import threading
+import time
+import types
+
+
+_import_lock = threading.RLock()
+_import_times = {}
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module that is imported the first time one of its attributes is used.
+    Attribute reads, writes and deletes are forwarded to the real module once it is loaded,
+    so `mock.patch("modules.chatbot.openai.ChatCompletion")` keeps working.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is not None:
+            return module
+
+        with _import_lock:
+            module = self.__dict__["_lazy_target"]
+            if module is None:
+                start_time = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                _import_times[self.__name__] = time.perf_counter() - start_time
+                self.__dict__["_lazy_target"] = module
+                logging.getLogger("LazyImport").debug(
+                    f"Deferred import of '{self.__name__}' took {_import_times[self.__name__]:.3f}s."
+                )
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __delattr__(self, attribute):
+        delattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str):
+    """
+    Return a module proxy that defers `import name` until the module is first used.
+    Modules that are already imported are returned as-is.
+
+    :param name: Fully qualified module name (e.g. 'sklearn.ensemble').
+    :return: The module, or a LazyModule standing in for it.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(module) -> bool:
+    """
+    Check whether a (possibly lazy) module has actually been imported.
+    """
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_target"] is not None
+    return True
+
+
+def import_times() -> dict:
+    """
+    Time spent (in seconds) materializing each deferred import so far.
+    """
+    with _import_lock:
+        return dict(_import_times)
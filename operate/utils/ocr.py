@@ -1,7 +1,9 @@
-import pytesseract
-from PIL import Image
 import os
-from modules.error_handling import ErrorHandling
+from modules.error_handling import ErrorLogger
+from operate.utils.lazy_import import lazy_import
+
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
 
 
 class OCRUtility:
@@ -14,7 +16,7 @@ class OCRUtility:
         Initialize the OCR Utility with optional Tesseract binary path.
         :param tess_path: Path to the Tesseract binary (if not in system PATH).
         """
-        self.error_handler = ErrorHandling()
+        self.error_handler = ErrorLogger()
         if tess_path:
             pytesseract.pytesseract.tesseract_cmd = tess_path
         print(f"Tesseract Path: {pytesseract.pytesseract.tesseract_cmd}")
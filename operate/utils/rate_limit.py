@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from operate.utils.metrics import REGISTRY
+
+RATE_LIMIT_WAITS = REGISTRY.counter(
+    "aia_rate_limit_waits_total", "Requests delayed by a client-side rate limit.", ("key",)
+)
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    "aia_rate_limit_rejections_total", "Requests refused by a client-side rate limit in fail-fast mode.", ("key",)
+)
+RATE_LIMIT_THROTTLED = REGISTRY.counter(
+    "aia_rate_limit_throttled_total", "429 Too Many Requests responses received.", ("key",)
+)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised by a fail-fast acquire when the request would have to wait for its rate limit."""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(f"Rate limit for '{key}' reached; next request allowed in {retry_in:.1f}s.")
+        self.key = key
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate` tokens per second, up to
+    `capacity`.
+
+    A blocking acquire reserves its tokens immediately (the balance may go negative) and then
+    sleeps off the deficit, so concurrent callers are served in arrival order and never spin.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        :param rate: Tokens added per second.
+        :param capacity: Maximum balance, i.e. the largest burst (defaults to one second of refill).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float, **kwargs) -> "TokenBucket":
+        """Bucket enforcing `limit` per minute, allowing the whole minute's budget as a burst."""
+        return cls(limit / 60.0, capacity=limit, **kwargs)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take `amount` tokens, waiting for them if needed. Amounts above the capacity are
+        clamped to it, so a single large request can always proceed eventually.
+
+        :param blocking: If False, return immediately when the tokens are not available.
+        :param timeout: Longest acceptable wait in seconds when blocking.
+        :return: True if the tokens were taken.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return True
+            wait = (amount - self.tokens) / self.rate
+            if not blocking or (timeout is not None and wait > timeout):
+                return False
+            self.tokens -= amount
+        self.sleep(wait)
+        return True
+
+    def penalize(self, seconds: float):
+        """
+        Drain the bucket so nothing passes for about `seconds`, e.g. after the server answered
+        429 Too Many Requests.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def wait_time(self, amount: float = 1) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        with self._lock:
+            self._refill()
+            return max(min(amount, self.capacity) - self.tokens, 0) / self.rate
+
+    def set_rate(self, rate: float):
+        """Change the refill rate from now on; tokens already earned are kept."""
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+
+class RequestBudget:
+    """
+    Requests-per-minute and tokens-per-minute limits of a model API, enforced together.
+    A limit of 0 disables that dimension.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, **bucket_kwargs):
+        self.requests = TokenBucket.per_minute(requests_per_minute, **bucket_kwargs) if requests_per_minute else None
+        self.tokens = TokenBucket.per_minute(tokens_per_minute, **bucket_kwargs) if tokens_per_minute else None
+
+    def acquire(self, tokens: float = 0):
+        """
+        Block until one request using `tokens` tokens fits in both budgets.
+        """
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None and tokens:
+            self.tokens.acquire(tokens)
+
+
+class RateLimiter:
+    """
+    Per-key (host or service) request-rate limits shared by every caller in the process.
+
+    Each key gets a requests-per-minute token bucket: `default_per_minute`, or its entry in
+    `per_minute`. Limits adapt to the server: a 429 drains the key's bucket for the
+    Retry-After period and halves its rate (down to `min_fraction` of the configured limit);
+    each successful request then restores a little of it (additive increase, multiplicative
+    decrease).
+    """
+
+    def __init__(self, default_per_minute: float = 0, per_minute: Optional[Dict[str, float]] = None,
+                 blocking: bool = True, min_fraction: float = 0.1, recovery_fraction: float = 0.05,
+                 throttle_seconds: float = 1.0, **bucket_kwargs):
+        """
+        :param default_per_minute: Limit for keys without their own (0 leaves them unlimited).
+        :param per_minute: Limits of specific keys, e.g. {"api.openai.com": 500}.
+        :param blocking: Default mode: wait for the limit (True) or raise RateLimitExceeded.
+        :param throttle_seconds: Pause after a 429 that carried no Retry-After.
+        """
+        self.default_per_minute = default_per_minute
+        self.per_minute = dict(per_minute or {})
+        self.blocking = blocking
+        self.min_fraction = min_fraction
+        self.recovery_fraction = recovery_fraction
+        self.throttle_seconds = throttle_seconds
+        self.bucket_kwargs = bucket_kwargs
+        self.logger = logging.getLogger("RateLimiter")
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "RateLimiter":
+        return cls(config.API_RATE_LIMIT, config.API_RATE_LIMITS, blocking=config.API_RATE_LIMIT_MODE == "block")
+
+    def limit(self, key: str) -> float:
+        """Configured requests per minute for `key` (0 means unlimited)."""
+        return self.per_minute.get(key, self.default_per_minute)
+
+    def bucket(self, key: str) -> Optional[TokenBucket]:
+        """The bucket of `key`, or None if the key is unlimited."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                limit = self.limit(key)
+                if not limit:
+                    return None
+                bucket = self._buckets[key] = TokenBucket.per_minute(limit, **self.bucket_kwargs)
+            return bucket
+
+    def acquire(self, key: str, blocking: Optional[bool] = None, timeout: Optional[float] = None):
+        """
+        Take one request from the budget of `key`.
+
+        :param blocking: Wait for the budget (True) or fail fast (False); defaults to the
+                         limiter's mode.
+        :param timeout: When blocking, fail instead of waiting longer than this.
+        :raises RateLimitExceeded: If the request cannot go now (fail-fast) or within `timeout`.
+        """
+        bucket = self.bucket(key)
+        if bucket is None:
+            return
+        blocking = self.blocking if blocking is None else blocking
+        if bucket.acquire(1, blocking=False):
+            return
+        if blocking and bucket.acquire(1, blocking=True, timeout=timeout):
+            RATE_LIMIT_WAITS.inc(key=key)
+            return
+        RATE_LIMIT_REJECTIONS.inc(key=key)
+        raise RateLimitExceeded(key, bucket.wait_time())
+
+    def throttled(self, key: str, retry_after: Optional[float] = None):
+        """
+        Record a 429 from `key`: pause it for `retry_after` seconds and halve its rate.
+        """
+        RATE_LIMIT_THROTTLED.inc(key=key)
+        bucket = self.bucket(key)
+        if bucket is None:
+            return
+        floor = self.limit(key) / 60.0 * self.min_fraction
+        bucket.set_rate(max(bucket.rate / 2, floor))
+        bucket.penalize(self.throttle_seconds if retry_after is None else retry_after)
+        self.logger.warning(f"'{key}' answered 429; limit lowered to {bucket.rate * 60:.0f} requests/minute.")
+
+    def succeeded(self, key: str):
+        """Record a successful request, restoring part of a lowered rate."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        configured = self.limit(key) / 60.0
+        if bucket.rate < configured:
+            bucket.set_rate(min(configured, bucket.rate + configured * self.recovery_fraction))
+
+    def rates(self) -> Dict[str, float]:
+        """Current requests-per-minute limit of every key seen so far."""
+        with self._lock:
+            return {key: bucket.rate * 60 for key, bucket in self._buckets.items()}
@@ -0,0 +1,304 @@
+import email.utils
+import logging
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from operate.utils.metrics import REGISTRY
+
+RETRIES = REGISTRY.counter("aia_outbound_retries_total", "Outbound calls retried after a failure.", ("service",))
+FAILURES = REGISTRY.counter(
+    "aia_outbound_failures_total", "Outbound calls that failed after all attempts.", ("service",)
+)
+REJECTIONS = REGISTRY.counter(
+    "aia_circuit_rejections_total", "Outbound calls refused because the service's circuit was open.", ("service",)
+)
+
+# Statuses worth retrying: timeouts, rate limiting and server-side failures
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Client library errors without an HTTP status that still indicate a transient failure
+RETRYABLE_ERROR_NAMES = frozenset({
+    "Timeout", "APIConnectionError", "ServiceUnavailableError", "RateLimitError", "TryAgain", "APITimeoutError",
+})
+# Methods whose requests can be repeated without repeating their effect
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# requests/urllib3 errors raised before a connection was made, i.e. before anything was sent
+CONNECT_ERROR_NAMES = frozenset({"ConnectTimeout", "NewConnectionError", "NameResolutionError"})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+    def __init__(self, service: str, retry_in: float):
+        super().__init__(f"Service '{service}' is unavailable; retrying in {retry_in:.0f}s.")
+        self.service = service
+        self.retry_in = retry_in
+
+
+def status_of(error: BaseException) -> Optional[int]:
+    """HTTP status carried by a requests or openai exception, if any."""
+    for candidate in (error, getattr(error, "response", None)):
+        for attribute in ("status_code", "http_status", "status"):
+            status = getattr(candidate, attribute, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Transient failures (network errors, timeouts, 429 and 5xx) are retried; client errors
+    such as 400/401/404 are not, since repeating the request cannot fix them.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = status_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    # requests' ConnectionError/Timeout derive from OSError, as do socket errors
+    return isinstance(error, (OSError, TimeoutError))
+
+
+def is_connect_error(error: BaseException) -> bool:
+    """
+    Whether the request failed while connecting, so the server never saw it. Follows the
+    wrapped causes, since requests reports a refused connection as a ConnectionError around
+    urllib3's NewConnectionError.
+    """
+    pending, seen = [error], set()
+    while pending:
+        candidate = pending.pop()
+        if id(candidate) in seen:
+            continue
+        seen.add(id(candidate))
+        if isinstance(candidate, (ConnectionRefusedError, socket.gaierror)):
+            return True
+        if type(candidate).__name__ in CONNECT_ERROR_NAMES:
+            return True
+        causes = [candidate.__cause__, candidate.__context__, getattr(candidate, "reason", None), *candidate.args]
+        pending.extend(cause for cause in causes if isinstance(cause, BaseException))
+    return False
+
+
+def may_resend(error: BaseException, method: str) -> bool:
+    """
+    Whether a request made with `method` may be sent again after the transient `error`.
+    Idempotent methods always may. A POST or PATCH may have taken effect even though it
+    timed out or failed with a 5xx, so it is only resent when it never reached the server,
+    or when the server answered 429/503 with a Retry-After, i.e. it declined to process it.
+    """
+    if method.upper() in IDEMPOTENT_METHODS or is_connect_error(error):
+        return True
+    return status_of(error) in (429, 503) and retry_after(error) is not None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Seconds the server asked us to wait (Retry-After header of an HTTP error or response),
+    if it said so.
+    """
+    for candidate in (getattr(error, "response", None), error):
+        headers = getattr(candidate, "headers", None)
+        if not headers:
+            continue
+        try:
+            value = headers.get("Retry-After")
+        except AttributeError:
+            continue
+        if value is None:
+            continue
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            parsed = email.utils.parsedate_to_datetime(value)
+            if parsed is not None:
+                return max(parsed.timestamp() - time.time(), 0.0)
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in
+    [0, min(max_delay, base_delay * 2**n)], or the server's Retry-After if longer.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1 (1 disables retries).")
+
+    def delay(self, attempt: int, server_delay: Optional[float] = None, rng: random.Random = random) -> float:
+        backoff = rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if server_delay is not None:
+            return min(max(backoff, server_delay), max(self.max_delay, server_delay))
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    Per-service circuit breaker.
+
+    closed:    calls flow; `failure_threshold` consecutive failures open the circuit
+    open:      calls fail fast with CircuitOpenError for `reset_timeout` seconds
+    half_open: one probe call is let through; success closes the circuit, failure reopens it
+    """
+
+    STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+    def __init__(self, service: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.logger = logging.getLogger("CircuitBreaker")
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        :raises CircuitOpenError: While the circuit is open (or its probe is in flight).
+        """
+        with self._lock:
+            if self.state == "open":
+                remaining = self._opened_at + self.reset_timeout - self.clock()
+                if remaining > 0:
+                    raise CircuitOpenError(self.service, remaining)
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.service, self.reset_timeout)
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                self.logger.info(f"Circuit for '{self.service}' closed; service recovered.")
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.logger.warning(
+                        f"Circuit for '{self.service}' opened after {self.failures} failure(s); "
+                        f"failing fast for {self.reset_timeout:.0f}s."
+                    )
+                self.state = "open"
+                self._opened_at = self.clock()
+                self._probe_in_flight = False
+
+    def release_probe(self):
+        """Give up a half-open probe slot without a verdict (e.g. the call hit a client error)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class Resilience:
+    """
+    Timeout, retries and circuit breaker for calls to one outbound service.
+    `timeout` is not enforced here; callers pass it to their HTTP client.
+    """
+
+    def __init__(self, service: str, timeout: float = 30.0, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, sleep: Callable[[float], None] = time.sleep):
+        self.service = service
+        self.timeout = timeout
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(service)
+        self.sleep = sleep
+        self.logger = logging.getLogger("Resilience")
+
+    def call(self, function: Callable, *args, **kwargs):
+        """
+        Call `function(*args, **kwargs)`, retrying transient failures with backoff.
+
+        :raises CircuitOpenError: If the service's circuit is open.
+        :raises Exception: The last error once attempts are exhausted, or any non-retryable error.
+        """
+        return self._call(None, function, args, kwargs)
+
+    def call_http(self, method: str, function: Callable, *args, **kwargs):
+        """
+        Like call, for a function that sends one HTTP request with `method`. Requests that are
+        not idempotent (POST, PATCH) are only retried when may_resend allows it, so a POST
+        that timed out is not sent twice.
+        """
+        return self._call(method, function, args, kwargs)
+
+    def _call(self, method: Optional[str], function: Callable, args: tuple, kwargs: dict):
+        for attempt in range(self.policy.max_attempts):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                REJECTIONS.inc(service=self.service)
+                raise
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.release_probe()
+                    raise
+                self.breaker.record_failure()
+                last_attempt = attempt + 1 >= self.policy.max_attempts or self.breaker.state == "open"
+                if last_attempt or (method is not None and not may_resend(e, method)):
+                    FAILURES.inc(service=self.service)
+                    raise
+                delay = self.policy.delay(attempt, retry_after(e))
+                RETRIES.inc(service=self.service)
+                self.logger.warning(
+                    f"Call to '{self.service}' failed ({e}); retry {attempt + 1}/{self.policy.max_attempts - 1} "
+                    f"in {delay:.2f}s."
+                )
+                self.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+
+_services: Dict[str, Resilience] = {}
+_services_lock = threading.Lock()
+
+
+def service_timeout(config, service: str) -> float:
+    """Timeout for `service` from Config.SERVICE_TIMEOUTS, falling back to Config.TIMEOUT_SECONDS."""
+    return float(config.SERVICE_TIMEOUTS.get(service, config.TIMEOUT_SECONDS))
+
+
+def for_service(service: str, config=None) -> Resilience:
+    """
+    The process-wide Resilience of `service`, so every module calling it shares one circuit.
+    """
+    with _services_lock:
+        resilience = _services.get(service)
+        if resilience is None:
+            if config is None:
+                from config.settings import Config as config
+            resilience = _services[service] = Resilience(
+                service,
+                timeout=service_timeout(config, service),
+                policy=RetryPolicy(config.RETRY_MAX_ATTEMPTS, config.RETRY_BASE_DELAY_SECONDS,
+                                   config.RETRY_MAX_DELAY_SECONDS),
+                breaker=CircuitBreaker(service, config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_SECONDS),
+            )
+        return resilience
+
+
+REGISTRY.gauge(
+    "aia_circuit_state", "Circuit breaker state per service (0 closed, 1 half-open, 2 open).", ("service",),
+    function=lambda: {name: CircuitBreaker.STATES[item.breaker.state] for name, item in list(_services.items())},
+)
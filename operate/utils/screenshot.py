@@ -1,7 +1,9 @@
-import pyautogui
 from datetime import datetime
 import os
 from modules.error_handling import ErrorHandling
+from operate.utils.lazy_import import lazy_import
+
+pyautogui = lazy_import("pyautogui")
 
 
 class ScreenshotUtility:
@@ -0,0 +1,243 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+from operate.utils.lazy_import import lazy_import
+from operate.utils.metrics import REGISTRY
+
+psutil = lazy_import("psutil")
+
+
+@dataclass
+class SharedHandle:
+    """
+    One shared resource. `size_bytes` is the process RSS growth measured while it was
+    built (None if psutil is unavailable), i.e. roughly what each extra copy would cost.
+    """
+    key: str
+    value: object
+    build_seconds: float
+    size_bytes: Optional[int]
+    refcount: int = 0
+    peak_refcount: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        return None
+
+
+class ResourceManager:
+    """
+    Process-wide, reference-counted pool of heavyweight handles (TTS engine, microphone,
+    tokenizer, HTTP session, loaded models).
+
+    Modules `acquire` a handle by key instead of constructing their own: the first acquire
+    builds it with the registered factory, later ones return the same object and bump its
+    reference count. `release` drops a reference; the last one closes and forgets the handle.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("ResourceManager")
+        self.factories: Dict[str, Callable[[], object]] = {}
+        self.closers: Dict[str, Callable[[object], None]] = {}
+        self.handles: Dict[str, SharedHandle] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def register(self, key: str, factory: Callable[[], object], close: Optional[Callable[[object], None]] = None):
+        """
+        Register how to build (and optionally close) the resource shared under `key`.
+        Re-registering only affects handles built afterwards.
+        """
+        with self._lock:
+            self.factories[key] = factory
+            if close is not None:
+                self.closers[key] = close
+            self._build_locks.setdefault(key, threading.Lock())
+
+    def acquire(self, key: str, factory: Optional[Callable[[], object]] = None):
+        """
+        Borrow the resource shared under `key`, building it on first use.
+
+        :param factory: Used (and registered) if no factory is registered for `key` yet.
+        :raises KeyError: If `key` has no factory.
+        """
+        with self._lock:
+            if key not in self.factories:
+                if factory is None:
+                    raise KeyError(f"No shared resource registered under '{key}'.")
+                self.factories[key] = factory
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+            # Look up and take the reference in one step, so a concurrent last release
+            # cannot close the handle in between
+            handle = self._take(key)
+            if handle is not None:
+                return handle.value
+
+        # Build outside the registry lock so a slow model load does not block other keys
+        with build_lock:
+            with self._lock:
+                handle = self._take(key)
+                if handle is not None:
+                    return handle.value
+            rss_before = _rss_bytes()
+            start_time = time.perf_counter()
+            value = self.factories[key]()
+            build_seconds = time.perf_counter() - start_time
+            rss_after = _rss_bytes()
+            size_bytes = None if rss_before is None or rss_after is None else max(rss_after - rss_before, 0)
+            handle = SharedHandle(key, value, build_seconds, size_bytes)
+            self.logger.info(f"Built shared resource '{key}' in {build_seconds:.3f}s.")
+            with self._lock:
+                self.handles[key] = handle
+                return self._take(key).value
+
+    def _take(self, key: str) -> Optional[SharedHandle]:
+        """Add a reference to the loaded handle under `key`, if any. Call with `_lock` held."""
+        handle = self.handles.get(key)
+        if handle is not None:
+            handle.refcount += 1
+            handle.peak_refcount = max(handle.peak_refcount, handle.refcount)
+        return handle
+
+    def release(self, key: str):
+        """
+        Return a borrowed resource. The last release closes it.
+        """
+        with self._lock:
+            handle = self.handles.get(key)
+            if handle is None:
+                return
+            handle.refcount -= 1
+            if handle.refcount > 0:
+                return
+            del self.handles[key]
+            close = self.closers.get(key)
+        if close is not None:
+            try:
+                close(handle.value)
+            except Exception:
+                self.logger.error(f"Failed to close shared resource '{key}'.", exc_info=True)
+        self.logger.info(f"Released shared resource '{key}'.")
+
+    @contextmanager
+    def borrow(self, key: str, factory: Optional[Callable[[], object]] = None):
+        """
+        Borrow a resource for the duration of a `with` block.
+        """
+        value = self.acquire(key, factory)
+        try:
+            yield value
+        finally:
+            self.release(key)
+
+    def peek(self, key: str):
+        """
+        The resource shared under `key` if it is loaded, else None. Takes no reference and
+        never builds it, so the caller must not keep it.
+        """
+        with self._lock:
+            handle = self.handles.get(key)
+            return handle.value if handle else None
+
+    def refcount(self, key: str) -> int:
+        with self._lock:
+            handle = self.handles.get(key)
+            return handle.refcount if handle else 0
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self.handles
+
+    def close_all(self):
+        """
+        Close every handle regardless of outstanding references (used on shutdown).
+        """
+        with self._lock:
+            keys = list(self.handles)
+        for key in keys:
+            with self._lock:
+                handle = self.handles.get(key)
+                if handle is None:
+                    continue
+                handle.refcount = 1
+            self.release(key)
+
+    def memory_report(self) -> str:
+        """
+        Per-handle memory and the savings from sharing it: each borrower beyond the first
+        would otherwise have built its own copy.
+        """
+        with self._lock:
+            handles = sorted(self.handles.values(), key=lambda handle: handle.key)
+        if not handles:
+            return "No shared resources loaded."
+        mib = 1024 * 1024
+        lines = [f"{'Resource':<24}{'Refs':>6}{'Peak':>6}{'Size MiB':>10}{'Saved MiB':>11}{'Build s':>9}"]
+        total_saved = 0
+        for handle in handles:
+            if handle.size_bytes is None:
+                size, saved = "n/a", "n/a"
+            else:
+                saved_bytes = handle.size_bytes * max(handle.peak_refcount - 1, 0)
+                total_saved += saved_bytes
+                size, saved = f"{handle.size_bytes / mib:.1f}", f"{saved_bytes / mib:.1f}"
+            lines.append(
+                f"{handle.key:<24}{handle.refcount:>6}{handle.peak_refcount:>6}{size:>10}{saved:>11}"
+                f"{handle.build_seconds:>9.3f}"
+            )
+        lines.append(f"Total saved by sharing: {total_saved / mib:.1f} MiB")
+        return "\n".join(lines)
+
+
+def _build_tts_engine():
+    return lazy_import("pyttsx3").init()
+
+
+def _build_microphone():
+    return lazy_import("speech_recognition").Microphone()
+
+
+def _build_gpt2_tokenizer():
+    return lazy_import("transformers").GPT2TokenizerFast.from_pretrained("gpt2")
+
+
+def _build_http_session():
+    from config.settings import Config
+    from operate.utils.http_client import HTTPClient
+    return HTTPClient.from_config(Config)
+
+
+def load_model(model_path: str):
+    """
+    Borrow a model saved with joblib, shared by every module loading the same file.
+    Pair with `RESOURCES.release(model_key(model_path))`.
+
+    The shared model is read-only: use it for prediction, and copy it before anything that
+    mutates it (fit, partial_fit, set_params), or every other borrower changes with it.
+    """
+    return RESOURCES.acquire(model_key(model_path), lambda: lazy_import("joblib").load(model_path))
+
+
+def model_key(model_path: str) -> str:
+    return f"model:{os.path.abspath(model_path)}"
+
+
+# Shared pool used by the modules
+RESOURCES = ResourceManager()
+RESOURCES.register("tts_engine", _build_tts_engine, close=lambda engine: engine.stop())
+RESOURCES.register("microphone", _build_microphone)
+RESOURCES.register("gpt2_tokenizer", _build_gpt2_tokenizer)
+RESOURCES.register("http_session", _build_http_session, close=lambda session: session.close())
+
+REGISTRY.gauge(
+    "aia_shared_resource_refs", "Outstanding references to shared resources.", ("resource",),
+    function=lambda: {key: handle.refcount for key, handle in list(RESOURCES.handles.items())},
+)
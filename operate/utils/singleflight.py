@@ -0,0 +1,75 @@
+import copy
+import threading
+from typing import Callable, Dict, Hashable
+from operate.utils.metrics import REGISTRY
+
+FLIGHT_CALLS = REGISTRY.counter(
+    "aia_singleflight_calls_total", "Calls made through a single-flight group.", ("group",)
+)
+FLIGHT_SAVED_CALLS = REGISTRY.counter(
+    "aia_singleflight_saved_calls_total", "Calls answered by joining an identical call already in flight.", ("group",)
+)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in flight, further calls
+    for the same key wait for it and receive its result (or exception) instead of making
+    their own. Nothing is remembered once the call completes; that is the caches' job.
+    """
+
+    def __init__(self, name: str, copy_result: bool = False):
+        """
+        :param name: Group name used in metrics.
+        :param copy_result: Give joiners a deep copy of the result, for mutable results
+                            such as decoded JSON.
+        """
+        self.name = name
+        self.copy_result = copy_result
+        self.stats = {"calls": 0, "saved": 0}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable, *args, **kwargs):
+        """
+        Run `function(*args, **kwargs)` unless an identical call (same key) is in flight,
+        in which case wait for that one.
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats["saved"] += 1
+        FLIGHT_CALLS.inc(group=self.name)
+
+        if not leader:
+            FLIGHT_SAVED_CALLS.inc(group=self.name)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result) if self.copy_result else flight.result
+
+        try:
+            flight.result = function(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
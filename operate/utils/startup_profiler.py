@@ -0,0 +1,88 @@
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+
+# Line format written by `python -X importtime`:
+#   import time:       412 |       1536 |   encodings
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class ImportTiming:
+    """Import cost of a single module, as reported by `-X importtime`."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_import_time(module_name: str = "main") -> List[ImportTiming]:
+    """
+    Import `module_name` in a fresh interpreter and collect per-module import times.
+
+    :param module_name: Module to import (defaults to the AIA entry point).
+    :return: One ImportTiming per imported module, in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module_name}' failed:\n{result.stderr[-2000:]}")
+    return parse_import_times(result.stderr)
+
+
+def parse_import_times(output: str) -> List[ImportTiming]:
+    """
+    Parse the stderr output of `python -X importtime`.
+    """
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # The first nesting level is indented by one space, each further level by two
+            depth = max(len(indent) - 1, 0) // 2
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def total_import_time(timings: List[ImportTiming], module_name: str = "main") -> float:
+    """
+    Total time (in seconds) spent importing `module_name`, including everything it pulled in.
+    """
+    for timing in reversed(timings):
+        if timing.module == module_name and timing.depth == 0:
+            return timing.cumulative_us / 1_000_000
+    return sum(timing.self_us for timing in timings) / 1_000_000
+
+
+def format_report(timings: List[ImportTiming], limit: int = 25, module_name: str = "main") -> str:
+    """
+    Build a ranked import-time breakdown, slowest modules (by cumulative time) first.
+    """
+    ranked = sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:limit]
+    lines = [f"{'cumulative (ms)':>16} {'self (ms)':>10}  module"]
+    for timing in ranked:
+        lines.append(
+            f"{timing.cumulative_us / 1000:16.1f} {timing.self_us / 1000:10.1f}  "
+            f"{'  ' * timing.depth}{timing.module}"
+        )
+    lines.append(f"Total startup import time: {total_import_time(timings, module_name) * 1000:.1f} ms "
+                 f"across {len(timings)} modules")
+    return "\n".join(lines)
+
+
+def profile_startup(module_name: str = "main", limit: int = 25) -> str:
+    """
+    Measure and format the import-time breakdown of the AIA entry point.
+    """
+    return format_report(measure_import_time(module_name), limit=limit, module_name=module_name)
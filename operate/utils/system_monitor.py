@@ -0,0 +1,194 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from operate.utils.lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
+
+
+@dataclass
+class Sample:
+    """
+    One reading of the process' resource usage.
+    In downsampled history, cpu_percent is the average and the other fields the maximum
+    over the aggregated window.
+    """
+    timestamp: float
+    cpu_percent: float
+    rss_bytes: int
+    threads: int
+    open_fds: int
+    queue_depths: Dict[str, int] = field(default_factory=dict)
+
+
+class SystemSampler:
+    """
+    Background sampler for CPU, RSS, thread count, open file descriptors and per-module
+    queue depths of the running assistant.
+
+    Raw samples go into a fixed-size ring buffer. Every `downsample_every` raw samples are
+    also folded into one aggregated sample in a second, longer ring buffer, so resource
+    growth stays visible over long sessions with bounded memory. Each sample is a handful
+    of psutil reads on the current process, taken from a single daemon thread.
+    """
+
+    def __init__(self, interval: float = 2.0, capacity: int = 300, downsample_every: int = 30,
+                 history_capacity: int = 720):
+        """
+        :param interval: Seconds between samples.
+        :param capacity: Number of raw samples kept.
+        :param downsample_every: Raw samples aggregated into one history sample.
+        :param history_capacity: Number of downsampled samples kept.
+        """
+        self.interval = interval
+        self.downsample_every = downsample_every
+        self.samples = deque(maxlen=capacity)
+        self.history = deque(maxlen=history_capacity)
+        self.logger = logging.getLogger("SystemSampler")
+        self._queue_sources: Dict[str, Callable[[], object]] = {}
+        self._pending: List[Sample] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._process = None
+
+    def register_queue(self, name: str, depth: Callable[[], object]):
+        """
+        Track a queue depth. `depth` returns either an int or a {name: int} mapping
+        (e.g. ExecutionEngine.queue_depths), which is recorded under `name.<key>`.
+        """
+        with self._lock:
+            self._queue_sources[name] = depth
+
+    def _read_queue_depths(self) -> Dict[str, int]:
+        with self._lock:
+            sources = list(self._queue_sources.items())
+        depths = {}
+        for name, depth in sources:
+            try:
+                value = depth()
+            except Exception:
+                continue
+            if isinstance(value, dict):
+                for key, sub_value in value.items():
+                    depths[f"{name}.{key}"] = int(sub_value)
+            else:
+                depths[name] = int(value)
+        return depths
+
+    def sample(self) -> Sample:
+        """
+        Take one sample now and record it.
+        """
+        if self._process is None:
+            self._process = psutil.Process(os.getpid())
+            self._process.cpu_percent(None)  # First call only primes the CPU counter
+        process = self._process
+        with process.oneshot():
+            cpu_percent = process.cpu_percent(None)
+            rss_bytes = process.memory_info().rss
+            threads = process.num_threads()
+            open_fds = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+        current = Sample(time.time(), cpu_percent, rss_bytes, threads, open_fds, self._read_queue_depths())
+
+        with self._lock:
+            self.samples.append(current)
+            self._pending.append(current)
+            if len(self._pending) >= self.downsample_every:
+                self.history.append(self._aggregate(self._pending))
+                self._pending = []
+        return current
+
+    @staticmethod
+    def _aggregate(samples: List[Sample]) -> Sample:
+        queue_names = {name for sample in samples for name in sample.queue_depths}
+        return Sample(
+            timestamp=samples[-1].timestamp,
+            cpu_percent=sum(sample.cpu_percent for sample in samples) / len(samples),
+            rss_bytes=max(sample.rss_bytes for sample in samples),
+            threads=max(sample.threads for sample in samples),
+            open_fds=max(sample.open_fds for sample in samples),
+            queue_depths={
+                name: max(sample.queue_depths.get(name, 0) for sample in samples) for name in queue_names
+            },
+        )
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception:
+                self.logger.error("Failed to sample system metrics.", exc_info=True)
+            self._stop_event.wait(self.interval)
+
+    def start(self) -> bool:
+        """
+        Start sampling in the background.
+
+        :return: False if psutil is unavailable and sampling could not start.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        try:
+            psutil.Process
+        except ImportError:
+            self.logger.warning("psutil is not installed; system metrics are disabled.")
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SystemSampler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"System sampler started (every {self.interval}s).")
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def latest(self) -> Optional[Sample]:
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def recent(self, count: Optional[int] = None) -> List[Sample]:
+        with self._lock:
+            samples = list(self.samples)
+        return samples[-count:] if count else samples
+
+    def long_history(self) -> List[Sample]:
+        with self._lock:
+            return list(self.history)
+
+    def format_summary(self) -> str:
+        """
+        Human-readable summary of current usage and its growth, for the REPL.
+        """
+        recent = self.recent()
+        if not recent:
+            return "No system metrics sampled yet."
+        latest = recent[-1]
+        mib = 1024 * 1024
+        lines = [
+            f"CPU:        {latest.cpu_percent:6.1f}% (avg {sum(s.cpu_percent for s in recent) / len(recent):.1f}% "
+            f"over last {len(recent)} samples)",
+            f"RSS:        {latest.rss_bytes / mib:8.1f} MiB (min {min(s.rss_bytes for s in recent) / mib:.1f}, "
+            f"max {max(s.rss_bytes for s in recent) / mib:.1f})",
+            f"Threads:    {latest.threads:6d}",
+            f"Open FDs:   {latest.open_fds:6d}",
+        ]
+        history = self.long_history()
+        if len(history) >= 2:
+            elapsed_minutes = max((history[-1].timestamp - history[0].timestamp) / 60, 1e-9)
+            growth = (history[-1].rss_bytes - history[0].rss_bytes) / mib
+            lines.append(
+                f"RSS growth: {growth:+.1f} MiB over {elapsed_minutes:.1f} min "
+                f"({growth / elapsed_minutes:+.2f} MiB/min), threads {history[0].threads} -> {history[-1].threads}"
+            )
+        if latest.queue_depths:
+            depths = ", ".join(f"{name}={depth}" for name, depth in sorted(latest.queue_depths.items()))
+            lines.append(f"Queues:     {depths}")
+        return "\n".join(lines)
@@ -0,0 +1,291 @@
+"""
+Offline stand-in for an OpenAI-compatible chat-completions server.
+
+Answers POST /v1/chat/completions (plain and `stream: true`) with synthetic text, with
+configurable latency, token rate and injected errors, so the chat path can be load-tested
+and benchmarked without network access or API keys. GET /data/2.5/weather?q=<city> answers
+like OpenWeatherMap's current-weather endpoint, for benchmarking the weather service.
+
+Usage (from the repository root):
+    python -m services.standin_server [--port 8089] [--latency-ms 300] [--latency-dist lognormal]
+                                      [--tokens-per-second 50] [--error-rate 0.02]
+then point the assistant at it with LLM_BACKEND=http LLM_BASE_URL=http://127.0.0.1:8089/v1
+(and WEATHER_API_URL=http://127.0.0.1:8089/data/2.5 for weather lookups).
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CONDITIONS = ("clear sky", "few clouds", "scattered clouds", "overcast clouds", "light rain", "mist")
+
+WORDS = ("the assistant can help with weather news devices reminders questions and more "
+         "this reply was generated offline by the local stand-in server for benchmarking").split()
+
+
+@dataclass
+class StandInProfile:
+    """
+    Behaviour of the stand-in server.
+
+    latency_dist is "fixed", "uniform" (latency_ms +/- latency_jitter_ms) or "lognormal"
+    (median latency_ms, shape latency_sigma). Latency is the delay before the first token;
+    the remaining tokens then arrive at tokens_per_second (0 sends them all at once).
+    A request fails with probability error_rate, with a status picked from error_statuses.
+    """
+    latency_ms: float = 300
+    latency_dist: str = "lognormal"
+    latency_jitter_ms: float = 100
+    latency_sigma: float = 0.5
+    tokens_per_second: float = 50
+    error_rate: float = 0.0
+    error_statuses: tuple = (429, 500, 503)
+    retry_after_seconds: int = 1
+    seed: Optional[int] = None
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+    def __post_init__(self):
+        if self.latency_dist not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{self.latency_dist}'. "
+                             f"Choose from {', '.join(self.LATENCY_DISTRIBUTIONS)}.")
+
+
+class StandInServer:
+    """
+    Stand-in chat-completions server running on a daemon thread.
+    """
+
+    def __init__(self, profile: StandInProfile = None, host: str = "127.0.0.1", port: int = 8089):
+        """
+        :param port: Port to bind (0 picks a free port).
+        """
+        self.profile = profile or StandInProfile()
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger("StandInServer")
+        self.stats = {"requests": 0, "errors": 0, "streamed": 0, "weather": 0}
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    @property
+    def weather_url(self) -> str:
+        return f"http://{self.host}:{self.port}/data/2.5"
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def sample_latency(self) -> float:
+        """Delay before the first token, in seconds."""
+        profile = self.profile
+        with self._lock:
+            if profile.latency_dist == "fixed":
+                latency_ms = profile.latency_ms
+            elif profile.latency_dist == "uniform":
+                latency_ms = self._random.uniform(profile.latency_ms - profile.latency_jitter_ms,
+                                                  profile.latency_ms + profile.latency_jitter_ms)
+            else:
+                latency_ms = self._random.lognormvariate(math.log(max(profile.latency_ms, 1e-3)),
+                                                         profile.latency_sigma)
+        return max(latency_ms, 0) / 1000
+
+    def sample_error(self):
+        """HTTP status of an injected error, or None."""
+        with self._lock:
+            if self.profile.error_rate and self._random.random() < self.profile.error_rate:
+                return self._random.choice(self.profile.error_statuses)
+        return None
+
+    def completion_tokens(self, request: dict) -> list:
+        """Synthetic reply: max_tokens words (at most 64 by default), one word per token."""
+        count = max(1, min(int(request.get("max_tokens") or 64), 1024))
+        with self._lock:
+            offset = self._random.randrange(len(WORDS))
+        return [WORDS[(offset + index) % len(WORDS)] + " " for index in range(count)]
+
+    @staticmethod
+    def weather(city: str) -> dict:
+        """Synthetic current weather for `city`, stable per city name."""
+        seed = int.from_bytes(hashlib.sha256(city.casefold().encode("utf-8")).digest()[:4], "big")
+        temperature = round(-5 + (seed % 400) / 10, 1)
+        return {
+            "name": city.split(",")[0].strip().title(),
+            "sys": {"country": "XX"},
+            "dt": int(time.time()),
+            "main": {"temp": temperature, "feels_like": round(temperature - 1.5, 1), "humidity": 40 + seed % 50},
+            "weather": [{"description": CONDITIONS[seed % len(CONDITIONS)]}],
+            "wind": {"speed": round((seed >> 8) % 120 / 10, 1)},
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path.rstrip("/") != "/data/2.5/weather":
+                    self._reply_json(404, {"cod": "404", "message": f"Unknown path {parts.path}."})
+                    return
+                city = parse_qs(parts.query).get("q", [""])[0].strip()
+                if not city:
+                    self._reply_json(400, {"cod": "400", "message": "Nothing to geocode."})
+                    return
+                server._count("requests")
+                server._count("weather")
+
+                time.sleep(server.sample_latency())
+                status = server.sample_error()
+                if status is not None:
+                    server._count("errors")
+                    headers = {"Retry-After": str(server.profile.retry_after_seconds)} if status == 429 else {}
+                    self._reply_json(status, {"cod": str(status), "message": f"Injected error {status}."}, headers)
+                    return
+                self._reply_json(200, server.weather(city))
+
+            def do_POST(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._reply_json(400, {"error": {"message": "Invalid JSON body."}})
+                    return
+                if path != "/v1/chat/completions":
+                    self._reply_json(404, {"error": {"message": f"Unknown path {path}."}})
+                    return
+                server._count("requests")
+
+                time.sleep(server.sample_latency())
+                status = server.sample_error()
+                if status is not None:
+                    server._count("errors")
+                    headers = {"Retry-After": str(server.profile.retry_after_seconds)} if status == 429 else {}
+                    self._reply_json(status, {"error": {"message": f"Injected error {status}."}}, headers)
+                    return
+
+                tokens = server.completion_tokens(request)
+                model = request.get("model", "standin")
+                if request.get("stream"):
+                    server._count("streamed")
+                    self._stream(tokens, model)
+                    return
+                if server.profile.tokens_per_second:
+                    time.sleep((len(tokens) - 1) / server.profile.tokens_per_second)
+                self._reply_json(200, {
+                    "id": "chatcmpl-standin",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "finish_reason": "length",
+                                 "message": {"role": "assistant", "content": "".join(tokens).strip()}}],
+                    "usage": {"completion_tokens": len(tokens)},
+                })
+
+            def _stream(self, tokens, model):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                delay = 1 / server.profile.tokens_per_second if server.profile.tokens_per_second else 0
+                for index, token in enumerate(tokens):
+                    if index and delay:
+                        time.sleep(delay)
+                    event = {"object": "chat.completion.chunk", "model": model,
+                             "choices": [{"index": 0, "delta": {"content": token}}]}
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def _reply_json(self, status, body, headers=None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> int:
+        """
+        Start serving in the background.
+
+        :return: The bound port.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StandInServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Stand-in chat server listening on {self.base_url}")
+        return self.port
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline OpenAI-compatible stand-in chat server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=300, help="Median/mean delay before the first token.")
+    parser.add_argument("--latency-dist", choices=StandInProfile.LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-jitter-ms", type=float, default=100, help="Half-width of the uniform distribution.")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Shape of the lognormal distribution.")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Token rate after the first token.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error.")
+    parser.add_argument("--error-statuses", default="429,500,503", help="Comma-separated statuses to inject.")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def profile_from_args(args) -> StandInProfile:
+    return StandInProfile(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(",") if status.strip()),
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    arguments = parse_args()
+    stand_in = StandInServer(profile_from_args(arguments), host=arguments.host, port=arguments.port)
+    stand_in.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_in.stop()
@@ -0,0 +1,54 @@
+"""
+Fakes shared by the tests: a clock that only moves when told to, an HTTP session with canned
+JSON answers, and a Config whose stores live in memory and that starts no background work.
+"""
+import time
+from unittest.mock import MagicMock
+from config.settings import Config
+
+
+class FakeClock:
+    """Time source for `clock=` parameters; `sleep` advances it instantly."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def fake_session(respond, delay=0.0):
+    """
+    HTTP session whose `get(url, params=...)` returns a 200 response with
+    `respond(url, params)` as its JSON body, after `delay` seconds. `respond` raises to
+    simulate a failed request.
+    """
+    def get(url, params=None, timeout=None):
+        time.sleep(delay)
+        return MagicMock(status_code=200, **{"json.return_value": respond(url, params or {})})
+
+    return MagicMock(**{"get.side_effect": get})
+
+
+class SafeConfig(Config):
+    """Config for tests: in-memory stores, no prefetching, no metrics server."""
+    NEWS_DB_PATH = ""
+    WEATHER_HISTORY_DB_PATH = ""
+    PREFETCH_ENABLED = False
+    PREFETCH_LOG_PATH = ""
+    CHAT_CACHE_DB_PATH = ""
+    HTTP_CACHE_DB_PATH = ""
+    METRICS_ENABLED = False
+
+
+def safe_config(**overrides) -> SafeConfig:
+    """A SafeConfig with `overrides` applied; every other setting keeps its safe or default value."""
+    config = SafeConfig()
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
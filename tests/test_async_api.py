@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from operate.models.apis import APICall, AsyncAPIManager
+from operate.orchestrator import Orchestrator
+from config.settings import Config
+
+
+def slow_send_request(service, endpoint, payload, method, coalesce, rate_limit):
+    time.sleep(0.1)
+    if service == "broken":
+        raise ValueError("invalid JSON")
+    if service == "stalled":
+        time.sleep(1)
+    return {"service": service, "endpoint": endpoint}
+
+
+class TestAsyncAPIManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = MagicMock(**{"send_request.side_effect": slow_send_request})
+        self.api = AsyncAPIManager(self.manager, max_concurrency=8)
+        self.addCleanup(self.api.close)
+
+    def test_send_request_matches_sync_surface(self):
+        result = asyncio.run(self.api.send_request("openai", "/models", {}, "GET"))
+
+        self.assertEqual(result, {"service": "openai", "endpoint": "/models"})
+        self.manager.send_request.assert_called_once_with("openai", "/models", {}, "GET", None, None)
+
+    def test_gather_runs_calls_concurrently_in_order(self):
+        calls = [APICall(service, "/status", method="GET") for service in ("openai", "whiterabbit", "twitter", "facebook")]
+
+        start_time = time.perf_counter()
+        results = asyncio.run(self.api.gather(calls))
+        elapsed = time.perf_counter() - start_time
+
+        self.assertEqual([result["service"] for result in results], ["openai", "whiterabbit", "twitter", "facebook"])
+        self.assertLess(elapsed, 0.3)
+
+    def test_gather_isolates_failures_and_timeouts(self):
+        calls = [APICall("openai", "/a"), APICall("broken", "/b"), APICall("stalled", "/c")]
+
+        results = asyncio.run(self.api.gather(calls, timeout=0.5))
+
+        self.assertEqual(results[0]["service"], "openai")
+        self.assertEqual(results[1:], [None, None])
+        self.assertEqual(asyncio.run(self.api.gather([])), [])
+
+    def test_orchestrator_fan_out_runs_on_engine_loop(self):
+        orchestrator = Orchestrator(Config())
+        self.addCleanup(orchestrator.engine.shutdown)
+        orchestrator.modules["async_api"] = self.api
+        loop_threads = []
+        self.manager.send_request.side_effect = (
+            lambda *args: loop_threads.append(threading.current_thread().name) or {"ok": True}
+        )
+
+        results = orchestrator.fan_out([APICall("openai", "/a"), APICall("twitter", "/b")]).result(timeout=5)
+
+        self.assertEqual(results, [{"ok": True}, {"ok": True}])
+        self.assertTrue(all(name.startswith("AsyncAPI") for name in loop_threads))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from modules.chatbot import ChatBot, iter_sentences, FALLBACK_RESPONSE
+from modules.response_cache import ResponseCache
+
+
+class WordTokenizer:
+    """Stand-in for the GPT-2 tokenizer: one token per word."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return {"input_ids": [text.split() for text in texts]}
+
+
+def stream_events(*chunks):
+    return iter([{"choices": [{"delta": {"content": chunk}}]} for chunk in chunks])
+
+
+class TestIterSentences(unittest.TestCase):
+
+    def test_groups_chunks_into_sentences(self):
+        chunks = ["It is sun", "ny today. Tempera", "ture is 21", " degrees!\nAnything else"]
+
+        self.assertEqual(
+            list(iter_sentences(chunks)),
+            ["It is sunny today.", "Temperature is 21 degrees!", "Anything else"],
+        )
+
+    def test_yields_first_sentence_before_stream_ends(self):
+        def chunks():
+            yield "First sentence. "
+            raise AssertionError("read past the first sentence")
+
+        self.assertEqual(next(iter_sentences(chunks())), "First sentence.")
+
+
+@patch('modules.chatbot.RESOURCES', MagicMock(**{"acquire.return_value": WordTokenizer()}))
+@patch('modules.llm_backends.openai')
+class TestChatBotStreaming(unittest.TestCase):
+
+    def test_stream_yields_chunks_and_records_timing(self, mock_openai):
+        mock_openai.ChatCompletion.create.return_value = stream_events("Hel", "lo", " there.")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        self.assertEqual(list(chatbot.stream_response("hi")), ["Hel", "lo", " there."])
+        self.assertTrue(mock_openai.ChatCompletion.create.call_args.kwargs["stream"])
+        timing = chatbot.last_stream_timing
+        self.assertLessEqual(timing["first_token_seconds"], timing["total_seconds"])
+
+    def test_streamed_reply_is_cached(self, mock_openai):
+        mock_openai.ChatCompletion.create.return_value = stream_events("Hello", " there.")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        list(chatbot.stream_response("hi"))
+        chatbot.memory.clear()
+
+        self.assertEqual(list(chatbot.stream_response("hi")), ["Hello there."])
+        chatbot.memory.clear()
+        self.assertEqual(chatbot.generate_response("hi"), "Hello there.")
+        mock_openai.ChatCompletion.create.assert_called_once()
+
+    def test_token_counts_are_batched_and_memoized(self, mock_openai):
+        tokenizer = WordTokenizer()
+        with patch('modules.chatbot.RESOURCES') as mock_resources:
+            mock_resources.acquire.return_value = tokenizer
+            chatbot = ChatBot(api_key="key", cache=ResponseCache())
+            mock_resources.acquire.assert_not_called()
+
+            self.assertEqual(chatbot.estimate_tokens_batch(["one two", "three", "one two"]), [2, 1, 2])
+            self.assertEqual(chatbot.estimate_tokens("three"), 1)
+
+        self.assertEqual(tokenizer.calls, [["one two", "three"]])
+
+    def test_batch_keeps_order_and_isolates_errors(self, mock_openai):
+        def complete(model, messages, **kwargs):
+            prompt = messages[-1]["content"]
+            if prompt == "bad":
+                raise RuntimeError("rejected")
+            return {"choices": [{"message": {"content": prompt.upper()}}]}
+
+        mock_openai.ChatCompletion.create.side_effect = complete
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        results = chatbot.generate_responses(["a", "bad", "c", "d"], max_concurrency=3)
+
+        self.assertEqual([result.response for result in results], ["A", None, "C", "D"])
+        self.assertFalse(results[1].ok)
+        self.assertIsInstance(results[1].error, RuntimeError)
+        self.assertEqual(len(chatbot.memory.history), 0)
+
+    def test_batch_respects_concurrency_and_budget(self, mock_openai):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def complete(**kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+            return {"choices": [{"message": {"content": "ok"}}]}
+
+        mock_openai.ChatCompletion.create.side_effect = complete
+        budget = MagicMock()
+        chatbot = ChatBot(api_key="key", budget=budget)
+        chatbot.cache = None
+
+        results = chatbot.generate_responses([f"prompt {index}" for index in range(10)], max_tokens=50,
+                                             max_concurrency=2)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual(budget.acquire.call_count, 10)
+        budget.acquire.assert_called_with(52)
+
+    def test_concurrent_identical_prompts_share_one_call(self, mock_openai):
+        release = threading.Event()
+        mock_openai.ChatCompletion.create.side_effect = (
+            lambda **kwargs: release.wait(5) and {"choices": [{"message": {"content": "ok"}}]}
+        )
+        chatbot = ChatBot(api_key="key", cache=False)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(chatbot.generate_responses(["same"])[0].response))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(500):
+            if chatbot.inflight.stats["calls"] >= 3:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["ok"] * 3)
+        mock_openai.ChatCompletion.create.assert_called_once()
+        self.assertEqual(chatbot.inflight.stats["saved"], 2)
+
+    def test_coalesced_turn_is_remembered_once(self, mock_openai):
+        release = threading.Event()
+        mock_openai.ChatCompletion.create.side_effect = (
+            lambda **kwargs: release.wait(5) and {"choices": [{"message": {"content": "Paris."}}]}
+        )
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(chatbot.generate_response("capital of France?")))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(500):
+            if chatbot.inflight.stats["calls"] >= 3:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["Paris."] * 3)
+        mock_openai.ChatCompletion.create.assert_called_once()
+        self.assertEqual([message.content for message in chatbot.memory.history], ["capital of France?", "Paris."])
+
+    def test_stream_failure_yields_fallback(self, mock_openai):
+        mock_openai.ChatCompletion.create.side_effect = RuntimeError("API down")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        self.assertEqual(list(chatbot.stream_response("hi")), [FALLBACK_RESPONSE])
+        self.assertEqual(len(chatbot.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
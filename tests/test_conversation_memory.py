@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import MagicMock
+from modules.conversation_memory import ConversationMemory, MESSAGE_OVERHEAD_TOKENS
+
+
+def count_words(texts):
+    return [len(text.split()) for text in texts]
+
+
+class TestConversationMemory(unittest.TestCase):
+
+    def test_messages_include_system_prompt_history_and_prompt(self):
+        memory = ConversationMemory(count_words, max_tokens=200, system_prompt="Be brief.")
+        memory.add_exchange("What is the capital of France?", "Paris.")
+
+        messages = memory.build_messages("And its population?")
+
+        self.assertEqual([message["role"] for message in messages], ["system", "user", "assistant", "user"])
+        self.assertEqual(messages[-1]["content"], "And its population?")
+
+    def test_history_stays_within_budget(self):
+        memory = ConversationMemory(count_words, max_tokens=60)
+        for turn in range(50):
+            memory.add_exchange(f"question number {turn} " * 2, f"answer number {turn}")
+
+        self.assertLessEqual(memory.total_tokens(), 60)
+        messages = memory.build_messages("one more question please")
+        payload_tokens = sum(count_words([message["content"]])[0] + MESSAGE_OVERHEAD_TOKENS for message in messages)
+        self.assertLessEqual(payload_tokens, 60)
+        self.assertIn("answer number 49", messages[-2]["content"])
+
+    def test_counts_each_message_once(self):
+        count_tokens = MagicMock(side_effect=count_words)
+        memory = ConversationMemory(count_tokens, max_tokens=1000)
+        memory.add_exchange("hello", "hi there")
+
+        memory.build_messages("first prompt", prompt_tokens=2)
+        memory.build_messages("second prompt", prompt_tokens=2)
+
+        count_tokens.assert_called_once_with(["hello", "hi there"])
+
+    def test_dropped_messages_are_summarized(self):
+        summarizer = MagicMock(return_value="User asked about Paris.")
+        memory = ConversationMemory(count_words, max_tokens=30, summarizer=summarizer)
+        memory.add_exchange("tell me about Paris " * 3, "Paris is the capital of France.")
+        memory.add_exchange("and Lyon?", "Lyon is in the south east.")
+
+        summarizer.assert_called()
+        self.assertEqual(summarizer.call_args[0][0], "")
+        messages = memory.build_messages("thanks")
+        self.assertEqual(messages[0], {"role": "system", "content": "User asked about Paris."})
+
+    def test_summarizer_runs_without_holding_the_lock(self):
+        def summarizer(previous, dropped):
+            # Another thread reading the history would deadlock here if the lock were held
+            self.assertTrue(memory._lock.acquire(timeout=1))
+            memory._lock.release()
+            return "Earlier small talk."
+
+        memory = ConversationMemory(count_words, max_tokens=30, summarizer=summarizer)
+        memory.add_exchange("tell me about Paris " * 3, "Paris is the capital of France.")
+        memory.add_exchange("and Lyon?", "Lyon is in the south east.")
+
+        self.assertEqual(memory.summary.content, "Earlier small talk.")
+
+    def test_oversized_summary_keeps_the_previous_one(self):
+        summarizer = MagicMock(side_effect=["Short summary.", "word " * 40])
+        memory = ConversationMemory(count_words, max_tokens=30, summarizer=summarizer)
+        for turn in range(3):
+            memory.add_exchange(f"question {turn} " * 4, f"answer {turn} " * 2)
+
+        self.assertEqual(summarizer.call_count, 2)
+        self.assertEqual(memory.summary.content, "Short summary.")
+
+    def test_digest_tracks_context(self):
+        memory = ConversationMemory(count_words)
+        empty = memory.digest()
+        memory.add_exchange("hi", "hello")
+
+        self.assertNotEqual(memory.digest(), empty)
+        memory.clear()
+        self.assertEqual(memory.digest(), empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+from operate.execution_engine import ExecutionEngine, TaskTimeoutError
+
+
+class TestExecutionEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ExecutionEngine(default_workers=2)
+
+    def tearDown(self):
+        self.engine.shutdown()
+
+    def test_submit_returns_future_with_result(self):
+        future = self.engine.submit("math", pow, 2, 10)
+
+        self.assertEqual(future.result(timeout=5), 1024)
+
+    def test_exceptions_are_propagated(self):
+        def fail():
+            raise ValueError("boom")
+
+        future = self.engine.submit("faulty", fail)
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+
+    def test_timeout(self):
+        future = self.engine.submit("slow", time.sleep, 1, timeout=0.05)
+
+        with self.assertRaises(TaskTimeoutError):
+            future.result(timeout=5)
+
+    def test_tasks_run_concurrently_across_modules(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        # Each call blocks until the other one is running too
+        first = self.engine.submit("voice_assistant", barrier.wait)
+        second = self.engine.submit("chatbot", barrier.wait)
+
+        first.result(timeout=5)
+        second.result(timeout=5)
+
+    def test_module_pool_is_bounded(self):
+        self.engine.set_pool_size("single", 1)
+        running = []
+        peak = []
+
+        def task():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.02)
+            running.pop()
+
+        futures = [self.engine.submit("single", task) for _ in range(4)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(max(peak), 1)
+
+    def test_cancel_queued_task(self):
+        self.engine.set_pool_size("busy", 1)
+        release = threading.Event()
+        blocker = self.engine.submit("busy", release.wait, 5)
+        queued = self.engine.submit("busy", lambda: "never")
+
+        queued.cancel()
+        release.set()
+        blocker.result(timeout=5)
+        with self.assertRaises(CancelledError):
+            queued.result(timeout=5)
+
+    def test_queue_depth(self):
+        release = threading.Event()
+        future = self.engine.submit("depth", release.wait, 5)
+        time.sleep(0.05)
+
+        self.assertEqual(self.engine.queue_depth("depth"), 1)
+        release.set()
+        future.result(timeout=5)
+        self.assertEqual(self.engine.queue_depth("depth"), 0)
+
+    def test_timed_out_call_is_counted_until_it_returns(self):
+        release = threading.Event()
+        future = self.engine.submit("stuck", release.wait, 5, timeout=0.05)
+
+        with self.assertRaises(TaskTimeoutError):
+            future.result(timeout=5)
+        self.assertEqual(self.engine.queue_depth("stuck"), 1)
+        release.set()
+        for _ in range(100):
+            if self.engine.queue_depth("stuck") == 0:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.engine.queue_depth("stuck"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from helpers import FakeClock
+from operate.models.apis import APIManager
+from operate.utils.http_cache import HTTPCache
+
+
+def fake_response(status=200, body=None, headers=None):
+    return MagicMock(status_code=status, content=json.dumps(body).encode("utf-8") if body is not None else b"",
+                     headers=headers or {}, **{"json.return_value": body})
+
+
+class TestHTTPCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_ttl_rules_and_cache_control(self):
+        cache = HTTPCache(default_ttl=5, ttl_rules={"api.twitter.com/2/tweets*": 30, "*/tasks": 0})
+
+        self.assertEqual(cache.ttl_for("https://api.twitter.com/2/tweets/search?q=x"), 30)
+        self.assertEqual(cache.ttl_for("https://api.whiterabbitneo.com/v1/tasks"), 0)
+        self.assertEqual(cache.ttl_for("https://example.com/a", {"Cache-Control": "public, max-age=60"}), 60)
+        self.assertEqual(cache.ttl_for("https://example.com/a"), 5)
+        self.assertIsNone(cache.ttl_for("https://api.twitter.com/2/tweets", {"Cache-Control": "no-store"}))
+
+    def test_fresh_then_stale_then_revalidated(self):
+        cache = HTTPCache(default_ttl=10, clock=self.clock)
+        key = HTTPCache.make_key("https://example.com/feed", {"page": 1})
+        cache.store(key, "https://example.com/feed", fake_response(body={"items": [1]}, headers={"ETag": '"v1"'}))
+
+        entry = cache.lookup(key)
+        self.assertTrue(cache.is_fresh(entry))
+        self.clock.now += 11
+        entry = cache.lookup(key)
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertEqual(entry.validators(), {"If-None-Match": '"v1"'})
+
+        entry = cache.revalidated(key, entry, {"ETag": '"v1"'})
+        self.assertTrue(cache.is_fresh(cache.lookup(key)))
+        self.assertEqual(entry.json(), {"items": [1]})
+        self.assertEqual(cache.stats["fresh_hits"], 2)
+        self.assertEqual(cache.stats["revalidated"], 1)
+
+    def test_unvalidatable_zero_ttl_responses_are_not_stored(self):
+        cache = HTTPCache()
+
+        self.assertIsNone(cache.store("key", "https://example.com/", fake_response(body={})))
+        self.assertIsNone(cache.store("key", "https://example.com/", fake_response(status=500, body={})))
+        self.assertEqual(len(cache), 0)
+
+    def test_memory_is_byte_bounded_and_spills_to_disk(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # Each body is 13 bytes, so two fit in memory
+        cache = HTTPCache(max_bytes=30, default_ttl=60, db_path=os.path.join(directory.name, "http.db"),
+                          clock=self.clock)
+        self.addCleanup(cache.close)
+        for index in range(3):
+            cache.store(f"key{index}", f"https://example.com/{index}", fake_response(body={"n": "x" * 4}))
+
+        self.assertEqual(cache.memory_bytes(), 26)
+        self.assertEqual(cache.stats["spills"], 1)
+        entry = cache.lookup("key0")
+        self.assertEqual(entry.json(), {"n": "xxxx"})
+        self.assertEqual(cache.stats["disk_hits"], 1)
+
+
+@patch('operate.models.apis.RESOURCES')
+class TestAPIManagerCaching(unittest.TestCase):
+
+    def test_polling_becomes_conditional_and_304s_reuse_the_body(self, mock_resources):
+        session = mock_resources.acquire.return_value
+        session.get.side_effect = [
+            fake_response(body={"data": ["t1"]}, headers={"ETag": '"abc"'}),
+            fake_response(status=304, headers={"ETag": '"abc"'}),
+        ]
+        manager = APIManager(http_cache=HTTPCache(default_ttl=0))
+
+        first = manager.send_request("twitter", "/tweets", {"id": 1}, "GET")
+        second = manager.send_request("twitter", "/tweets", {"id": 1}, "GET")
+
+        self.assertEqual(first, {"data": ["t1"]})
+        self.assertEqual(second, {"data": ["t1"]})
+        self.assertEqual(session.get.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+        self.assertEqual(manager.http_cache.stats["revalidated"], 1)
+
+    def test_fresh_entries_skip_the_request(self, mock_resources):
+        session = mock_resources.acquire.return_value
+        session.get.return_value = fake_response(body={"tasks": []}, headers={"Cache-Control": "max-age=60"})
+        manager = APIManager(http_cache=HTTPCache())
+
+        for _ in range(3):
+            self.assertEqual(manager.send_request("whiterabbit", "/tasks", {}, "GET"), {"tasks": []})
+
+        session.get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
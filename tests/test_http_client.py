@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import requests
+from operate.models.apis import APIManager
+from operate.utils.http_client import HTTPClient
+from operate.utils.rate_limit import RateLimiter, RateLimitExceeded
+from services.standin_server import StandInProfile, StandInServer
+
+
+class TestHTTPClient(unittest.TestCase):
+
+    def setUp(self):
+        self.client = HTTPClient(pool_maxsize=4, timeout=(1, 5))
+        self.addCleanup(self.client.close)
+
+    def test_connections_are_kept_alive_and_reused(self):
+        server = StandInServer(StandInProfile(latency_ms=0, latency_dist="fixed", tokens_per_second=0), port=0)
+        server.start()
+        self.addCleanup(server.stop)
+
+        for _ in range(5):
+            response = self.client.post(server.base_url + "/chat/completions", json={"max_tokens": 2})
+            self.assertEqual(response.status_code, 200)
+
+        stats = self.client.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_reused"], 4)
+        self.assertIn("127.0.0.1", self.client.format_stats())
+
+    def test_default_timeout_unless_given(self):
+        self.client.session = MagicMock()
+
+        self.client.get("http://example.com/a")
+        self.client.get("http://example.com/b", timeout=30)
+
+        timeouts = [call.kwargs["timeout"] for call in self.client.session.request.call_args_list]
+        self.assertEqual(timeouts, [(1, 5), 30])
+        self.assertEqual(self.client.requests_by_host["example.com"], 2)
+
+    def test_from_config(self):
+        config = MagicMock(HTTP_POOL_CONNECTIONS=4, HTTP_POOL_MAXSIZE=8, HTTP_POOL_BLOCK=False,
+                           HTTP_CONNECT_TIMEOUT_SECONDS=2, TIMEOUT_SECONDS=10,
+                           PROXY_ENABLED=True, PROXY_URL="http://proxy.local:3128",
+                           API_RATE_LIMIT=100, API_RATE_LIMITS={}, API_RATE_LIMIT_MODE="fail")
+
+        client = HTTPClient.from_config(config)
+        self.addCleanup(client.close)
+
+        self.assertEqual(client.timeout, (2, 10))
+        self.assertEqual(client.session.proxies["https"], "http://proxy.local:3128")
+        self.assertIs(client.session.get_adapter("https://api.openai.com"), client.adapter)
+        self.assertFalse(client.rate_limiter.blocking)
+
+    def test_rate_limit_adapts_to_429(self):
+        server = StandInServer(StandInProfile(latency_ms=0, latency_dist="fixed", error_rate=1.0,
+                                              error_statuses=(429,), retry_after_seconds=30), port=0)
+        server.start()
+        self.addCleanup(server.stop)
+        self.client.rate_limiter = RateLimiter(600, blocking=False)
+        host = server.base_url.split("/")[2]
+
+        response = self.client.post(server.base_url + "/chat/completions", json={})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.client.rate_limiter.rates()[host], 300)
+        with self.assertRaises(RateLimitExceeded):
+            self.client.post(server.base_url + "/chat/completions", json={})
+        self.client.post(server.base_url + "/chat/completions", json={}, rate_limit=False)
+        self.assertEqual(server.stats["requests"], 2)
+
+
+@patch('operate.models.apis.RESOURCES')
+class TestAPIManagerRetries(unittest.TestCase):
+
+    def test_post_that_timed_out_is_not_resent(self, mock_resources):
+        session = mock_resources.acquire.return_value
+        session.post.side_effect = requests.exceptions.ReadTimeout("read timed out")
+        manager = APIManager(http_cache=MagicMock())
+
+        self.assertIsNone(manager.send_request("facebook", "/me/feed", {"message": "hi"}, "POST"))
+        session.post.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock
+from modules.intent_router import IntentRouter
+from operate.orchestrator import WEATHER_LOCATION_PATTERN
+
+
+class TestIntentRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = IntentRouter()
+        self.weather = MagicMock(return_value="weather")
+        self.social = MagicMock(return_value="social")
+        self.twitter = MagicMock(return_value="twitter")
+        self.router.register(
+            "weather", ["weather", "forecast"], self.weather,
+            pattern=r"\bin\s+(?P<location>[a-z][\w\s]*)",
+        )
+        self.router.register("social", ["social"], self.social, priority=-1)
+        self.router.register("post_to_twitter", ["post to twitter"], self.twitter)
+
+    def test_dispatch_with_argument_extraction(self):
+        result = self.router.dispatch("What is the weather in New York")
+
+        self.assertEqual(result, "weather")
+        self.weather.assert_called_once_with(location="New York")
+
+    def test_missing_argument_uses_handler_default(self):
+        self.router.dispatch("forecast please")
+
+        self.weather.assert_called_once_with()
+
+    def test_longer_keyword_wins_regardless_of_order(self):
+        match = self.router.match("social: post to twitter")
+
+        self.assertEqual(match.intent.name, "post_to_twitter")
+        self.assertEqual(match.keyword, "post to twitter")
+
+    def test_priority_beats_keyword_length(self):
+        self.router.register("urgent", ["now"], MagicMock(), priority=10)
+
+        match = self.router.match("post to twitter now")
+        self.assertEqual(match.intent.name, "urgent")
+
+    def test_whole_words_only(self):
+        self.assertIsNone(self.router.match("the weatherman is socialising"))
+
+    def test_unmatched_command_calls_default(self):
+        default = MagicMock(return_value="unknown")
+
+        self.assertEqual(self.router.dispatch("open the pod bay doors", default=default), "unknown")
+        default.assert_called_once_with("open the pod bay doors")
+
+    def test_overlapping_keywords_are_all_found(self):
+        router = IntentRouter(whole_words=False)
+        router.register("pronouns", ["she", "he", "hers"], MagicMock())
+
+        keywords = sorted(keyword for _, keyword, _ in router.find_all("ushers"))
+        self.assertEqual(keywords, ["he", "hers", "she"])
+
+    def test_register_after_compile(self):
+        self.router.match("weather")
+        self.router.register("time", ["time"], MagicMock())
+
+        self.assertEqual(self.router.match("what time is it").intent.name, "time")
+
+
+class TestWeatherLocation(unittest.TestCase):
+
+    def setUp(self):
+        self.router = IntentRouter()
+        self.router.register("weather", ["weather", "forecast"], MagicMock(), pattern=WEATHER_LOCATION_PATTERN)
+
+    def location(self, command):
+        return self.router.match(command).arguments.get("location")
+
+    def test_times_are_not_locations(self):
+        for command in ("weather for tomorrow", "weather at the moment", "forecast for the weekend",
+                        "weather in the morning", "forecast for next week", "weather for today?"):
+            self.assertIsNone(self.location(command), command)
+
+    def test_times_around_the_location_are_dropped(self):
+        self.assertEqual(self.location("weather in Paris tomorrow"), "Paris")
+        self.assertEqual(self.location("weather in Paris for the weekend"), "Paris")
+        self.assertEqual(self.location("forecast for tomorrow morning in St. Louis, MO"), "St. Louis, MO")
+        self.assertEqual(self.location("weather in Sao Paulo on Monday"), "Sao Paulo")
+
+    def test_places_starting_like_times_are_kept(self):
+        self.assertEqual(self.location("weather in Nowra"), "Nowra")
+        self.assertEqual(self.location("weather in Todaytown."), "Todaytown")
+
+
+if __name__ == '__main__':
+    unittest.main()
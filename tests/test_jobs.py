@@ -0,0 +1,72 @@
+import threading
+import unittest
+from concurrent.futures import TimeoutError
+from operate.execution_engine import ExecutionEngine
+from operate.jobs import JobManager
+
+
+class TestJobManager(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ExecutionEngine(default_workers=1)
+        self.jobs = JobManager(self.engine, max_finished_jobs=2)
+
+    def tearDown(self):
+        self.engine.shutdown()
+
+    def test_submit_returns_immediately(self):
+        release = threading.Event()
+        job = self.jobs.submit("slow job", "slow", release.wait, 5)
+
+        self.assertIn(job.state, ("queued", "running"))
+        with self.assertRaises(TimeoutError):
+            self.jobs.result(job.job_id)
+        release.set()
+        self.assertTrue(self.jobs.result(job.job_id, timeout=5))
+        self.assertEqual(job.state, "finished")
+
+    def test_queued_running_and_finished_states(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        running = self.jobs.submit("blocker", "single", blocker)
+        queued = self.jobs.submit("waiting", "single", lambda: "done")
+        started.wait(5)
+
+        self.assertEqual(running.state, "running")
+        self.assertEqual(queued.state, "queued")
+        release.set()
+        self.assertEqual(self.jobs.result(queued.job_id, timeout=5), "done")
+
+    def test_failed_job_and_on_done(self):
+        finished = threading.Event()
+
+        def fail():
+            raise RuntimeError("download failed")
+
+        job = self.jobs.submit("failing", "s3", fail, on_done=lambda _: finished.set())
+
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(job.state, "failed")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_status_lists_jobs_and_prunes_finished(self):
+        for index in range(4):
+            self.jobs.result(self.jobs.submit(f"job {index}", "quick", lambda: index).job_id, timeout=5)
+        self.jobs.submit("latest", "quick", lambda: None)
+
+        status = self.jobs.format_status()
+        self.assertIn("latest", status)
+        self.assertNotIn("job 0", status)
+
+    def test_unknown_job(self):
+        with self.assertRaises(KeyError):
+            self.jobs.get(42)
+
+
+if __name__ == '__main__':
+    unittest.main()
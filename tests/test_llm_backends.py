@@ -0,0 +1,101 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch, MagicMock
+from modules.llm_backends import HTTPChatBackend, LLMBackend, OpenAIBackend, create_backend
+from services.standin_server import StandInProfile, StandInServer
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    return urllib.request.urlopen(request, timeout=5)
+
+
+class TestStandInServer(unittest.TestCase):
+
+    def start(self, **profile):
+        server = StandInServer(StandInProfile(latency_ms=0, latency_dist="fixed", tokens_per_second=0,
+                                              seed=1, **profile), port=0)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_completion(self):
+        server = self.start()
+
+        with post(server.base_url + "/chat/completions", {"model": "m", "max_tokens": 5, "messages": []}) as response:
+            body = json.loads(response.read())
+
+        self.assertEqual(len(body["choices"][0]["message"]["content"].split()), 5)
+        self.assertEqual(server.stats["requests"], 1)
+
+    def test_streaming(self):
+        server = self.start()
+
+        with post(server.base_url + "/chat/completions", {"max_tokens": 3, "stream": True}) as response:
+            lines = [line.decode("utf-8").strip() for line in response if line.strip()]
+
+        self.assertEqual(lines[-1], "data: [DONE]")
+        self.assertEqual(len(lines), 4)
+        self.assertIn("delta", json.loads(lines[0][len("data:"):])["choices"][0])
+
+    def test_error_injection(self):
+        server = self.start(error_rate=1.0, error_statuses=(429,))
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            post(server.base_url + "/chat/completions", {"max_tokens": 3})
+
+        self.assertEqual(context.exception.code, 429)
+        self.assertEqual(context.exception.headers["Retry-After"], "1")
+        self.assertEqual(server.stats["errors"], 1)
+
+    def test_latency_distributions(self):
+        for distribution in StandInProfile.LATENCY_DISTRIBUTIONS:
+            server = StandInServer(StandInProfile(latency_ms=100, latency_dist=distribution, seed=3))
+            samples = [server.sample_latency() for _ in range(200)]
+            self.assertTrue(all(sample >= 0 for sample in samples))
+            self.assertAlmostEqual(sorted(samples)[100], 0.1, delta=0.03)
+        with self.assertRaises(ValueError):
+            StandInProfile(latency_dist="pareto")
+
+
+class TestBackends(unittest.TestCase):
+
+    @patch('modules.llm_backends.RESOURCES')
+    def test_http_backend_parses_stream(self, mock_resources):
+        response = MagicMock()
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}', "",
+            'data: {"choices": [{"delta": {"content": "lo"}}]}', "data: [DONE]",
+        ]
+        mock_resources.acquire.return_value.post.return_value = response
+        backend = HTTPChatBackend("http://127.0.0.1:8089/v1/")
+
+        chunks = list(backend.stream([{"role": "user", "content": "hi"}], "m", 10, 0))
+
+        self.assertEqual(chunks, ["Hel", "lo"])
+        url = mock_resources.acquire.return_value.post.call_args[0][0]
+        self.assertEqual(url, "http://127.0.0.1:8089/v1/chat/completions")
+
+    def test_create_backend(self):
+        config = MagicMock(LLM_BACKEND="openai", OPENAI_API_KEY="")
+        with self.assertRaises(ValueError):
+            create_backend(config)
+        with patch('modules.llm_backends.openai'):
+            self.assertIsInstance(create_backend(config, api_key="key"), OpenAIBackend)
+        with self.assertRaises(ValueError):
+            create_backend(MagicMock(LLM_BACKEND="unknown"))
+
+    def test_backends_must_implement_the_interface(self):
+        class CompleteOnly(LLMBackend):
+            def complete(self, messages, model, max_tokens, temperature):
+                return ""
+
+        with self.assertRaises(TypeError):
+            CompleteOnly()
+
+
+if __name__ == "__main__":
+    unittest.main()
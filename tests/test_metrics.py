@@ -0,0 +1,91 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from operate.metrics_server import MetricsServer
+from operate.utils.metrics import MetricsRegistry, _Metric
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_render(self):
+        calls = self.registry.counter("aia_calls_total", "Calls.", ("module",))
+        calls.inc(module="chatbot")
+        calls.inc(2, module="chatbot")
+
+        output = self.registry.render()
+        self.assertIn("# TYPE aia_calls_total counter", output)
+        self.assertIn('aia_calls_total{module="chatbot"} 3', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = self.registry.histogram("aia_latency_seconds", "Latency.", ("module",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value, module="ocr")
+
+        output = self.registry.render()
+        self.assertIn('aia_latency_seconds_bucket{module="ocr",le="0.1"} 1', output)
+        self.assertIn('aia_latency_seconds_bucket{module="ocr",le="1"} 2', output)
+        self.assertIn('aia_latency_seconds_bucket{module="ocr",le="+Inf"} 3', output)
+        self.assertIn('aia_latency_seconds_count{module="ocr"} 3', output)
+        self.assertIn('aia_latency_seconds_sum{module="ocr"} 5.55', output)
+
+    def test_callback_gauge(self):
+        self.registry.gauge("aia_queue_depth", "Depth.", ("queue",), function=lambda: {"pipeline": 4})
+
+        self.assertIn('aia_queue_depth{queue="pipeline"} 4', self.registry.render())
+
+    def test_label_mismatch(self):
+        calls = self.registry.counter("aia_calls_total", "Calls.", ("module",))
+
+        with self.assertRaises(ValueError):
+            calls.inc(service="openai")
+
+    def test_same_name_returns_same_metric(self):
+        first = self.registry.counter("aia_calls_total", "Calls.")
+
+        self.assertIs(self.registry.counter("aia_calls_total", "Calls."), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("aia_calls_total", "Calls.")
+
+    def test_metric_types_must_render_samples(self):
+        class Summary(_Metric):
+            kind = "summary"
+
+        with self.assertRaises(TypeError):
+            Summary("aia_summary", "Summary.")
+
+
+class TestMetricsServer(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.registry.counter("aia_calls_total", "Calls.").inc()
+        self.server = MetricsServer(self.registry, port=0, health_check=lambda: {"modules_loaded": 2})
+        self.port = self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_metrics_endpoint(self):
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+            self.assertIn("text/plain; version=0.0.4", response.headers["Content-Type"])
+        self.assertIn("aia_calls_total 1", body)
+
+    def test_health_endpoint(self):
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/health", timeout=5) as response:
+            body = json.loads(response.read())
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(body["modules_loaded"], 2)
+
+    def test_unknown_path(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f"http://127.0.0.1:{self.port}/nope", timeout=5)
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
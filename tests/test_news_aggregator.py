@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from helpers import fake_session, safe_config
+from modules.news_aggregator import NewsAggregator, title_key, url_key
+
+
+def article(title, url, published_at, source="Wire"):
+    return {"title": title, "description": f"About {title}", "url": url, "source": {"name": source},
+            "publishedAt": published_at}
+
+
+def news_session(feeds, delay=0.0):
+    """Session whose GET of /top-headlines returns feeds[category] (a list, or an exception to raise)."""
+    def respond(url, params):
+        feed = feeds[params["category"]]
+        if isinstance(feed, Exception):
+            raise feed
+        return {"status": "ok", "articles": list(feed)}
+
+    return fake_session(respond, delay=delay)
+
+
+class TestNewsAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.feeds = {
+            "general": [
+                article("Markets rally - Wire", "https://www.example.com/markets?utm=1", "2024-05-01T09:00:00Z"),
+                article("Storm warning", "https://news.local/storm", "2024-05-01T08:00:00Z"),
+            ],
+            "business": [
+                article("Markets rally - Other Paper", "https://paper.local/markets", "2024-05-01T09:05:00Z"),
+                article("Rates unchanged", "https://example.com/rates/", "2024-05-01T07:00:00Z"),
+            ],
+        }
+        self.aggregator = NewsAggregator(news_session(self.feeds), "key", categories=("general", "business"))
+        self.addCleanup(self.aggregator.close)
+
+    def test_keys_ignore_presentation_differences(self):
+        self.assertEqual(url_key("https://www.Example.com/a/?x=1"), url_key("http://example.com/a"))
+        self.assertEqual(title_key("Markets rally! - Wire"), title_key("markets rally - Other Paper"))
+        self.assertNotEqual(title_key("Markets rally"), title_key("Markets fall"))
+
+    def test_refresh_dedupes_across_categories(self):
+        added = self.aggregator.refresh()
+
+        titles = [a.title for articles in added.values() for a in articles]
+        self.assertEqual(len(titles), 3)
+        self.assertEqual(sum(1 for title in titles if title.startswith("Markets rally")), 1)
+        self.assertEqual(self.aggregator.stats["duplicates"], 1)
+        self.assertEqual(len(self.aggregator), 3)
+
+    def test_refresh_only_processes_newer_articles(self):
+        self.aggregator.refresh()
+        self.feeds["general"].insert(0, article("Late goal", "https://sport.local/goal", "2024-05-01T10:00:00Z"))
+
+        added = self.aggregator.refresh(["general"])
+
+        self.assertEqual([a.title for a in added["general"]], ["Late goal"])
+        self.assertEqual(self.aggregator.stats["stale"], 2)
+
+    def test_headlines_come_from_the_store(self):
+        self.aggregator.refresh()
+        self.aggregator.session.get.reset_mock()
+
+        headlines = self.aggregator.headlines(["business"], limit=5)
+
+        self.assertEqual([a.title for a in headlines], ["Markets rally - Wire", "Rates unchanged"])
+        self.assertEqual(self.aggregator.headlines(limit=1)[0].as_dict()["published_at"], "2024-05-01T09:00:00Z")
+        self.aggregator.session.get.assert_not_called()
+
+    def test_articles_are_stored_once_and_listed_in_every_category(self):
+        self.feeds["technology"] = [self.feeds["general"][1]]
+
+        self.aggregator.refresh(["general"])
+        added = self.aggregator.refresh(["technology"])
+
+        self.assertEqual(added["technology"], [])
+        self.assertEqual(len(self.aggregator), 2)
+        self.assertEqual([a.title for a in self.aggregator.headlines(["technology"])], ["Storm warning"])
+        self.assertEqual([a.title for a in self.aggregator.headlines(["general", "technology"])],
+                         ["Markets rally - Wire", "Storm warning"])
+
+    def test_categories_are_fetched_concurrently_and_failures_isolated(self):
+        self.feeds["business"] = ConnectionError("down")
+        self.feeds.update({name: [] for name in ("science", "sports", "health")})
+        self.aggregator.session = news_session(self.feeds, delay=0.2)
+        self.aggregator.resilience = MagicMock(timeout=5, **{"call.side_effect": lambda fn: fn()})
+
+        start_time = time.perf_counter()
+        added = self.aggregator.refresh(["general", "business", "science", "sports", "health"])
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(len(added["general"]), 2)
+        self.assertEqual(added["business"], [])
+        self.assertEqual(self.aggregator.stats["failed"], 1)
+        self.assertIsNone(self.aggregator.last_refreshed(["business"]))
+
+    def test_concurrent_refreshes_share_one_fetch(self):
+        self.aggregator.session = news_session(self.feeds, delay=0.2)
+        threads = [threading.Thread(target=self.aggregator.refresh) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.aggregator.session.get.call_count, 2)
+
+
+@patch('modules.internet_tasks.RESOURCES')
+class TestInternetTasksNews(unittest.TestCase):
+
+    def test_fetch_news_refreshes_only_when_stale(self, mock_resources):
+        from modules.internet_tasks import InternetTasks
+        mock_resources.acquire.return_value = news_session({
+            "general": [article("Storm warning", "https://news.local/storm", "2024-05-01T08:00:00Z")],
+        })
+        tasks = InternetTasks(safe_config(NEWS_API_URL="http://news.local/v2", NEWS_CATEGORIES=["general"],
+                                          NEWS_REFRESH_SECONDS=300))
+        self.addCleanup(tasks.close)
+
+        first = tasks.fetch_news()
+        second = tasks.fetch_news(limit=5)
+        tasks.fetch_news(max_age=0)
+
+        self.assertEqual([a.title for a in first], ["Storm warning"])
+        self.assertEqual(second, first)
+        self.assertEqual(mock_resources.acquire.return_value.get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
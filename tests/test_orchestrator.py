@@ -0,0 +1,206 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from config.settings import Config
+from operate.orchestrator import Orchestrator
+
+
+class Memorizer:
+    """Stateful cpu_bound module: predicts the labels it was last trained on."""
+
+    def __init__(self):
+        self.labels = None
+
+    def train_model(self, X_train, y_train):
+        self.labels = list(y_train)
+
+    def predict(self, X):
+        return self.labels
+
+
+class TestOrchestratorModuleRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.orchestrator = Orchestrator(Config())
+
+    @patch('operate.orchestrator.ChatBot')
+    @patch('operate.orchestrator.VoiceAssistant')
+    def test_modules_are_not_built_at_init(self, mock_voice_assistant, mock_chatbot):
+        orchestrator = Orchestrator(Config())
+
+        # Nothing is constructed until a module is needed
+        mock_voice_assistant.assert_not_called()
+        mock_chatbot.assert_not_called()
+        self.assertFalse(orchestrator.is_module_loaded("chatbot"))
+
+    def test_factory_called_once_on_first_use(self):
+        factory = MagicMock(return_value="module-instance")
+        self.orchestrator.register_module("custom", factory=factory)
+
+        self.assertEqual(self.orchestrator.get_module("custom"), "module-instance")
+        self.assertEqual(self.orchestrator.get_module("custom"), "module-instance")
+        factory.assert_called_once_with()
+        self.assertIn("custom", self.orchestrator.module_load_times)
+
+    def test_register_prebuilt_module(self):
+        module = object()
+        self.orchestrator.register_module("prebuilt", module)
+
+        self.assertIs(self.orchestrator.get_module("prebuilt"), module)
+        self.assertNotIn("prebuilt", self.orchestrator.module_load_times)
+
+    def test_register_requires_object_or_factory(self):
+        with self.assertRaises(ValueError):
+            self.orchestrator.register_module("empty")
+
+    def test_unknown_module(self):
+        with self.assertRaises(KeyError):
+            self.orchestrator.get_module("does_not_exist")
+
+    def test_module_report(self):
+        self.orchestrator.register_module("custom", factory=lambda: "module-instance")
+        self.orchestrator.get_module("custom")
+
+        report = self.orchestrator.module_report()
+        self.assertIn("custom", report)
+        self.assertIn("(not loaded)", report)
+
+
+class TestOrchestratorShutdown(unittest.TestCase):
+
+    def test_shutdown_never_powers_off_the_host(self):
+        orchestrator = Orchestrator(Config())
+        device_control = MagicMock()
+        orchestrator.register_module("device_control", device_control)
+
+        orchestrator.shutdown()
+
+        device_control.shutdown_system.assert_not_called()
+
+    def test_every_loaded_module_is_closed_even_if_one_fails(self):
+        orchestrator = Orchestrator(Config())
+        modules = {name: MagicMock(spec=["close"]) for name in ("voice_assistant", "chatbot", "internet_tasks")}
+        modules["voice_assistant"].close.side_effect = RuntimeError("engine busy")
+        for name, module in modules.items():
+            orchestrator.register_module(name, module)
+
+        orchestrator.shutdown()
+
+        for module in modules.values():
+            module.close.assert_called_once_with()
+
+    def test_modules_are_closed_newest_first_and_aliases_once(self):
+        orchestrator = Orchestrator(Config())
+        closed = []
+        api_manager = MagicMock(**{"close.side_effect": lambda: closed.append("api_manager")})
+        chatbot = MagicMock(**{"close.side_effect": lambda: closed.append("chatbot")})
+        orchestrator.register_module("api_manager", api_manager)
+        orchestrator.register_module("chatbot", chatbot)
+        orchestrator.register_module("assistant", factory=lambda: orchestrator.get_module("chatbot"))
+        orchestrator.get_module("assistant")
+
+        orchestrator.shutdown()
+
+        self.assertEqual(closed, ["chatbot", "api_manager"])
+
+
+@patch('main.setup_logging')
+@patch('main.start_s3_service')
+@patch('main.initialize_modules')
+@patch('main.Config')
+@patch('main.Orchestrator')
+class TestMainShutdown(unittest.TestCase):
+
+    def test_exiting_the_ui_shuts_the_orchestrator_down(self, mock_orchestrator, *mocks):
+        import main
+        with patch('main.interactive_ui', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                main.main([])
+
+        mock_orchestrator.return_value.shutdown.assert_called_once_with(wait=False)
+
+
+class TestOrchestratorExecuteTask(unittest.TestCase):
+
+    def setUp(self):
+        self.orchestrator = Orchestrator(Config())
+
+    def tearDown(self):
+        self.orchestrator.engine.shutdown()
+
+    def test_execute_task_calls_module_action(self):
+        module = MagicMock()
+        module.process_image.return_value = ["person"]
+        self.orchestrator.register_module("data_retrieval", module)
+
+        future = self.orchestrator.execute_task("data_retrieval", {"image_path": "face.jpg"})
+
+        self.assertEqual(future.result(timeout=5), ["person"])
+        module.process_image.assert_called_once_with(image_path="face.jpg")
+
+    def test_execute_task_builds_module_on_first_use(self):
+        factory = MagicMock()
+        self.orchestrator.register_module("custom", factory=factory)
+
+        self.orchestrator.execute_task("custom", {"x": 1}, action="run").result(timeout=5)
+
+        factory.assert_called_once_with()
+        factory.return_value.run.assert_called_once_with(x=1)
+
+    def test_alias_of_cpu_bound_module_runs_in_process_pool(self):
+        self.orchestrator.process_pool = MagicMock()
+        self.orchestrator.process_pool.run.return_value = [1]
+        self.orchestrator.register_module("heavy", factory=dict, cpu_bound=True)
+        self.orchestrator.register_alias("heavy_alias", "heavy")
+
+        result = self.orchestrator.execute_task("heavy_alias", {"X": [[0.5]]}, action="predict").result(timeout=5)
+
+        self.assertEqual(result, [1])
+        envelope = self.orchestrator.process_pool.run.call_args[0][0]
+        self.assertEqual(envelope.module_name, "heavy")
+        self.assertFalse(self.orchestrator.is_module_loaded("heavy_alias"))
+
+    def test_alias_shares_the_module_instance(self):
+        self.orchestrator.register_module("social_media_manager", factory=MagicMock)
+        self.orchestrator.register_alias("social_media", "social_media_manager")
+
+        self.assertIs(self.orchestrator.get_module("social_media"),
+                      self.orchestrator.get_module("social_media_manager"))
+        with self.assertRaises(ValueError):
+            self.orchestrator.register_alias("social_media_manager", "chatbot")
+
+    def test_cpu_bound_module_runs_in_process_pool(self):
+        self.orchestrator.process_pool = MagicMock()
+        self.orchestrator.process_pool.run.return_value = [1, 0]
+        self.orchestrator.register_module("heavy", factory=dict, cpu_bound=True)
+
+        result = self.orchestrator.execute_task("heavy", {"X": [[0.5]]}, action="predict").result(timeout=5)
+
+        self.assertEqual(result, [1, 0])
+        envelope = self.orchestrator.process_pool.run.call_args[0][0]
+        self.assertEqual((envelope.module_name, envelope.action, envelope.kwargs), ("heavy", "predict", {"X": [[0.5]]}))
+        self.assertFalse(self.orchestrator.is_module_loaded("heavy"))
+
+    def test_stateful_actions_of_cpu_bound_module_run_in_process(self):
+        self.orchestrator.process_pool = MagicMock()
+        self.orchestrator.register_module("ml", factory=Memorizer, cpu_bound=True, stateful_actions=("train_model",))
+
+        self.orchestrator.execute_task("ml", {"X_train": [[0.5]], "y_train": [1]}, action="train_model").result(timeout=5)
+        result = self.orchestrator.execute_task("ml", {"X": [[0.5]]}).result(timeout=5)
+
+        # Prediction uses the trained instance, not an untrained copy in a worker
+        self.assertEqual(result, [1])
+        self.orchestrator.process_pool.run.assert_not_called()
+
+    def test_cpu_bound_module_requires_picklable_factory(self):
+        with self.assertRaises(ValueError):
+            self.orchestrator.register_module("heavy", factory=lambda: None, cpu_bound=True)
+
+    def test_execute_task_unknown_module(self):
+        future = self.orchestrator.execute_task("does_not_exist")
+
+        with self.assertRaises(KeyError):
+            future.result(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
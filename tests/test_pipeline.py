@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from operate.pipeline import CommandPipeline
+
+
+def scripted_listener(commands):
+    """Return a listen() callable that yields the given commands, then nothing."""
+    pending = queue.Queue()
+    for command in commands:
+        pending.put(command)
+
+    def listen():
+        try:
+            return pending.get_nowait()
+        except queue.Empty:
+            time.sleep(0.01)
+            return None
+    return listen
+
+
+class TestCommandPipeline(unittest.TestCase):
+
+    def test_listening_overlaps_execution(self):
+        handled = []
+        release = threading.Event()
+
+        def handle(command):
+            if command == "slow":
+                release.wait(5)
+            handled.append(command)
+
+        pipeline = CommandPipeline(scripted_listener(["slow", "fast"]), handle, max_queue=4)
+        pipeline.start()
+        # "fast" is heard and queued while "slow" is still executing
+        deadline = time.time() + 5
+        while pipeline.stats["received"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(pipeline.stats["received"], 2)
+        self.assertEqual(handled, [])
+
+        release.set()
+        while len(handled) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+        self.assertEqual(handled, ["slow", "fast"])
+
+    def test_drop_newest_when_full(self):
+        dropped = []
+        pipeline = CommandPipeline(lambda: None, lambda command: None, max_queue=1,
+                                   policy="drop_newest", on_drop=dropped.append)
+
+        self.assertTrue(pipeline.offer("first"))
+        self.assertFalse(pipeline.offer("second"))
+        self.assertEqual(dropped, ["second"])
+        self.assertEqual(pipeline.queue_depth(), 1)
+
+    def test_drop_oldest_when_full(self):
+        dropped = []
+        pipeline = CommandPipeline(lambda: None, lambda command: None, max_queue=1,
+                                   policy="drop_oldest", on_drop=dropped.append)
+
+        pipeline.offer("first")
+        self.assertTrue(pipeline.offer("second"))
+        self.assertEqual(dropped, ["first"])
+        self.assertEqual(pipeline.commands.get_nowait(), "second")
+
+    def test_block_policy_times_out(self):
+        pipeline = CommandPipeline(lambda: None, lambda command: None, max_queue=1,
+                                   policy="block", put_timeout=0.2)
+
+        pipeline.offer("first")
+        self.assertFalse(pipeline.offer("second"))
+        self.assertEqual(pipeline.stats["dropped"], 1)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            CommandPipeline(lambda: None, lambda command: None, policy="ignore")
+
+
+
+@patch('modules.voice_assistant.RESOURCES')
+class TestSpeechFromSeveralThreads(unittest.TestCase):
+
+    def test_utterances_do_not_overlap(self, mock_resources):
+        from modules.voice_assistant import VoiceAssistant
+        speaking, overlaps = [0], []
+        lock = threading.Lock()
+
+        def run_and_wait():
+            with lock:
+                speaking[0] += 1
+                overlaps.append(speaking[0] > 1)
+            time.sleep(0.01)
+            with lock:
+                speaking[0] -= 1
+
+        mock_resources.acquire.return_value.runAndWait.side_effect = run_and_wait
+        assistant = VoiceAssistant(MagicMock(), internet_tasks=MagicMock())
+        threads = [threading.Thread(target=assistant.speak, args=(f"reply {index}",)) for index in range(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(overlaps), 4)
+        self.assertFalse(any(overlaps))
+
+
+if __name__ == '__main__':
+    unittest.main()
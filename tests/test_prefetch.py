@@ -0,0 +1,139 @@
+import calendar
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from helpers import FakeClock, safe_config
+from modules.prefetch import CommandLog, PrefetchScheduler
+
+DAY = 86400
+
+
+def at(day, hour, minute):
+    """Unix time of 2024-05-<day> hour:minute UTC."""
+    return calendar.timegm(datetime(2024, 5, day, hour, minute).timetuple())
+
+
+class TestPrefetchScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(at(1, 0, 0))
+        self.log = CommandLog(clock=self.clock)
+        self.addCleanup(self.log.close)
+        self.warm_weather = MagicMock()
+        self.warm_news = MagicMock()
+
+    def scheduler(self, **kwargs):
+        kwargs.setdefault("lead_seconds", 300)
+        scheduler = PrefetchScheduler(self.log, clock=self.clock, localtime=time.gmtime, **kwargs)
+        scheduler.register("weather", self.warm_weather)
+        scheduler.register("news", self.warm_news, cost=lambda categories: len(categories.split(",")))
+        return scheduler
+
+    def morning_routine(self, days=(1, 2, 3)):
+        for day in days:
+            self.log.record("weather", "london", at=at(day, 7, 10 + day))
+            self.log.record("news", "general,technology", at=at(day, 7, 20))
+        self.log.record("weather", "paris", at=at(2, 18, 0))
+
+    def test_learns_queries_recurring_in_the_same_slot(self):
+        self.morning_routine()
+        self.log.record("news", "general,technology", at=at(3, 12, 0))
+
+        predictions = self.scheduler().predictions(now=at(4, 0, 0))
+
+        self.assertEqual({(p.kind, p.argument, p.slot, p.days_seen) for p in predictions},
+                         {("weather", "london", 14, 3), ("news", "general,technology", 14, 3)})
+
+    def test_warms_shortly_before_the_slot_once_per_day(self):
+        self.morning_routine()
+        scheduler = self.scheduler()
+
+        self.assertEqual(scheduler.run_once(now=at(4, 6, 50)), [])
+        warmed = scheduler.run_once(now=at(4, 6, 56))
+        scheduler.run_once(now=at(4, 7, 20))
+
+        self.assertEqual(len(warmed), 2)
+        self.warm_weather.assert_called_once_with("london")
+        self.warm_news.assert_called_once_with("general,technology")
+        scheduler.run_once(now=at(5, 6, 58))
+        self.assertEqual(self.warm_weather.call_count, 2)
+
+    def test_warm_ups_stay_within_the_budget(self):
+        self.morning_routine()
+        scheduler = self.scheduler(max_requests_per_hour=2)
+
+        scheduler.run_once(now=at(4, 6, 58))
+
+        # Weather (1 request) fits; news (2 categories) would exceed what is left
+        self.warm_weather.assert_called_once()
+        self.warm_news.assert_not_called()
+        self.assertEqual(scheduler.stats["over_budget"], 1)
+
+    def test_fresh_entries_cost_nothing(self):
+        self.morning_routine()
+        scheduler = self.scheduler(max_requests_per_hour=1)
+        scheduler.register("news", self.warm_news, cost=lambda categories: 0)
+
+        warmed = scheduler.run_once(now=at(4, 6, 58))
+
+        self.assertEqual(len(warmed), 2)
+        self.warm_news.assert_not_called()
+        self.assertEqual(scheduler.run_once(now=at(4, 7, 0)), [])
+
+    def test_slots_after_midnight_are_warmed_the_evening_before(self):
+        for day in (1, 2, 3):
+            self.log.record("weather", "oslo", at=at(day, 0, 5))
+
+        self.scheduler().run_once(now=at(3, 23, 57))
+
+        self.warm_weather.assert_called_once_with("oslo")
+
+    def test_failed_warm_ups_are_retried(self):
+        self.morning_routine()
+        scheduler = self.scheduler()
+        self.warm_weather.side_effect = [ConnectionError("offline"), None]
+
+        scheduler.run_once(now=at(4, 6, 58))
+        scheduler.run_once(now=at(4, 7, 1))
+
+        self.assertEqual(self.warm_weather.call_count, 2)
+        self.assertEqual(scheduler.stats["failed"], 1)
+
+    def test_old_entries_are_forgotten(self):
+        log = CommandLog(retention_days=7)
+        self.addCleanup(log.close)
+        log.record("weather", "london", at=at(1, 7, 0))
+        log.record("weather", "london", at=at(9, 7, 0))
+
+        self.assertEqual(log.entries(), [("weather", "london", at(9, 7, 0))])
+
+    def test_background_thread_stops(self):
+        scheduler = self.scheduler(interval=0.01)
+
+        scheduler.start()
+        scheduler.stop()
+
+        self.assertIsNone(scheduler._thread)
+
+
+@patch('modules.internet_tasks.RESOURCES')
+class TestInternetTasksPrefetch(unittest.TestCase):
+
+    def test_user_queries_are_logged_and_warm_ups_are_not(self, mock_resources):
+        from modules.internet_tasks import InternetTasks
+        session = mock_resources.acquire.return_value
+        session.get.return_value.json.return_value = {"name": "Paris", "main": {"temp": 20}, "weather": []}
+        tasks = InternetTasks(safe_config(DEFAULT_LOCATION="Paris", WEATHER_API_URL="http://weather.local/data/2.5"))
+        self.addCleanup(tasks.close)
+
+        tasks.prefetch._warmers["weather"][0]("london")
+        tasks.fetch_weather("  PARIS ")
+
+        self.assertEqual([entry[:2] for entry in tasks.prefetch.command_log.entries()], [("weather", "paris")])
+        cost = tasks.prefetch._warmers["weather"][1]
+        self.assertEqual((cost("paris"), cost("berlin")), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
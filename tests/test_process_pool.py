@@ -0,0 +1,54 @@
+import os
+import unittest
+from operate.process_pool import ProcessOffloader, TaskEnvelope, ensure_picklable
+
+
+class SquareModule:
+    """Picklable CPU-bound module used by the tests (must live at module level)."""
+
+    def __init__(self, offset=0):
+        self.offset = offset
+        self.created_in = os.getpid()
+
+    def square(self, value):
+        return value * value + self.offset
+
+    def worker(self):
+        return self.created_in
+
+    def fail(self):
+        raise ValueError("bad input")
+
+
+class TestProcessOffloader(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ProcessOffloader(max_workers=2)
+        self.pool.add_module("square", SquareModule)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_runs_in_a_worker_process(self):
+        self.assertEqual(self.pool.run(TaskEnvelope("square", SquareModule, "square", {"value": 7})), 49)
+        worker_pid = self.pool.run(TaskEnvelope("square", SquareModule, "worker"))
+        self.assertNotEqual(worker_pid, os.getpid())
+
+    def test_module_added_after_start_is_built_on_first_use(self):
+        self.pool.run(TaskEnvelope("square", SquareModule, "square", {"value": 1}))
+        self.pool.add_module("late", SquareModule)
+        self.assertEqual(self.pool.run(TaskEnvelope("late", SquareModule, "square", {"value": 3})), 9)
+
+    def test_exceptions_propagate(self):
+        with self.assertRaises(ValueError):
+            self.pool.run(TaskEnvelope("square", SquareModule, "fail"))
+
+    def test_lambda_factories_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.pool.add_module("lambda", lambda: SquareModule())
+        with self.assertRaises(ValueError):
+            ensure_picklable("lambda", lambda: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from helpers import FakeClock
+from operate.utils.rate_limit import TokenBucket, RequestBudget, RateLimiter, RateLimitExceeded
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeClock(0.0)
+
+    def bucket(self, rate, capacity=None):
+        return TokenBucket(rate, capacity, clock=self.time, sleep=self.time.sleep)
+
+    def test_burst_then_wait_for_refill(self):
+        bucket = self.bucket(rate=2, capacity=4)
+        for _ in range(4):
+            self.assertTrue(bucket.acquire())
+        self.assertEqual(self.time.slept, [])
+
+        bucket.acquire(3)
+        self.assertEqual(self.time.slept, [1.5])
+
+    def test_non_blocking_and_timeout(self):
+        bucket = self.bucket(rate=1, capacity=1)
+        bucket.acquire()
+
+        self.assertFalse(bucket.acquire(blocking=False))
+        self.assertFalse(bucket.acquire(timeout=0.5))
+        self.time.now += 1
+        self.assertTrue(bucket.acquire(blocking=False))
+
+    def test_waiters_queue_up(self):
+        bucket = self.bucket(rate=1, capacity=1)
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+
+        self.assertEqual(self.time.slept, [1.0, 1.0])
+
+    def test_amount_clamped_to_capacity(self):
+        bucket = self.bucket(rate=10, capacity=10)
+        self.assertTrue(bucket.acquire(500))
+        self.assertEqual(self.time.slept, [])
+
+    def test_penalize_blocks_for_given_time(self):
+        bucket = self.bucket(rate=1, capacity=5)
+        bucket.penalize(3)
+
+        bucket.acquire()
+        self.assertEqual(self.time.slept, [4.0])
+
+    def test_request_budget_per_minute(self):
+        budget = RequestBudget(requests_per_minute=60, tokens_per_minute=600,
+                               clock=self.time, sleep=self.time.sleep)
+        budget.acquire(tokens=600)
+        budget.acquire(tokens=10)
+
+        self.assertAlmostEqual(sum(self.time.slept), 1.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeClock(0.0)
+        self.limiter = RateLimiter(60, {"api.twitter.com": 120, "localhost": 0},
+                                   clock=self.time, sleep=self.time.sleep)
+
+    def test_limits_per_key(self):
+        for _ in range(60):
+            self.limiter.acquire("api.example.com")
+        self.assertEqual(self.time.slept, [])
+
+        self.limiter.acquire("api.example.com")
+        self.assertAlmostEqual(self.time.slept[0], 1.0)
+        self.assertEqual(self.limiter.limit("api.twitter.com"), 120)
+        self.assertIsNone(self.limiter.bucket("localhost"))
+
+    def test_fail_fast(self):
+        for _ in range(60):
+            self.limiter.acquire("api.example.com", blocking=False)
+
+        with self.assertRaises(RateLimitExceeded) as context:
+            self.limiter.acquire("api.example.com", blocking=False)
+        self.assertAlmostEqual(context.exception.retry_in, 1.0)
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.acquire("api.example.com", timeout=0.5)
+        self.assertEqual(self.time.slept, [])
+
+    def test_429_lowers_the_rate_and_success_restores_it(self):
+        self.limiter.throttled("api.example.com", retry_after=5)
+        self.assertEqual(self.limiter.rates()["api.example.com"], 30)
+
+        self.limiter.acquire("api.example.com")
+        self.assertGreaterEqual(self.time.slept[0], 5)
+
+        for _ in range(10):
+            self.limiter.succeeded("api.example.com")
+        self.assertAlmostEqual(self.limiter.rates()["api.example.com"], 60)
+
+        for _ in range(10):
+            self.limiter.throttled("api.example.com")
+        self.assertAlmostEqual(self.limiter.rates()["api.example.com"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import unittest
+import urllib.request
+from unittest.mock import patch, MagicMock
+from helpers import FakeClock
+from modules.chatbot import ChatBot, UNAVAILABLE_RESPONSE
+from operate.utils.resilience import (
+    CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy, is_retryable, may_resend, retry_after, REJECTIONS,
+)
+from services.standin_server import StandInProfile, StandInServer
+
+
+def standin_complete(server):
+    request = urllib.request.Request(server.base_url + "/chat/completions", data=json.dumps({"max_tokens": 3}).encode())
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())["choices"][0]["message"]["content"]
+
+
+class HTTPError(OSError):
+    """Shaped like requests.HTTPError: the response carries the status and headers."""
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.response = MagicMock(status_code=status, headers=headers or {})
+
+
+class TestClassification(unittest.TestCase):
+
+    def test_retryable_errors(self):
+        self.assertTrue(is_retryable(HTTPError(429)))
+        self.assertTrue(is_retryable(HTTPError(503)))
+        self.assertTrue(is_retryable(ConnectionResetError()))
+        self.assertTrue(is_retryable(type("APIConnectionError", (Exception,), {})()))
+        self.assertFalse(is_retryable(HTTPError(401)))
+        self.assertFalse(is_retryable(ValueError("bad payload")))
+        self.assertFalse(is_retryable(CircuitOpenError("svc", 5)))
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after(HTTPError(429, {"Retry-After": "2"})), 2.0)
+        self.assertAlmostEqual(retry_after(HTTPError(429, {"Retry-After": "Thu, 01 Jan 1970 00:00:00 GMT"})), 0.0)
+        self.assertIsNone(retry_after(HTTPError(503)))
+        self.assertIsNone(retry_after(RuntimeError()))
+
+    def test_may_resend_only_idempotent_or_unsent_requests(self):
+        refused = OSError("Max retries exceeded")
+        refused.__cause__ = ConnectionRefusedError()
+
+        self.assertTrue(may_resend(TimeoutError(), "GET"))
+        self.assertTrue(may_resend(HTTPError(502), "delete"))
+        self.assertTrue(may_resend(refused, "POST"))
+        self.assertTrue(may_resend(HTTPError(503, {"Retry-After": "1"}), "POST"))
+        self.assertFalse(may_resend(TimeoutError(), "POST"))
+        self.assertFalse(may_resend(HTTPError(503), "POST"))
+        self.assertFalse(may_resend(HTTPError(502, {"Retry-After": "1"}), "PATCH"))
+
+    def test_policy_needs_at_least_one_attempt(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+        self.assertEqual(RetryPolicy(max_attempts=1).max_attempts, 1)
+
+    def test_backoff_is_jittered_capped_and_honors_retry_after(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        rng = MagicMock(uniform=lambda low, high: high)
+
+        self.assertEqual([policy.delay(attempt, rng=rng) for attempt in range(4)], [1, 2, 4, 4])
+        self.assertEqual(policy.delay(0, server_delay=3, rng=rng), 3)
+        self.assertEqual(policy.delay(0, server_delay=30, rng=rng), 30)
+        self.assertLessEqual(policy.delay(5), 4)
+
+
+class TestResilience(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock(0.0)
+        self.sleeps = []
+        self.resilience = Resilience(
+            "test", policy=RetryPolicy(max_attempts=3, base_delay=0.1),
+            breaker=CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=self.clock),
+            sleep=self.sleeps.append,
+        )
+
+    def test_retries_transient_failures(self):
+        upstream = MagicMock(side_effect=[HTTPError(503), HTTPError(429, {"Retry-After": "1"}), "ok"])
+
+        self.assertEqual(self.resilience.call(upstream, "arg"), "ok")
+        self.assertEqual(upstream.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertGreaterEqual(self.sleeps[1], 1.0)
+        self.assertEqual(self.resilience.breaker.state, "closed")
+
+    def test_does_not_retry_client_errors(self):
+        upstream = MagicMock(side_effect=HTTPError(400))
+
+        with self.assertRaises(HTTPError):
+            self.resilience.call(upstream)
+        upstream.assert_called_once()
+        self.assertEqual(self.resilience.breaker.failures, 0)
+
+    def test_post_that_timed_out_is_not_resent(self):
+        upstream = MagicMock(side_effect=TimeoutError("read timed out"))
+
+        with self.assertRaises(TimeoutError):
+            self.resilience.call_http("POST", upstream)
+        upstream.assert_called_once()
+        self.assertEqual(self.resilience.breaker.failures, 1)
+
+    def test_post_is_resent_when_it_was_not_processed(self):
+        upstream = MagicMock(side_effect=[ConnectionRefusedError(), HTTPError(429, {"Retry-After": "1"}), "ok"])
+        self.assertEqual(self.resilience.call_http("POST", upstream), "ok")
+        self.assertEqual(upstream.call_count, 3)
+
+    def test_circuit_opens_fails_fast_and_recovers(self):
+        upstream = MagicMock(side_effect=HTTPError(503))
+        with self.assertRaises(HTTPError):
+            self.resilience.call(upstream)
+        self.assertEqual(self.resilience.breaker.state, "open")
+
+        rejected_before = REJECTIONS.value(service="test")
+        with self.assertRaises(CircuitOpenError):
+            self.resilience.call(upstream)
+        self.assertEqual(upstream.call_count, 3)
+        self.assertEqual(REJECTIONS.value(service="test") - rejected_before, 1)
+
+        # After the cooldown one probe goes through; its failure reopens the circuit at once
+        self.clock.now = 11
+        with self.assertRaises(HTTPError):
+            self.resilience.call(upstream)
+        self.assertEqual(upstream.call_count, 4)
+        self.assertEqual(self.resilience.breaker.state, "open")
+
+        self.clock.now = 22
+        upstream.side_effect = None
+        upstream.return_value = "back"
+        self.assertEqual(self.resilience.call(upstream), "back")
+        self.assertEqual(self.resilience.breaker.state, "closed")
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = self.resilience.breaker
+        for _ in range(3):
+            breaker.record_failure()
+        self.clock.now = 11
+
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+
+@patch('modules.chatbot.RESOURCES', MagicMock())
+class TestChatBotResilience(unittest.TestCase):
+
+    def chatbot(self, backend, **breaker):
+        resilience = Resilience("chat", policy=RetryPolicy(max_attempts=3, base_delay=0),
+                                breaker=CircuitBreaker("chat", **breaker), sleep=lambda seconds: None)
+        return ChatBot(backend=backend, cache=False, budget=MagicMock(tokens=None), resilience=resilience,
+                       memory=MagicMock(**{"build_messages.return_value": []}))
+
+    def test_transient_backend_failure_is_retried(self):
+        backend = MagicMock(**{"complete.side_effect": [TimeoutError(), "answer"]})
+
+        self.assertEqual(self.chatbot(backend).generate_response("hi"), "answer")
+        self.assertEqual(backend.complete.call_count, 2)
+
+    def test_open_circuit_fails_fast(self):
+        backend = MagicMock(**{"complete.side_effect": HTTPError(503)})
+        chatbot = self.chatbot(backend, failure_threshold=2)
+
+        chatbot.generate_response("hi")
+        self.assertEqual(chatbot.generate_response("hi"), UNAVAILABLE_RESPONSE)
+        self.assertEqual(backend.complete.call_count, 2)
+        with self.assertRaises(CircuitOpenError):
+            chatbot.generate_response("hi", raise_errors=True)
+
+    def test_stream_retries_until_first_chunk(self):
+        def broken_stream(*args):
+            raise ConnectionResetError()
+            yield
+
+        backend = MagicMock(**{"stream.side_effect": [broken_stream(), iter(["Hel", "lo"])]})
+
+        self.assertEqual(list(self.chatbot(backend).stream_response("hi")), ["Hel", "lo"])
+
+    def test_standin_rate_limit_is_retried_then_raised(self):
+        server = StandInServer(StandInProfile(latency_ms=0, latency_dist="fixed", error_rate=1.0,
+                                              error_statuses=(429,), retry_after_seconds=0, seed=1), port=0)
+        server.start()
+        self.addCleanup(server.stop)
+        backend = MagicMock()
+        backend.complete.side_effect = lambda *args: standin_complete(server)
+
+        with self.assertRaises(OSError):
+            self.chatbot(backend).generate_response("hi", raise_errors=True)
+        self.assertEqual(server.stats["errors"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from helpers import FakeClock
+from modules.response_cache import ResponseCache
+from modules.chatbot import ChatBot
+
+
+class WordTokenizer:
+    """Stand-in for the GPT-2 tokenizer: one token per word."""
+
+    def __call__(self, texts):
+        return {"input_ids": [text.split() for text in texts]}
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_key_normalizes_prompt(self):
+        first = ResponseCache.make_key("  What can you DO?", "gpt-4", 0.7, 300)
+        second = ResponseCache.make_key("what  can you do?\n", "gpt-4", 0.7, 300)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, ResponseCache.make_key("what can you do?", "gpt-4", 0.0, 300))
+        self.assertNotEqual(first, ResponseCache.make_key("what can you do?", "gpt-4", 0.7, 100))
+
+    def test_hit_miss_and_lru_eviction(self):
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.stats["hits"], 2)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_entries_expire(self):
+        cache = ResponseCache(ttl_seconds=60, clock=self.clock)
+        cache.set("a", "1")
+        self.clock.now += 61
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_disk_tier_survives_restart_and_is_bounded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "cache", "chat.sqlite3")
+            cache = ResponseCache(db_path=db_path, max_db_entries=2, clock=self.clock)
+            for key in ("a", "b", "c"):
+                cache.set(key, key.upper())
+                self.clock.now += 1
+            cache.close()
+
+            reopened = ResponseCache(db_path=db_path, max_db_entries=2, clock=self.clock)
+            self.assertIsNone(reopened.get("a"))
+            self.assertEqual(reopened.get("c"), "C")
+            self.assertEqual(reopened.stats["disk_hits"], 1)
+            self.assertEqual(reopened.get("c"), "C")
+            self.assertEqual(reopened.stats["memory_hits"], 1)
+            reopened.close()
+
+
+@patch('modules.chatbot.RESOURCES', MagicMock(**{"acquire.return_value": WordTokenizer()}))
+@patch('modules.llm_backends.openai')
+class TestChatBotCache(unittest.TestCase):
+
+    def _reply(self, mock_openai, text):
+        mock_openai.ChatCompletion.create.return_value = {"choices": [{"message": {"content": text}}]}
+
+    def test_repeated_prompt_served_from_cache(self, mock_openai):
+        self._reply(mock_openai, "I can help with weather and news.")
+        cache = ResponseCache()
+
+        first_session = ChatBot(api_key="key", cache=cache)
+        second_session = ChatBot(api_key="key", cache=cache)
+
+        self.assertEqual(first_session.generate_response("help"), "I can help with weather and news.")
+        self.assertEqual(second_session.generate_response(" HELP "), "I can help with weather and news.")
+        mock_openai.ChatCompletion.create.assert_called_once()
+
+    def test_follow_up_in_new_context_is_not_reused(self, mock_openai):
+        self._reply(mock_openai, "Paris.")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        chatbot.generate_response("and its population?")
+        chatbot.generate_response("and its population?")
+
+        self.assertEqual(mock_openai.ChatCompletion.create.call_count, 2)
+
+    def test_context_free_prompt_is_reused_mid_conversation(self, mock_openai):
+        self._reply(mock_openai, "I can help with weather and news.")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache(), context_free_prompts=["help"])
+
+        chatbot.generate_response("help")
+        chatbot.generate_response("what is the capital of France?")
+        chatbot.generate_response("Help")
+
+        self.assertEqual(mock_openai.ChatCompletion.create.call_count, 2)
+        self.assertEqual(chatbot.cache.stats["hits"], 1)
+        messages = mock_openai.ChatCompletion.create.call_args_list[0].kwargs["messages"]
+        self.assertEqual([message["role"] for message in messages], ["system", "user"])
+        self.assertEqual(len(chatbot.memory.history), 6)
+
+    def test_bypass(self, mock_openai):
+        self._reply(mock_openai, "fresh")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache(), bypass_cache_when_sampling=True)
+
+        for temperature, bypass_cache in ((0.7, False), (0.7, False), (0, False), (0, True), (0, False)):
+            chatbot.memory.clear()
+            chatbot.generate_response("status", temperature=temperature, bypass_cache=bypass_cache)
+
+        self.assertEqual(mock_openai.ChatCompletion.create.call_count, 4)
+        self.assertEqual(chatbot.cache.stats["bypassed"], 3)
+
+    def test_failures_are_not_cached(self, mock_openai):
+        mock_openai.ChatCompletion.create.side_effect = RuntimeError("API down")
+        chatbot = ChatBot(api_key="key", cache=ResponseCache())
+
+        self.assertIn("Sorry", chatbot.generate_response("help"))
+        self.assertEqual(len(chatbot.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
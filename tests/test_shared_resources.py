@@ -0,0 +1,251 @@
+import sys
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from operate.utils.shared_resources import ResourceManager, model_key
+
+
+class TestResourceManager(unittest.TestCase):
+
+    def setUp(self):
+        self.resources = ResourceManager()
+        self.factory = MagicMock(side_effect=lambda: object())
+        self.close = MagicMock()
+        self.resources.register("engine", self.factory, close=self.close)
+        patcher = patch('operate.utils.shared_resources._rss_bytes', return_value=None)
+        self.mock_rss = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_acquire_shares_one_instance(self):
+        first = self.resources.acquire("engine")
+        second = self.resources.acquire("engine")
+
+        self.assertIs(first, second)
+        self.factory.assert_called_once_with()
+        self.assertEqual(self.resources.refcount("engine"), 2)
+
+    def test_last_release_closes_handle(self):
+        handle = self.resources.acquire("engine")
+        self.resources.acquire("engine")
+
+        self.resources.release("engine")
+        self.close.assert_not_called()
+        self.resources.release("engine")
+
+        self.close.assert_called_once_with(handle)
+        self.assertFalse(self.resources.is_loaded("engine"))
+        self.assertIsNot(self.resources.acquire("engine"), handle)
+
+    def test_borrow_context_manager(self):
+        with self.resources.borrow("engine") as handle:
+            self.assertIsNotNone(handle)
+            self.assertEqual(self.resources.refcount("engine"), 1)
+        self.assertEqual(self.resources.refcount("engine"), 0)
+
+    def test_peek_takes_no_reference(self):
+        self.assertIsNone(self.resources.peek("engine"))
+        handle = self.resources.acquire("engine")
+
+        self.assertIs(self.resources.peek("engine"), handle)
+        self.assertEqual(self.resources.refcount("engine"), 1)
+        self.factory.assert_called_once_with()
+
+    def test_unknown_key_and_inline_factory(self):
+        with self.assertRaises(KeyError):
+            self.resources.acquire("missing")
+        self.assertEqual(self.resources.acquire("inline", lambda: "value"), "value")
+
+    def test_concurrent_acquire_builds_once(self):
+        barrier = threading.Barrier(8)
+
+        def borrower():
+            barrier.wait()
+            self.resources.acquire("engine")
+
+        threads = [threading.Thread(target=borrower) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.factory.assert_called_once_with()
+        self.assertEqual(self.resources.refcount("engine"), 8)
+
+    def test_closed_handles_are_never_handed_out(self):
+        class Engine:
+            closed = False
+
+        def close(engine):
+            engine.closed = True
+
+        self.resources.register("tts", Engine, close=close)
+        handed_out_closed = []
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+
+        def borrower():
+            for _ in range(2000):
+                engine = self.resources.acquire("tts")
+                if engine.closed:
+                    handed_out_closed.append(engine)
+                self.resources.release("tts")
+
+        threads = [threading.Thread(target=borrower) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        self.assertEqual(handed_out_closed, [])
+        self.assertEqual(self.resources.refcount("tts"), 0)
+
+    def test_last_release_between_lookup_and_reference_is_safe(self):
+        class Engine:
+            closed = False
+
+        def close(engine):
+            engine.closed = True
+
+        self.resources.register("tts", Engine, close=close)
+        holder = self.resources.acquire("tts")
+        resources = self.resources
+
+        class Handles(dict):
+            looked_up = False
+
+            def get(self, *args):
+                Handles.looked_up = True
+                return dict.get(self, *args)
+
+        class InterleavingLock:
+            """Lets the other holder release the handle as soon as acquire's lookup unlocks."""
+            lock = threading.Lock()
+
+            def __enter__(self):
+                self.lock.acquire()
+
+            def __exit__(self, *exc_info):
+                self.lock.release()
+                if Handles.looked_up:
+                    Handles.looked_up = False
+                    resources._lock = threading.Lock()
+                    resources.release("tts")
+
+        self.resources.handles = Handles(self.resources.handles)
+        self.resources._lock = InterleavingLock()
+
+        engine = self.resources.acquire("tts")
+
+        self.assertIs(engine, holder)
+        self.assertFalse(engine.closed)
+        self.assertEqual(self.resources.refcount("tts"), 1)
+
+    def test_memory_report_shows_savings(self):
+        self.mock_rss.side_effect = [100 * 1024 * 1024, 150 * 1024 * 1024]
+        for _ in range(3):
+            self.resources.acquire("engine")
+
+        report = self.resources.memory_report()
+
+        self.assertIn("engine", report)
+        self.assertIn("50.0", report)
+        self.assertIn("Total saved by sharing: 100.0 MiB", report)
+
+    def test_close_all(self):
+        self.resources.acquire("engine")
+        self.resources.acquire("engine")
+
+        self.resources.close_all()
+
+        self.close.assert_called_once()
+        self.assertEqual(self.resources.memory_report(), "No shared resources loaded.")
+
+
+class Estimator:
+    def __init__(self):
+        self.trained_on = None
+
+    def fit(self, X, y):
+        self.trained_on = X
+
+
+@patch('operate.utils.shared_resources._rss_bytes', return_value=None)
+@patch('operate.utils.shared_resources.lazy_import')
+class TestSharedModels(unittest.TestCase):
+
+    def setUp(self):
+        self.resources = ResourceManager()
+        patcher = patch('operate.utils.shared_resources.RESOURCES', self.resources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_training_copies_the_shared_model(self, mock_lazy_import, mock_rss):
+        from modules.machine_learning import ModelManager
+        mock_lazy_import.return_value.load.side_effect = lambda path: Estimator()
+        first, second = ModelManager(model_path="model.joblib"), ModelManager(model_path="model.joblib")
+        self.assertIs(first.model, second.model)
+
+        first.train_model("X", "y")
+
+        self.assertIsNone(second.model.trained_on)
+        self.assertEqual(first.model.trained_on, "X")
+        self.assertEqual(self.resources.refcount(model_key("model.joblib")), 1)
+
+    def test_reload_and_close_release_the_previous_model(self, mock_lazy_import, mock_rss):
+        from modules.machine_learning import ModelManager
+        mock_lazy_import.return_value.load.side_effect = lambda path: Estimator()
+        manager = ModelManager(model_path="a.joblib")
+
+        manager.load_model("b.joblib")
+        manager.load_model("b.joblib")
+        self.assertFalse(self.resources.is_loaded(model_key("a.joblib")))
+        self.assertEqual(self.resources.refcount(model_key("b.joblib")), 1)
+
+        manager.close()
+        self.assertFalse(self.resources.is_loaded(model_key("b.joblib")))
+
+
+@patch('operate.utils.shared_resources._rss_bytes', return_value=None)
+class TestSharedHTTPSession(unittest.TestCase):
+
+    def setUp(self):
+        self.resources = ResourceManager()
+        self.close = MagicMock()
+        self.resources.register("http_session", MagicMock, close=self.close)
+        patcher = patch('operate.models.apis.RESOURCES', self.resources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_closing_the_api_managers_returns_the_session(self, mock_rss):
+        from operate.models.apis import APIManager, AsyncAPIManager
+        manager = APIManager(http_cache=MagicMock())
+        async_api = AsyncAPIManager()
+        self.assertEqual(self.resources.refcount("http_session"), 2)
+
+        async_api.close()
+        manager.close()
+        manager.close()
+
+        self.assertFalse(self.resources.is_loaded("http_session"))
+        self.close.assert_called_once()
+
+
+
+@patch('modules.voice_assistant.InternetTasks')
+@patch('modules.voice_assistant.RESOURCES')
+class TestVoiceAssistantClose(unittest.TestCase):
+
+    def test_closes_only_the_internet_tasks_it_created(self, mock_resources, mock_internet_tasks):
+        from modules.voice_assistant import VoiceAssistant
+        standalone = VoiceAssistant(MagicMock())
+        standalone.close()
+        standalone.close()
+        mock_internet_tasks.return_value.close.assert_called_once()
+
+        shared = MagicMock()
+        VoiceAssistant(MagicMock(), internet_tasks=shared).close()
+        shared.close.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from operate.utils.singleflight import SingleFlight, FLIGHT_SAVED_CALLS
+from operate.models.apis import APIManager
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight("test")
+        self.release = threading.Event()
+        self.upstream = MagicMock(side_effect=lambda: self.release.wait(5) and {"answer": 42})
+
+    def wait_for_joiners(self, count):
+        for _ in range(500):
+            if self.flight.stats["calls"] >= count:
+                return
+            threading.Event().wait(0.01)
+
+    def test_concurrent_identical_calls_share_one_upstream_call(self):
+        saved_before = FLIGHT_SAVED_CALLS.value(group="test")
+        threads, results, _ = run_concurrently(5, lambda: self.flight.do("question", self.upstream))
+        self.wait_for_joiners(5)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.upstream.assert_called_once_with()
+        self.assertEqual(results, [{"answer": 42}] * 5)
+        self.assertEqual(self.flight.stats, {"calls": 5, "saved": 4})
+        self.assertEqual(FLIGHT_SAVED_CALLS.value(group="test") - saved_before, 4)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_errors_reach_every_caller(self):
+        def fail():
+            self.release.wait(5)
+            raise RuntimeError("upstream down")
+
+        threads, _, errors = run_concurrently(3, lambda: self.flight.do("question", fail))
+        self.wait_for_joiners(3)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in errors))
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.release.set()
+        self.flight.do("question", self.upstream)
+        self.flight.do("question", self.upstream)
+
+        self.assertEqual(self.upstream.call_count, 2)
+
+    def test_copy_result(self):
+        flight = SingleFlight("copies", copy_result=True)
+        release = threading.Event()
+        threads, results, _ = run_concurrently(2, lambda: flight.do("key", lambda: release.wait(5) and {"a": []}))
+        for _ in range(500):
+            if flight.stats["calls"] >= 2:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results[0], results[1])
+        self.assertIsNot(results[0], results[1])
+
+
+@patch('operate.models.apis.RESOURCES')
+class TestAPIManagerCoalescing(unittest.TestCase):
+
+    def test_identical_gets_are_coalesced_but_posts_are_not(self, mock_resources):
+        release = threading.Event()
+        session = mock_resources.acquire.return_value
+        session.get.side_effect = lambda *args, **kwargs: release.wait(5) and MagicMock(**{"json.return_value": {}})
+        manager = APIManager()
+
+        threads, _, _ = run_concurrently(3, lambda: manager.send_request("twitter", "/tweets", {"id": 1}, "GET"))
+        for _ in range(500):
+            if manager.inflight.stats["calls"] >= 3:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(session.get.call_count, 1)
+
+        manager.send_request("twitter", "/tweets", {"text": "hi"})
+        manager.send_request("twitter", "/tweets", {"text": "hi"})
+        self.assertEqual(session.post.call_count, 2)
+        self.assertEqual(manager.inflight.stats["calls"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from config.settings import Config
+from operate.utils.startup_profiler import PROJECT_ROOT, measure_import_time, total_import_time
+
+# Third-party packages that must only be imported when a module actually needs them
+HEAVY_MODULES = [
+    "cv2", "face_recognition", "transformers", "sklearn", "pandas",
+    "pyttsx3", "speech_recognition", "pyautogui", "pytesseract",
+]
+
+
+class TestStartupBudget(unittest.TestCase):
+
+    def test_startup_within_budget(self):
+        timings = measure_import_time("main")
+        startup_seconds = total_import_time(timings, "main")
+
+        self.assertLessEqual(
+            startup_seconds,
+            Config.STARTUP_IMPORT_BUDGET_SECONDS,
+            f"Importing main took {startup_seconds:.2f}s, budget is "
+            f"{Config.STARTUP_IMPORT_BUDGET_SECONDS:.2f}s (see `python main.py --profile-startup`).",
+        )
+
+    def test_heavy_modules_are_deferred(self):
+        script = (
+            "import sys, main; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        # Run outside the project so nothing the import writes lands in the tree
+        pythonpath = os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")]))
+        with tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run(
+                [sys.executable, "-c", script], cwd=workdir, capture_output=True, text=True,
+                env={**os.environ, "PYTHONPATH": pythonpath},
+            )
+
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout.strip(), "")
+            # Logging is set up by main(), not on import
+            self.assertNotIn("aia.log", os.listdir(workdir))
+
+
+if __name__ == '__main__':
+    unittest.main()
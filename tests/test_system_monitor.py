@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from operate.utils.system_monitor import SystemSampler
+
+
+class TestSystemSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.process = MagicMock()
+        self.process.cpu_percent.return_value = 10.0
+        self.process.memory_info.return_value.rss = 100 * 1024 * 1024
+        self.process.num_threads.return_value = 8
+        self.process.num_fds.return_value = 20
+        patcher = patch('operate.utils.system_monitor.psutil')
+        self.mock_psutil = patcher.start()
+        self.mock_psutil.Process.return_value = self.process
+        self.addCleanup(patcher.stop)
+
+    def test_sample_records_process_metrics(self):
+        sampler = SystemSampler()
+        sampler.register_queue("pipeline", lambda: 3)
+        sampler.register_queue("engine", lambda: {"chatbot": 2})
+
+        sample = sampler.sample()
+
+        self.assertEqual(sample.rss_bytes, 100 * 1024 * 1024)
+        self.assertEqual(sample.threads, 8)
+        self.assertEqual(sample.open_fds, 20)
+        self.assertEqual(sample.queue_depths, {"pipeline": 3, "engine.chatbot": 2})
+        self.assertIs(sampler.latest(), sample)
+
+    def test_ring_buffer_is_bounded(self):
+        sampler = SystemSampler(capacity=5, downsample_every=100)
+        for _ in range(12):
+            sampler.sample()
+
+        self.assertEqual(len(sampler.recent()), 5)
+
+    def test_downsampled_history(self):
+        sampler = SystemSampler(capacity=10, downsample_every=3, history_capacity=2)
+        for rss_mib in range(1, 10):
+            self.process.memory_info.return_value.rss = rss_mib * 1024 * 1024
+            sampler.sample()
+
+        history = sampler.long_history()
+        self.assertEqual(len(history), 2)
+        # Each history sample keeps the peak RSS of its window
+        self.assertEqual([sample.rss_bytes // (1024 * 1024) for sample in history], [6, 9])
+
+    def test_failing_queue_source_is_skipped(self):
+        sampler = SystemSampler()
+        sampler.register_queue("broken", MagicMock(side_effect=RuntimeError))
+
+        self.assertEqual(sampler.sample().queue_depths, {})
+
+    def test_summary(self):
+        sampler = SystemSampler()
+        self.assertIn("No system metrics", sampler.format_summary())
+
+        sampler.sample()
+        self.assertIn("RSS", sampler.format_summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
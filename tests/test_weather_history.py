@@ -0,0 +1,103 @@
+import calendar
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+from helpers import fake_session
+from modules.weather_history import WeatherHistory
+
+
+def day_start(day):
+    return calendar.timegm(day.timetuple())
+
+
+def history_session(delay=0.0, failing_days=()):
+    """Session answering the time machine endpoint with 24 hourly readings whose temp is the day of month."""
+    def respond(url, params):
+        start = params["dt"]
+        if time.strftime("%Y-%m-%d", time.gmtime(start)) in failing_days:
+            raise ConnectionError("connection reset")
+        day = time.gmtime(start).tm_mday
+        hourly = [{"dt": start + hour * 3600, "temp": float(day), "humidity": 50 + hour, "weather": []}
+                  for hour in range(24)]
+        # The API pads the answer with readings from the neighbouring days, which are dropped
+        hourly.append({"dt": start + 86400, "temp": 99.0})
+        return {"hourly": hourly}
+
+    return fake_session(respond, delay=delay)
+
+
+class TestWeatherHistory(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = os.path.join(directory.name, "history.db")
+        self.now = day_start(date(2024, 3, 1))
+
+    def history(self, session, **kwargs):
+        history = WeatherHistory(session, "key", db_path=self.db_path, clock=lambda: self.now, **kwargs)
+        history.resilience = MagicMock(timeout=5, **{"call.side_effect": lambda fn: fn()})
+        self.addCleanup(history.close)
+        return history
+
+    def test_range_returns_columns_for_every_day(self):
+        history = self.history(history_session())
+
+        result = history.fetch(51.5, -0.12, "2024-01-30", "2024-02-02")
+
+        self.assertEqual(len(result), 4 * 24)
+        self.assertEqual(result["dt"][0], day_start(date(2024, 1, 30)))
+        self.assertEqual(result["dt"].dtype.kind, "i")
+        self.assertEqual(sorted(set(result["temp"].tolist())), [1.0, 2.0, 30.0, 31.0])
+        self.assertEqual(result.missing_days, [])
+
+    def test_days_are_requested_concurrently(self):
+        history = self.history(history_session(delay=0.1), max_workers=8)
+
+        start_time = time.perf_counter()
+        history.fetch(51.5, -0.12, date(2024, 1, 1), date(2024, 1, 8))
+
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertEqual(history.session.get.call_count, 8)
+
+    def test_past_days_are_cached_on_disk(self):
+        self.history(history_session()).fetch(51.5, -0.12, "2024-01-01", "2024-01-10")
+        session = history_session()
+        history = self.history(session)
+
+        result = history.fetch(51.50001, -0.12, "2024-01-05", "2024-01-12")
+
+        self.assertEqual(len(result), 8 * 24)
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual(history.stats["cached_days"], 6)
+
+    def test_failed_days_and_today_are_not_cached(self):
+        history = self.history(history_session(failing_days={"2024-02-28"}))
+
+        result = history.fetch(51.5, -0.12, "2024-02-27", "2024-03-01")
+        history.fetch(51.5, -0.12, "2024-02-27", "2024-03-01")
+
+        self.assertEqual(result.missing_days, [date(2024, 2, 28)])
+        self.assertEqual(len(result), 3 * 24)
+        # 2024-02-27 and 2024-02-29 come from the cache the second time
+        self.assertEqual(history.session.get.call_count, 4 + 2)
+
+    def test_to_frame(self):
+        history = self.history(history_session())
+
+        frame = history.fetch(51.5, -0.12, "2024-01-01", "2024-01-01").to_frame()
+
+        self.assertEqual(len(frame), 24)
+        self.assertEqual(str(frame.index[0]), "2024-01-01 00:00:00+00:00")
+        self.assertEqual(frame["humidity"].iloc[-1], 73)
+
+    def test_end_before_start_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.history(history_session()).fetch(0, 0, "2024-01-02", "2024-01-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from helpers import FakeClock, fake_session, safe_config
+from modules.weather_service import WeatherReport, WeatherService, normalize_location
+
+OPENWEATHERMAP_LONDON = {
+    "name": "London", "sys": {"country": "GB"}, "dt": 1700000000,
+    "main": {"temp": 11.5, "feels_like": 10.2, "humidity": 81},
+    "weather": [{"description": "light rain"}], "wind": {"speed": 4.1},
+}
+
+
+def weather_session(payload=OPENWEATHERMAP_LONDON, delay=0.0):
+    return fake_session(lambda url, params: payload, delay=delay)
+
+
+class TestWeatherService(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_normalize_location(self):
+        self.assertEqual(normalize_location("  New   York , US "), "new york,us")
+        self.assertEqual(normalize_location("LONDON"), normalize_location("london"))
+        self.assertEqual(normalize_location(" , "), "")
+
+    def test_structured_report(self):
+        service = WeatherService(weather_session(), "key", clock=self.clock)
+
+        report = service.get("London")
+
+        self.assertIsInstance(report, WeatherReport)
+        self.assertEqual((report.location, report.country, report.temperature), ("London", "GB", 11.5))
+        self.assertEqual(report.as_dict()["description"], "light rain")
+        self.assertEqual(str(report), "11.5°C, light rain in London")
+        params = service.session.get.call_args.kwargs["params"]
+        self.assertEqual(params, {"q": "london", "appid": "key", "units": "metric"})
+
+    def test_reports_are_cached_until_the_ttl_expires(self):
+        service = WeatherService(weather_session(), "key", ttl_seconds=600, clock=self.clock)
+
+        service.get("London")
+        service.get("  london ")
+        self.clock.now += 599
+        service.get("LONDON")
+        self.assertEqual(service.session.get.call_count, 1)
+
+        self.clock.now += 1
+        self.assertIsNone(service.cached("London"))
+        service.get("London")
+        self.assertEqual(service.session.get.call_count, 2)
+        self.assertEqual(service.stats["hits"], 2)
+
+    def test_zero_ttl_disables_caching(self):
+        service = WeatherService(weather_session(), "key", ttl_seconds=0, clock=self.clock)
+
+        service.get("London")
+        service.get("London")
+
+        self.assertEqual(service.session.get.call_count, 2)
+        self.assertEqual(len(service), 0)
+
+    def test_concurrent_lookups_share_one_request(self):
+        service = WeatherService(weather_session(delay=0.2), "key")
+        results = []
+        threads = [threading.Thread(target=lambda spelling=spelling: results.append(service.get(spelling)))
+                   for spelling in ("London", "london", " LONDON", "London ") * 2]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        service.session.get.assert_called_once()
+        self.assertEqual(len(results), 8)
+
+    def test_failures_are_not_cached(self):
+        session = MagicMock()
+        session.get.return_value.raise_for_status.side_effect = ValueError("404 city not found")
+        service = WeatherService(session, "key")
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                service.get("Atlantis")
+
+        self.assertEqual(session.get.call_count, 2)
+        with self.assertRaises(ValueError):
+            service.get("   ")
+
+
+@patch('modules.internet_tasks.RESOURCES')
+class TestInternetTasksWeather(unittest.TestCase):
+
+    def test_fetch_weather_defaults_to_configured_location(self, mock_resources):
+        from modules.internet_tasks import InternetTasks
+        mock_resources.acquire.return_value = weather_session()
+        tasks = InternetTasks(safe_config(DEFAULT_LOCATION="Paris", WEATHER_API_URL="http://weather.local/data/2.5",
+                                          WEATHER_UNITS="metric"))
+        self.addCleanup(tasks.close)
+
+        report = tasks.fetch_weather()
+        self.assertIs(tasks.get_weather(), report)
+
+        session = mock_resources.acquire.return_value
+        session.get.assert_called_once()
+        self.assertEqual(session.get.call_args.args[0], "http://weather.local/data/2.5/weather")
+        self.assertEqual(session.get.call_args.kwargs["params"]["q"], "paris")
+
+
+if __name__ == "__main__":
+    unittest.main()